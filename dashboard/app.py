@@ -1,36 +1,55 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
+
+from scripts.demo_sessions import simulate_sessions
+from scripts.engagement_clustering import engagement_aggregates
+from scripts.engagement_clustering import load_engagement_clusters as read_engagement_clusters
+from scripts.experience_clustering import load_experience_scores
+from scripts.minibatch_clustering import DEFAULT_SESSIONS_PATH, read_sessions
+
+# Sessions shown by the dashboard; the batch jobs must be run on the same file.
+SESSIONS_PATH = os.environ.get('XDR_SESSIONS_PATH', os.path.join(ROOT_DIR, DEFAULT_SESSIONS_PATH))
+CACHE_DIR = os.path.join(ROOT_DIR, 'data', 'cache')
+ENGAGEMENT_MODEL_PATH = os.path.join(CACHE_DIR, 'engagement_model.joblib')
+ENGAGEMENT_CLUSTERS_PATH = os.path.join(CACHE_DIR, 'engagement_clusters.parquet')
+EXPERIENCE_MODEL_PATH = os.path.join(CACHE_DIR, 'experience_model.joblib')
+EXPERIENCE_SCORES_PATH = os.path.join(CACHE_DIR, 'experience_scores.parquet')
 
 # Set page config - must be the first Streamlit command
 st.set_page_config(page_title="Telecom Analytics Dashboard", layout="wide")
 
-# Load data (replace this with your actual data loading logic)
+# Load data from the shared sessions file, falling back to the simulated demo sessions
+# (written to that file by `python -m scripts.demo_sessions`).
 @st.cache_data  # Using the new caching command
 def load_data():
-    # Simulating data for demonstration
-    np.random.seed(42)
-    data = {
-        'MSISDN': range(1000),
-        'Handset Type': np.random.choice(['iPhone', 'Samsung', 'Huawei', 'Xiaomi', 'Other'], 1000),
-        'Handset Manufacturer': np.random.choice(['Apple', 'Samsung', 'Huawei', 'Xiaomi', 'Other'], 1000),
-        'Session ID': np.random.randint(1, 100, 1000),
-        'Duration': np.random.randint(1, 120, 1000),
-        'Total DL': np.random.randint(1, 1000, 1000),
-        'Total UL': np.random.randint(1, 500, 1000),
-        'TCP Retransmission': np.random.random(1000),
-        'RTT': np.random.randint(10, 200, 1000),
-        'Throughput': np.random.randint(1, 100, 1000),
-    }
-    df = pd.DataFrame(data)
-    df['Total DL + UL'] = df['Total DL'] + df['Total UL']
-    return df
+    if os.path.exists(SESSIONS_PATH):
+        return read_sessions(SESSIONS_PATH)
+    return simulate_sessions()
 
 df = load_data()
+# Without a sessions file the demo data is shown; the batch jobs need it written to disk first.
+DEMO_HINT = "" if os.path.exists(SESSIONS_PATH) else \
+    f", after writing the demo sessions with `python -m scripts.demo_sessions {SESSIONS_PATH}`"
+
+@st.cache_data
+def load_engagement_clusters():
+    # Clusters come from the offline engagement batch job; the page never trains a model.
+    # Raises if they are missing or were built from other data.
+    return read_engagement_clusters(ENGAGEMENT_CLUSTERS_PATH, engagement_aggregates(df))
+
+@st.cache_data
+def load_experience_clusters():
+    # Per-user clusters and scores come from the offline experience batch job.
+    # Raises if they are missing or were built from other data.
+    return load_experience_scores(EXPERIENCE_SCORES_PATH, data=df)
 
 # Title
 st.title("Telecom Analytics Dashboard")
@@ -68,20 +87,14 @@ if page == "User Overview":
 elif page == "User Engagement":
     st.header("User Engagement")
     
-    # Engagement Metrics
-    engagement_metrics = df.groupby('MSISDN').agg({
-        'Session ID': 'count',
-        'Duration': 'sum',
-        'Total DL + UL': 'sum'
-    }).reset_index()
-    
-    # Normalize engagement metrics
-    scaler = StandardScaler()
-    engagement_normalized = scaler.fit_transform(engagement_metrics[['Session ID', 'Duration', 'Total DL + UL']])
-    
-    # K-means clustering
-    kmeans = KMeans(n_clusters=3, random_state=42)
-    engagement_metrics['Cluster'] = kmeans.fit_predict(engagement_normalized)
+    # Engagement Metrics with their precomputed clusters
+    try:
+        engagement_metrics = load_engagement_clusters()
+    except (FileNotFoundError, ValueError) as e:
+        st.error(f"{e}. Run the engagement batch job to rebuild them: "
+                 f"`python -m scripts.engagement_clustering {SESSIONS_PATH} --model {ENGAGEMENT_MODEL_PATH} "
+                 f"--output {ENGAGEMENT_CLUSTERS_PATH}`{DEMO_HINT}")
+        st.stop()
     
     # Visualize clusters
     fig = px.scatter_3d(engagement_metrics, x='Session ID', y='Duration', z='Total DL + UL', color='Cluster',
@@ -125,40 +138,47 @@ elif page == "Experience Analysis":
     fig.update_layout(title="Throughput by Handset Type")
     st.plotly_chart(fig, use_container_width=True)
     
-    # Experience Clustering
-    experience_metrics = df[['TCP Retransmission', 'RTT', 'Throughput']]
-    kmeans = KMeans(n_clusters=3, random_state=42)
-    df['Experience Cluster'] = kmeans.fit_predict(experience_metrics)
-    
-    fig = px.scatter_3d(df, x='TCP Retransmission', y='RTT', z='Throughput', color='Experience Cluster',
-                        title="User Experience Clusters")
+    # Experience Clustering (precomputed per user)
+    try:
+        experience_clusters = load_experience_clusters()
+    except (FileNotFoundError, ValueError) as e:
+        st.error(f"{e}. Run the experience batch job to rebuild them: "
+                 f"`python -m scripts.experience_clustering {SESSIONS_PATH} --model {EXPERIENCE_MODEL_PATH} "
+                 f"--output {EXPERIENCE_SCORES_PATH}`{DEMO_HINT}")
+        st.stop()
+    
+    fig = px.scatter_3d(experience_clusters, x='TCP Retransmission', y='RTT', z='Throughput',
+                        color='Experience Cluster', title="User Experience Clusters")
     st.plotly_chart(fig, use_container_width=True)
 
 elif page == "Satisfaction Analysis":
     st.header("Satisfaction Analysis")
     
     # Simulate satisfaction scores based on engagement and experience
-    df['Engagement Score'] = (df['Duration'] + df['Total DL + UL']) / 2
-    df['Experience Score'] = (100 - df['TCP Retransmission']*100 + (100 - df['RTT']) + df['Throughput']) / 3
-    df['Satisfaction Score'] = (df['Engagement Score'] + df['Experience Score']) / 2
+    # (on a copy, so the cached data is never modified)
+    scores = df.assign(
+        **{'Engagement Score': (df['Duration'] + df['Total DL + UL']) / 2,
+           'Experience Score': (100 - df['TCP Retransmission']*100 + (100 - df['RTT']) + df['Throughput']) / 3}
+    )
+    scores['Satisfaction Score'] = (scores['Engagement Score'] + scores['Experience Score']) / 2
     
     col1, col2, col3 = st.columns(3)
-    col1.metric("Average Satisfaction Score", f"{df['Satisfaction Score'].mean():.2f}")
-    col2.metric("Highly Satisfied Users", f"{(df['Satisfaction Score'] >= 75).mean():.1%}")
+    col1.metric("Average Satisfaction Score", f"{scores['Satisfaction Score'].mean():.2f}")
+    col2.metric("Highly Satisfied Users", f"{(scores['Satisfaction Score'] >= 75).mean():.1%}")
     col3.metric("Satisfaction Trend", "↑ 5%")
     
     # Satisfaction Distribution
-    fig = px.histogram(df, x='Satisfaction Score', title="Satisfaction Score Distribution")
+    fig = px.histogram(scores, x='Satisfaction Score', title="Satisfaction Score Distribution")
     st.plotly_chart(fig, use_container_width=True)
     
     # Correlation between Engagement and Experience
-    fig = px.scatter(df, x='Engagement Score', y='Experience Score', color='Satisfaction Score',
+    fig = px.scatter(scores, x='Engagement Score', y='Experience Score', color='Satisfaction Score',
                      title="Engagement vs Experience")
     st.plotly_chart(fig, use_container_width=True)
     
     # Top 10 Satisfied Customers
     st.subheader("Top 10 Satisfied Customers")
-    top_satisfied = df.nlargest(10, 'Satisfaction Score')[['MSISDN', 'Satisfaction Score', 'Engagement Score', 'Experience Score']]
+    top_satisfied = scores.nlargest(10, 'Satisfaction Score')[['MSISDN', 'Satisfaction Score', 'Engagement Score', 'Experience Score']]
     st.dataframe(top_satisfied)
     
     # Satisfaction Prediction (placeholder for actual model)
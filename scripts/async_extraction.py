@@ -0,0 +1,173 @@
+import json
+import asyncio
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class _PageWriter:
+    """
+    Append pages of records to an NDJSON or Parquet file as they arrive.
+    """
+
+    def __init__(self, file_path, file_type='ndjson'):
+        if file_type not in ('ndjson', 'parquet'):
+            raise ValueError(f"Unsupported file type: {file_type}")
+        self.file_path = file_path
+        self.file_type = file_type
+        self.records = 0
+        self._file = open(file_path, 'w') if file_type == 'ndjson' else None
+        self._writer = None
+
+    def write(self, records):
+        if not records:
+            return
+        if self.file_type == 'ndjson':
+            self._file.writelines(json.dumps(record) + '\n' for record in records)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._writer is None:
+                table = pa.Table.from_pylist(records)
+                self._writer = pq.ParquetWriter(self.file_path, table.schema, compression='zstd')
+            else:
+                table = pa.Table.from_pylist(records, schema=self._writer.schema)
+            self._writer.write_table(table)
+        self.records += len(records)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def _get_json(session, url, params=None, max_retries=3, backoff=0.5):
+    """
+    GET a URL and decode its JSON body, retrying transient failures with exponential backoff.
+
+    Parameters:
+    - session (aiohttp.ClientSession): Shared keep-alive session.
+    - url (str): Request URL.
+    - params (dict): Query parameters.
+    - max_retries (int): Retries after the first attempt.
+    - backoff (float): Base delay in seconds; doubled on every retry.
+
+    Returns:
+    - dict or list: Parsed JSON response.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status in RETRY_STATUSES and attempt < max_retries:
+                    retry_after = response.headers.get('Retry-After')
+                    delay = float(retry_after) if retry_after and retry_after.isdigit() else backoff * 2 ** attempt
+                    logger.warning(f"{url} returned {response.status}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                response.raise_for_status()
+                return await response.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logger.warning(f"{url} failed ({e!r}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def _page_records(payload, results_key):
+    """Return the list of records held by one page of an API response."""
+    if isinstance(payload, list):
+        return payload
+    return payload.get(results_key) or []
+
+
+async def extract_from_api_async(url, file_path, file_type='ndjson', params=None, headers=None,
+                                 page_param='page', start_page=1, results_key='results',
+                                 next_key='next', concurrency=4, max_retries=3, backoff=0.5,
+                                 timeout=30):
+    """
+    Extract every page of a paginated API endpoint and stream the records to a file.
+
+    Two pagination styles are supported. If the first response is an object with a
+    `next_key` field, its links are followed one after the other. Otherwise pages are
+    requested by number through `page_param`, `concurrency` pages at a time, until a
+    page comes back empty. Pages are written in order as they complete, so memory
+    holds at most one window of pages.
+
+    Parameters:
+    - url (str): The API endpoint.
+    - file_path (str): Output path.
+    - file_type (str): Output format ('ndjson' or 'parquet').
+    - params (dict): Query parameters for every request.
+    - headers (dict): Headers for every request.
+    - page_param (str): Query parameter carrying the page number.
+    - start_page (int): First page number.
+    - results_key (str): Key holding the records when a page is a JSON object.
+    - next_key (str): Key holding the next-page URL for link pagination.
+    - concurrency (int): Maximum number of requests in flight.
+    - max_retries (int): Retries per request on connection errors, 429 and 5xx.
+    - backoff (float): Base retry delay in seconds.
+    - timeout (float): Total timeout per request in seconds.
+
+    Returns:
+    - int: Number of records written.
+    """
+    params = dict(params or {})
+    writer = _PageWriter(file_path, file_type)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    try:
+        async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=client_timeout) as session:
+            first = await _get_json(session, url, {**params, page_param: start_page}, max_retries, backoff)
+            writer.write(_page_records(first, results_key))
+
+            if isinstance(first, dict) and next_key in first:
+                next_url = first.get(next_key)
+                while next_url:
+                    payload = await _get_json(session, next_url, None, max_retries, backoff)
+                    writer.write(_page_records(payload, results_key))
+                    next_url = payload.get(next_key) if isinstance(payload, dict) else None
+                return writer.records
+
+            if not _page_records(first, results_key):
+                return writer.records
+
+            page = start_page + 1
+            while True:
+                window = range(page, page + concurrency)
+                payloads = await asyncio.gather(*(
+                    _get_json(session, url, {**params, page_param: number}, max_retries, backoff)
+                    for number in window
+                ))
+                for payload in payloads:
+                    records = _page_records(payload, results_key)
+                    if not records:
+                        return writer.records
+                    writer.write(records)
+                page += concurrency
+    finally:
+        writer.close()
+
+
+def extract_from_api_paginated(url, file_path, file_type='ndjson', **kwargs):
+    """
+    Synchronous wrapper around `extract_from_api_async`.
+
+    Parameters:
+    - url (str): The API endpoint.
+    - file_path (str): Output path.
+    - file_type (str): Output format ('ndjson' or 'parquet').
+    - **kwargs: Pagination, retry and concurrency options of `extract_from_api_async`.
+
+    Returns:
+    - int: Number of records written.
+    """
+    return asyncio.run(extract_from_api_async(url, file_path, file_type=file_type, **kwargs))
@@ -0,0 +1,58 @@
+# scripts/benchmark_copy.py
+
+import sys
+import time
+
+import pandas as pd
+
+from scripts.bulk_copy import copy_to_dataframe
+from scripts.load_data import (
+    load_data_from_postgres,
+    load_data_using_sqlalchemy,
+    stream_data_from_postgres,
+)
+
+
+def _time_loader(name, loader, repeat):
+    """
+    Runs a loader `repeat` times and reports its best wall-clock time and row count.
+
+    :param name: Label printed in the report.
+    :param loader: Zero-argument callable returning a DataFrame.
+    :param repeat: Number of runs.
+    :return: Tuple of (name, best seconds, rows).
+    """
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = loader()
+        best = min(best, time.perf_counter() - start)
+        rows = 0 if df is None else len(df)
+    return name, best, rows
+
+
+def run_benchmark(query: str = "SELECT * FROM xdr_data", repeat: int = 3):
+    """
+    Compares the existing loaders with the COPY-based bulk unload.
+
+    :param query: Query unloaded by every loader.
+    :param repeat: Runs per loader; the best time is reported.
+    :return: List of (name, best seconds, rows) tuples.
+    """
+    loaders = [
+        ("psycopg2 read_sql_query", lambda: load_data_from_postgres(query)),
+        ("sqlalchemy read_sql_query", lambda: load_data_using_sqlalchemy(query)),
+        ("server-side cursor", lambda: pd.concat(stream_data_from_postgres(query), ignore_index=True)),
+        ("COPY TO STDOUT (csv)", lambda: copy_to_dataframe(query)),
+    ]
+    results = [_time_loader(name, loader, repeat) for name, loader in loaders]
+
+    baseline = results[0][1]
+    for name, seconds, rows in results:
+        print(f"{name:<28} {seconds:8.2f}s  {baseline / seconds:5.1f}x  {rows} rows")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark(*sys.argv[1:2])
@@ -0,0 +1,126 @@
+# scripts/bulk_copy.py
+
+import io
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from scripts.db_engine import get_engine
+from scripts.load_data import get_connection_string
+
+logger = logging.getLogger(__name__)
+
+# COPY output is buffered in memory up to this size before spilling to a temp file.
+SPOOL_MAX_BYTES = 256 * 1024 * 1024
+
+# Rows serialized per COPY FROM STDIN round when uploading a DataFrame.
+UPLOAD_BATCH_ROWS = 100_000
+
+
+@contextmanager
+def _raw_connection(connection=None):
+    """
+    Yields a DBAPI connection, borrowing one from the shared engine pool if none is given.
+
+    :param connection: Optional open psycopg2 connection owned by the caller.
+    """
+    if connection is not None:
+        yield connection
+        return
+
+    raw = get_engine(get_connection_string()).raw_connection()
+    try:
+        yield raw
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
+def _copy_out(query: str, connection=None) -> tempfile.SpooledTemporaryFile:
+    """
+    Runs `COPY (query) TO STDOUT` in CSV format into a spooled buffer.
+
+    :param query: SELECT statement or table name to unload.
+    :param connection: Optional open psycopg2 connection.
+    :return: Buffer positioned at the start of the CSV output (with header).
+    """
+    source = query.strip().rstrip(";")
+    if source.lower().startswith(("select", "with")):
+        source = f"({source})"
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    with _raw_connection(connection) as conn:
+        with conn.cursor() as cursor:
+            cursor.copy_expert(f"COPY {source} TO STDOUT WITH (FORMAT csv, HEADER true)", buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def copy_to_dataframe(query: str, connection=None, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Unloads a query or table into a DataFrame with `COPY ... TO STDOUT`.
+
+    The server streams the whole result as CSV in one pass, which is parsed by
+    pandas' C parser instead of being converted row by row by the DBAPI driver.
+
+    :param query: SELECT statement or table name (e.g. 'xdr_data').
+    :param connection: Optional open psycopg2 connection; defaults to the shared pool.
+    :param read_csv_kwargs: Extra arguments for `pd.read_csv`, such as `dtype`.
+    :return: DataFrame with the query results.
+    """
+    with _copy_out(query, connection) as buffer:
+        return pd.read_csv(buffer, **read_csv_kwargs)
+
+
+def copy_to_chunks(query: str, chunksize: int = UPLOAD_BATCH_ROWS, connection=None,
+                   **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Unloads a query or table with `COPY ... TO STDOUT` and yields it in chunks.
+
+    :param query: SELECT statement or table name.
+    :param chunksize: Rows per yielded DataFrame.
+    :param connection: Optional open psycopg2 connection.
+    :param read_csv_kwargs: Extra arguments for `pd.read_csv`.
+    :return: Iterator of DataFrames.
+    """
+    with _copy_out(query, connection) as buffer:
+        with pd.read_csv(buffer, chunksize=chunksize, **read_csv_kwargs) as reader:
+            yield from reader
+
+
+def copy_from_dataframe(df: pd.DataFrame, table: str, connection=None,
+                        columns: Optional[List[str]] = None,
+                        batch_rows: int = UPLOAD_BATCH_ROWS) -> int:
+    """
+    Bulk-loads a DataFrame into an existing table with `COPY ... FROM STDIN`.
+
+    Rows are serialized to CSV in batches of `batch_rows`, so the text buffer never
+    holds more than one batch.
+
+    :param df: DataFrame to upload.
+    :param table: Target table name.
+    :param connection: Optional open psycopg2 connection; defaults to the shared pool.
+    :param columns: Columns to load. Defaults to all DataFrame columns.
+    :param batch_rows: Rows serialized per COPY round.
+    :return: Number of rows loaded.
+    """
+    columns = list(columns or df.columns)
+    column_list = ", ".join(f'"{col}"' for col in columns)
+    statement = f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+
+    with _raw_connection(connection) as conn:
+        with conn.cursor() as cursor:
+            for start in range(0, len(df), batch_rows):
+                buffer = io.StringIO()
+                # Slice rows before selecting columns so only one batch is copied.
+                df.iloc[start:start + batch_rows][columns].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(statement, buffer)
+
+    logger.info(f"Copied {len(df)} rows into {table}")
+    return len(df)
@@ -0,0 +1,159 @@
+import json
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def _sorted_categories(values):
+    """Sort category values, falling back to string order for mixed types."""
+    values = [value.item() if isinstance(value, np.generic) else value for value in values]
+    try:
+        return sorted(values)
+    except TypeError:
+        return sorted(values, key=str)
+
+
+class CategoricalEncoder:
+    """
+    Categorical encoder with a persisted, append-only vocabulary.
+
+    `fit` assigns codes in sorted order (the same codes `LabelEncoder` gives);
+    `partial_fit` appends categories seen in later chunks at the end, so codes
+    already handed out never change between batches. Unseen or missing values
+    encode to -1 (or raise, with handle_unknown='error'). Output is compact int32
+    codes or a sparse one-hot matrix built for all columns in one pass.
+
+    Parameters:
+    - columns (list): Columns to encode.
+    - handle_unknown (str): 'ignore' to encode unseen categories as -1 / all-zero
+      one-hot rows, or 'error' to raise.
+    """
+
+    def __init__(self, columns, handle_unknown='ignore'):
+        if handle_unknown not in ('ignore', 'error'):
+            raise ValueError(f"Unsupported handle_unknown: {handle_unknown}")
+        self.columns = list(columns)
+        self.handle_unknown = handle_unknown
+        self.vocabulary_ = None
+
+    def fit(self, df):
+        """
+        Build the vocabulary of every column from scratch.
+
+        Parameters:
+        - df (pd.DataFrame): Data to fit on.
+
+        Returns:
+        - CategoricalEncoder: The fitted encoder.
+        """
+        self.vocabulary_ = {col: _sorted_categories(df[col].dropna().unique()) for col in self.columns}
+        return self
+
+    def partial_fit(self, df):
+        """
+        Append categories not seen before to the vocabulary, keeping existing codes.
+
+        Parameters:
+        - df (pd.DataFrame): Chunk of data.
+
+        Returns:
+        - CategoricalEncoder: The updated encoder.
+        """
+        if self.vocabulary_ is None:
+            return self.fit(df)
+        for col in self.columns:
+            known = pd.Index(self.vocabulary_[col])
+            values = pd.Index(df[col].dropna().unique())
+            self.vocabulary_[col] = self.vocabulary_[col] + _sorted_categories(values.difference(known))
+        return self
+
+    def _codes(self, df, col):
+        codes = pd.Categorical(df[col], categories=self.vocabulary_[col]).codes.astype(np.int32)
+        if self.handle_unknown == 'error':
+            unknown = (codes == -1) & df[col].notna().to_numpy()
+            if unknown.any():
+                raise ValueError(f"Unknown categories in column {col}: {df[col][unknown].unique()[:5]}")
+        return codes
+
+    def transform(self, df, inplace=False):
+        """
+        Replace every encoded column with its int32 codes.
+
+        Parameters:
+        - df (pd.DataFrame): Data to encode.
+        - inplace (bool): Modify `df` instead of a copy.
+
+        Returns:
+        - pd.DataFrame: DataFrame with encoded columns.
+        """
+        if self.vocabulary_ is None:
+            raise ValueError("CategoricalEncoder is not fitted")
+        if not inplace:
+            df = df.copy()
+        for col in self.columns:
+            df[col] = self._codes(df, col)
+        return df
+
+    def get_feature_names(self):
+        """
+        Names of the one-hot output columns, formatted as '<column>_<category>'.
+
+        Returns:
+        - list: Feature names in output order.
+        """
+        return [f"{col}_{category}" for col in self.columns for category in self.vocabulary_[col]]
+
+    def transform_onehot(self, df):
+        """
+        One-hot encode all columns into one sparse matrix.
+
+        Parameters:
+        - df (pd.DataFrame): Data to encode.
+
+        Returns:
+        - scipy.sparse.csr_matrix: Matrix of shape (len(df), number of features) with
+          columns ordered as `get_feature_names()`.
+        """
+        if self.vocabulary_ is None:
+            raise ValueError("CategoricalEncoder is not fitted")
+        rows, cols = [], []
+        offset = 0
+        for col in self.columns:
+            codes = self._codes(df, col)
+            present = np.flatnonzero(codes >= 0)
+            rows.append(present)
+            cols.append(codes[present] + offset)
+            offset += len(self.vocabulary_[col])
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        data = np.ones(len(rows), dtype=np.uint8)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(df), offset))
+
+    def save(self, file_path):
+        """
+        Save the vocabulary to a JSON file.
+
+        Parameters:
+        - file_path (str): Destination path.
+        """
+        if self.vocabulary_ is None:
+            raise ValueError("CategoricalEncoder is not fitted")
+        with open(file_path, 'w') as f:
+            json.dump({'handle_unknown': self.handle_unknown, 'vocabulary': self.vocabulary_}, f, indent=4)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load an encoder saved with `save`.
+
+        Parameters:
+        - file_path (str): Path to the JSON file.
+
+        Returns:
+        - CategoricalEncoder: Fitted encoder.
+        """
+        with open(file_path) as f:
+            state = json.load(f)
+        encoder = cls(list(state['vocabulary']), handle_unknown=state['handle_unknown'])
+        encoder.vocabulary_ = state['vocabulary']
+        return encoder
@@ -0,0 +1,86 @@
+import pandas as pd
+
+# Rows per Parquet row group. Each row group carries min/max statistics per
+# column, which lets readers skip groups that cannot match a filter.
+DEFAULT_ROW_GROUP_SIZE = 128_000
+
+DEFAULT_COMPRESSION = 'zstd'
+
+def write_parquet(df, file_path, compression=DEFAULT_COMPRESSION, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Write a DataFrame to a compressed Parquet file with row-group statistics.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame to save.
+    - file_path (str): Destination path.
+    - compression (str): Codec ('zstd', 'snappy', 'gzip' or None).
+    - row_group_size (int): Maximum number of rows per row group.
+    """
+    df.to_parquet(
+        file_path,
+        engine='pyarrow',
+        index=False,
+        compression=compression,
+        row_group_size=row_group_size,
+        write_statistics=True,
+    )
+
+def read_parquet(file_path, columns=None, filters=None):
+    """
+    Read a Parquet file, decoding only the requested columns and row groups.
+
+    Parameters:
+    - file_path (str): Path to a Parquet file or directory of files.
+    - columns (list): Columns to read. Defaults to all columns.
+    - filters (list): Row filters in pyarrow form, e.g.
+      `[('Handset Manufacturer', '==', 'Apple'), ('Start', '>=', pd.Timestamp('2019-04-25'))]`.
+      Row groups whose statistics exclude the predicate are skipped entirely.
+
+    Returns:
+    - pd.DataFrame: Loaded data.
+    """
+    return pd.read_parquet(file_path, engine='pyarrow', columns=columns, filters=filters)
+
+def write_parquet_batches(batches, file_path, compression=DEFAULT_COMPRESSION):
+    """
+    Write an iterable of DataFrames to one Parquet file, one batch at a time.
+
+    The schema is taken from the first non-empty batch; later batches are cast to
+    it, so every batch must share the same columns. Only one batch is held in
+    memory at a time. If every batch is empty, a file with no rows is written
+    using the columns of the first batch.
+
+    Parameters:
+    - batches (iterable of pd.DataFrame): Batches to append.
+    - file_path (str): Destination path.
+    - compression (str): Parquet compression codec.
+
+    Returns:
+    - int: Number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    first_empty = None
+    rows = 0
+    try:
+        for batch in batches:
+            if batch.empty:
+                if first_empty is None:
+                    first_empty = batch
+                continue
+            if writer is None:
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+                writer = pq.ParquetWriter(file_path, table.schema, compression=compression)
+            else:
+                table = pa.Table.from_pandas(batch, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(batch)
+        if writer is None and first_empty is not None:
+            pq.write_table(pa.Table.from_pandas(first_empty, preserve_index=False), file_path,
+                           compression=compression)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
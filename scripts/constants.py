@@ -0,0 +1,4 @@
+# Constants shared by the xDR schema and the parsing helpers.
+
+# Timestamp format of the Start/End columns of the xDR export ("4/4/2019 12:01").
+DATETIME_FORMAT = '%m/%d/%Y %H:%M'
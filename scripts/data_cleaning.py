@@ -1,27 +1,67 @@
 import pandas as pd
 import numpy as np
 
-def load_data(file_path, file_type='csv'):
+from scripts.categorical_encoder import CategoricalEncoder
+from scripts.columnar_storage import DEFAULT_COMPRESSION, DEFAULT_ROW_GROUP_SIZE, read_parquet, write_parquet
+from scripts.data_extraction import iter_xdr_chunks
+from scripts.imputer import Imputer
+from scripts.outliers import filter_outliers
+
+def load_data(file_path, file_type='csv', chunksize=None, columns=None, filters=None):
     """
     Load data from a specified file path.
     
     Parameters:
     - file_path (str): Path to the data file.
-    - file_type (str): Type of the file (default is 'csv'). Options: 'csv', 'excel', 'json'.
+    - file_type (str): Type of the file (default is 'csv'). Options: 'csv', 'excel', 'json', 'parquet'.
+    - chunksize (int): For 'csv', stream xDR-typed chunks of this many rows instead
+      of loading the whole file.
+    - columns (list): For 'parquet', the subset of columns to decode.
+    - filters (list): For 'parquet', pyarrow row filters such as
+      `[('Handset Manufacturer', '==', 'Apple')]`, pushed down to row groups.
     
     Returns:
-    - pd.DataFrame: Loaded data as a pandas DataFrame.
+    - pd.DataFrame or iterator of pd.DataFrame: Loaded data as a pandas DataFrame,
+      or an iterator of chunks when `chunksize` is given.
     """
     if file_type == 'csv':
+        if chunksize is not None:
+            return iter_xdr_chunks(file_path, chunksize=chunksize)
         return pd.read_csv(file_path)
     elif file_type == 'excel':
         return pd.read_excel(file_path)
     elif file_type == 'json':
         return pd.read_json(file_path)
+    elif file_type == 'parquet':
+        return read_parquet(file_path, columns=columns, filters=filters)
     else:
         raise ValueError(f"Unsupported file type: {file_type}")
 
-def handle_missing_values(df, strategy='mean', columns=None):
+def clean_chunks(chunks, steps):
+    """
+    Apply a sequence of cleaning functions to each chunk of a stream.
+
+    Categorical columns keep the categories of each chunk; combine the cleaned
+    chunks with `data_extraction.concat_xdr_chunks` to keep them categorical.
+
+    Parameters:
+    - chunks (iterable of pd.DataFrame): Chunks, e.g. from `load_data(..., chunksize=...)`.
+    - steps (list): Cleaning functions, either callables taking a DataFrame or
+      `(function, kwargs)` tuples such as `(remove_outliers, {'columns': [...]})`.
+
+    Yields:
+    - pd.DataFrame: Cleaned chunk.
+    """
+    for chunk in chunks:
+        for step in steps:
+            if isinstance(step, tuple):
+                func, kwargs = step
+                chunk = func(chunk, **kwargs)
+            else:
+                chunk = step(chunk)
+        yield chunk
+
+def handle_missing_values(df, strategy='mean', columns=None, imputer=None):
     """
     Handle missing values in the DataFrame.
     
@@ -29,54 +69,47 @@ def handle_missing_values(df, strategy='mean', columns=None):
     - df (pd.DataFrame): DataFrame to clean.
     - strategy (str): Strategy to handle missing values ('mean', 'median', 'mode', 'drop').
     - columns (list): List of columns to apply the strategy to. If None, apply to all.
+    - imputer (Imputer): Optional fitted `scripts.imputer.Imputer` whose statistics are
+      reused instead of being recomputed from `df` (e.g. across streaming batches).
     
     Returns:
     - pd.DataFrame: Cleaned DataFrame.
     """
+    if imputer is not None:
+        return imputer.transform(df, inplace=True)
+
     if columns is None:
         columns = df.columns
+    columns = [col for col in columns if df[col].isnull().any()]
+    if not columns:
+        return df
 
-    for col in columns:
-        if df[col].isnull().sum() > 0:
-            if strategy == 'mean':
-                df[col].fillna(df[col].mean(), inplace=True)
-            elif strategy == 'median':
-                df[col].fillna(df[col].median(), inplace=True)
-            elif strategy == 'mode':
-                df[col].fillna(df[col].mode()[0], inplace=True)
-            elif strategy == 'drop':
-                df.dropna(subset=[col], inplace=True)
-            else:
-                raise ValueError(f"Unsupported strategy: {strategy}")
+    if strategy == 'drop':
+        df.dropna(subset=columns, inplace=True)
+    elif strategy in ('mean', 'median', 'mode'):
+        Imputer(strategy, columns=columns).fit_transform(df, inplace=True)
+    else:
+        raise ValueError(f"Unsupported strategy: {strategy}")
     return df
 
-def remove_outliers(df, columns, method='zscore', threshold=3):
+def remove_outliers(df, columns, method='zscore', threshold=None, action='drop'):
     """
     Remove outliers from specified columns in the DataFrame.
     
+    Bounds for all columns are computed in one pass and the rows are filtered
+    once with a combined mask (see `scripts.outliers`).
+    
     Parameters:
     - df (pd.DataFrame): DataFrame to clean.
     - columns (list): List of columns to check for outliers.
     - method (str): Method to detect outliers ('zscore' or 'iqr').
-    - threshold (float): Threshold for outlier detection. Default is 3 for 'zscore'.
+    - threshold (float): Threshold for outlier detection. Default is 3 for 'zscore' and 1.5 (IQR multiplier) for 'iqr'.
+    - action (str): 'drop' to remove outlier rows, 'clip' to clip values to the bounds instead.
     
     Returns:
     - pd.DataFrame: Cleaned DataFrame.
     """
-    for col in columns:
-        if method == 'zscore':
-            from scipy.stats import zscore
-            z_scores = zscore(df[col].dropna())
-            abs_z_scores = np.abs(z_scores)
-            df = df[abs_z_scores < threshold]
-        elif method == 'iqr':
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            df = df[(df[col] >= (Q1 - 1.5 * IQR)) & (df[col] <= (Q3 + 1.5 * IQR))]
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-    return df
+    return filter_outliers(df, columns, method=method, threshold=threshold, action=action, ddof=0)
 
 def standardize_columns(df):
     """
@@ -91,50 +124,65 @@ def standardize_columns(df):
     df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
     return df
 
-def drop_duplicates(df):
+def drop_duplicates(df, deduplicator=None):
     """
     Drop duplicate rows from the DataFrame.
-    
+
     Parameters:
     - df (pd.DataFrame): DataFrame to clean.
-    
+    - deduplicator (StreamingDeduplicator): Optional key-based deduplicator that also
+      drops rows already seen in earlier chunks, files or runs, e.g.
+      `clean_chunks(chunks, [(drop_duplicates, {'deduplicator': dedup})])`.
+
     Returns:
     - pd.DataFrame: Cleaned DataFrame without duplicates.
     """
+    if deduplicator is not None:
+        return deduplicator.filter(df)
     return df.drop_duplicates()
 
-def encode_categorical(df, columns, encoding_type='onehot'):
+def encode_categorical(df, columns, encoding_type='onehot', sparse=False, encoder=None):
     """
     Encode categorical variables in the DataFrame.
     
+    All columns are encoded in one pass and joined to the frame with a single concat.
+    
     Parameters:
     - df (pd.DataFrame): DataFrame to clean.
     - columns (list): List of columns to encode.
     - encoding_type (str): Encoding method ('onehot' or 'label').
+    - sparse (bool): For 'onehot', return the dummy columns as sparse columns.
+    - encoder (CategoricalEncoder): Optional fitted `scripts.categorical_encoder.CategoricalEncoder`
+      whose vocabulary is reused so every batch gets the same columns and codes.
     
     Returns:
     - pd.DataFrame: Cleaned DataFrame with encoded categorical variables.
     """
-    for col in columns:
-        if encoding_type == 'onehot':
-            onehot_encoded = pd.get_dummies(df[col], prefix=col)
-            df = pd.concat([df, onehot_encoded], axis=1).drop(col, axis=1)
-        elif encoding_type == 'label':
-            from sklearn.preprocessing import LabelEncoder
-            le = LabelEncoder()
-            df[col] = le.fit_transform(df[col])
-        else:
-            raise ValueError(f"Unsupported encoding type: {encoding_type}")
-    return df
+    if encoding_type not in ('onehot', 'label'):
+        raise ValueError(f"Unsupported encoding type: {encoding_type}")
+    if encoder is None:
+        encoder = CategoricalEncoder(columns).fit(df)
+
+    if encoding_type == 'label':
+        return encoder.transform(df, inplace=True)
+
+    onehot = encoder.transform_onehot(df)
+    if sparse:
+        dummies = pd.DataFrame.sparse.from_spmatrix(onehot, index=df.index, columns=encoder.get_feature_names())
+    else:
+        dummies = pd.DataFrame(onehot.toarray().astype(bool), index=df.index, columns=encoder.get_feature_names())
+    return pd.concat([df.drop(columns=columns), dummies], axis=1)
 
-def save_cleaned_data(df, file_path, file_type='csv'):
+def save_cleaned_data(df, file_path, file_type='csv', compression=DEFAULT_COMPRESSION, row_group_size=DEFAULT_ROW_GROUP_SIZE):
     """
     Save the cleaned DataFrame to a file.
     
     Parameters:
     - df (pd.DataFrame): DataFrame to save.
     - file_path (str): Path to save the file.
-    - file_type (str): File type to save as ('csv', 'excel', 'json').
+    - file_type (str): File type to save as ('csv', 'excel', 'json', 'parquet').
+    - compression (str): Parquet compression codec.
+    - row_group_size (int): Rows per Parquet row group.
     """
     if file_type == 'csv':
         df.to_csv(file_path, index=False)
@@ -142,5 +190,7 @@ def save_cleaned_data(df, file_path, file_type='csv'):
         df.to_excel(file_path, index=False)
     elif file_type == 'json':
         df.to_json(file_path, orient='records', lines=True)
+    elif file_type == 'parquet':
+        write_parquet(df, file_path, compression=compression, row_group_size=row_group_size)
     else:
         raise ValueError(f"Unsupported file type: {file_type}")
@@ -1,18 +1,71 @@
 import pandas as pd
 import requests
-import sqlite3
+from pandas.api.types import union_categoricals
 
-def extract_from_csv(file_path):
+from scripts.columnar_storage import DEFAULT_COMPRESSION, DEFAULT_ROW_GROUP_SIZE, read_parquet, write_parquet
+from scripts.sqlite_source import get_sqlite_source
+from scripts.xdr_schema import apply_xdr_schema, xdr_read_options
+
+def extract_from_csv(file_path, chunksize=None, usecols=None):
     """
     Extract data from a CSV file.
 
     Parameters:
     - file_path (str): Path to the CSV file.
+    - chunksize (int): If given, stream the file as xDR-typed chunks of this many rows.
+    - usecols (list): Optional subset of columns to read.
 
     Returns:
-    - pd.DataFrame: Data loaded from the CSV file.
+    - pd.DataFrame or iterator of pd.DataFrame: Data loaded from the CSV file.
+    """
+    if chunksize is not None:
+        return iter_xdr_chunks(file_path, chunksize=chunksize, usecols=usecols)
+    return pd.read_csv(file_path, usecols=usecols)
+
+def iter_xdr_chunks(file_path, chunksize=100_000, usecols=None):
     """
-    return pd.read_csv(file_path)
+    Stream an xDR CSV export in bounded-size chunks with the xDR schema applied.
+
+    Only one chunk is held in memory at a time, so peak memory is governed by
+    `chunksize` rather than by the size of the file. Identifiers are returned as
+    nullable integers, handset and location columns as categoricals and the
+    Start/End columns as datetimes.
+
+    Parameters:
+    - file_path (str): Path to the CSV file.
+    - chunksize (int): Number of rows per chunk.
+    - usecols (list): Optional subset of columns to read.
+
+    Yields:
+    - pd.DataFrame: Typed chunk of at most `chunksize` rows.
+    """
+    reader = pd.read_csv(file_path, chunksize=chunksize, **xdr_read_options(usecols))
+    with reader:
+        for chunk in reader:
+            yield apply_xdr_schema(chunk)
+
+def concat_xdr_chunks(chunks):
+    """
+    Concatenate typed xDR chunks into one DataFrame.
+
+    Each chunk has its own categories, and `pd.concat` turns categoricals with
+    different categories into object columns; here every chunk is first given
+    the union of the categories, so categorical columns stay categorical.
+
+    Parameters:
+    - chunks (iterable of pd.DataFrame): Chunks, e.g. from `iter_xdr_chunks`.
+
+    Returns:
+    - pd.DataFrame: Concatenated data with a fresh index.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    dtypes = {
+        col: pd.CategoricalDtype(union_categoricals([chunk[col] for chunk in chunks]).categories)
+        for col in chunks[0].columns if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)
+    }
+    return pd.concat([chunk.astype(dtypes) for chunk in chunks], ignore_index=True)
 
 def extract_from_excel(file_path, sheet_name=None):
     """
@@ -39,6 +92,20 @@ def extract_from_json(file_path):
     """
     return pd.read_json(file_path)
 
+def extract_from_parquet(file_path, columns=None, filters=None):
+    """
+    Extract data from a Parquet file.
+
+    Parameters:
+    - file_path (str): Path to the Parquet file.
+    - columns (list): Columns to read. Defaults to all columns.
+    - filters (list): pyarrow row filters, e.g. `[('Start', '>=', pd.Timestamp('2019-04-25'))]`.
+
+    Returns:
+    - pd.DataFrame: Data loaded from the Parquet file.
+    """
+    return read_parquet(file_path, columns=columns, filters=filters)
+
 def extract_from_api(url, params=None, headers=None):
     """
     Extract data from an API endpoint.
@@ -55,30 +122,37 @@ def extract_from_api(url, params=None, headers=None):
     response.raise_for_status()
     return response.json()
 
-def extract_from_database(db_path, query):
+def extract_from_database(db_path, query, params=None, chunksize=None):
     """
     Extract data from a SQLite database.
 
+    The database is opened read-only through a cached, tuned connection
+    (see `scripts.sqlite_source`), so repeated queries do not reconnect.
+
     Parameters:
     - db_path (str): Path to the SQLite database.
     - query (str): SQL query to execute.
+    - params (tuple or dict): Query parameters.
+    - chunksize (int): If given, yield the result in chunks of this many rows.
 
     Returns:
-    - pd.DataFrame: Data loaded from the database.
+    - pd.DataFrame or iterator of pd.DataFrame: Data loaded from the database.
     """
-    conn = sqlite3.connect(db_path)
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
+    source = get_sqlite_source(db_path)
+    if chunksize is not None:
+        return source.iter_chunks(query, params=params, chunksize=chunksize)
+    return source.read(query, params=params)
 
-def save_raw_data(data, file_path, file_type='csv'):
+def save_raw_data(data, file_path, file_type='csv', compression=DEFAULT_COMPRESSION, row_group_size=DEFAULT_ROW_GROUP_SIZE):
     """
     Save raw data to a file.
 
     Parameters:
     - data (pd.DataFrame or dict or list): Data to save.
     - file_path (str): Path to save the file.
-    - file_type (str): File type ('csv', 'json', 'excel').
+    - file_type (str): File type ('csv', 'json', 'excel', 'parquet').
+    - compression (str): Parquet compression codec.
+    - row_group_size (int): Rows per Parquet row group.
 
     Returns:
     - None
@@ -90,6 +164,8 @@ def save_raw_data(data, file_path, file_type='csv'):
             data.to_excel(file_path, index=False)
         elif file_type == 'json':
             data.to_json(file_path, orient='records', lines=True)
+        elif file_type == 'parquet':
+            write_parquet(data, file_path, compression=compression, row_group_size=row_group_size)
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
     elif isinstance(data, (dict, list)) and file_type == 'json':
@@ -1,6 +1,12 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler, MinMaxScaler
+
+from scripts.categorical_encoder import CategoricalEncoder
+from scripts.date_parsing import parse_datetimes
+from scripts.imputer import Imputer
+from scripts.outliers import compute_outlier_bounds, outlier_mask
+from scripts.parallel_aggregation import parallel_aggregate
 
 def drop_missing_values(data, threshold=0.5):
     """
@@ -16,7 +22,7 @@ def drop_missing_values(data, threshold=0.5):
     missing_fraction = data.isnull().mean()
     return data.loc[:, missing_fraction < threshold]
 
-def fill_missing_values(data, strategy="mean", fill_value=None):
+def fill_missing_values(data, strategy="mean", fill_value=None, imputer=None):
     """
     Fill missing values in the dataset.
 
@@ -24,71 +30,74 @@ def fill_missing_values(data, strategy="mean", fill_value=None):
     - data (pd.DataFrame): The dataset.
     - strategy (str): Filling strategy: "mean", "median", "mode", or "constant".
     - fill_value (any): Value to use if strategy is "constant".
+    - imputer (Imputer): Optional fitted `scripts.imputer.Imputer` to reuse instead of
+      recomputing the statistics from `data`.
 
     Returns:
     - pd.DataFrame: Dataset with missing values filled.
     """
-    for column in data.select_dtypes(include=[np.number]).columns:
-        if strategy == "mean":
-            data[column] = data[column].fillna(data[column].mean())
-        elif strategy == "median":
-            data[column] = data[column].fillna(data[column].median())
-        elif strategy == "mode":
-            data[column] = data[column].fillna(data[column].mode()[0])
-        elif strategy == "constant" and fill_value is not None:
-            data[column] = data[column].fillna(fill_value)
-        else:
+    if imputer is None:
+        if strategy not in ("mean", "median", "mode", "constant") or (strategy == "constant" and fill_value is None):
             raise ValueError(f"Invalid strategy: {strategy}")
-    return data
+        columns = data.select_dtypes(include=[np.number]).columns
+        imputer = Imputer(strategy, columns=columns, fill_value=fill_value).fit(data)
+    return imputer.transform(data, inplace=True)
 
-def normalize_data(data, columns=None):
+def normalize_data(data, columns=None, scaler=None):
     """
     Normalize numerical columns to a range of 0 to 1.
 
     Parameters:
     - data (pd.DataFrame): The dataset.
     - columns (list): List of columns to normalize. Defaults to all numeric columns.
+    - scaler (MinMaxScaler): Optional already-fitted scaler; it is applied without refitting.
 
     Returns:
     - pd.DataFrame: Dataset with normalized columns.
     """
-    scaler = MinMaxScaler()
     columns = columns or data.select_dtypes(include=[np.number]).columns
-    data[columns] = scaler.fit_transform(data[columns])
+    if scaler is None:
+        data[columns] = MinMaxScaler().fit_transform(data[columns])
+    else:
+        data[columns] = scaler.transform(data[columns])
     return data
 
-def standardize_data(data, columns=None):
+def standardize_data(data, columns=None, scaler=None):
     """
     Standardize numerical columns to have zero mean and unit variance.
 
     Parameters:
     - data (pd.DataFrame): The dataset.
     - columns (list): List of columns to standardize. Defaults to all numeric columns.
+    - scaler (StandardScaler): Optional already-fitted scaler; it is applied without refitting.
 
     Returns:
     - pd.DataFrame: Dataset with standardized columns.
     """
-    scaler = StandardScaler()
     columns = columns or data.select_dtypes(include=[np.number]).columns
-    data[columns] = scaler.fit_transform(data[columns])
+    if scaler is None:
+        data[columns] = StandardScaler().fit_transform(data[columns])
+    else:
+        data[columns] = scaler.transform(data[columns])
     return data
 
-def encode_categorical_columns(data, columns=None):
+def encode_categorical_columns(data, columns=None, encoder=None):
     """
     Encode categorical columns using Label Encoding.
 
     Parameters:
     - data (pd.DataFrame): The dataset.
     - columns (list): List of columns to encode. Defaults to all object-type columns.
+    - encoder (CategoricalEncoder): Optional fitted `scripts.categorical_encoder.CategoricalEncoder`;
+      reusing it keeps codes stable across batches. Unseen values encode to -1.
 
     Returns:
     - pd.DataFrame: Dataset with encoded columns.
     """
-    le = LabelEncoder()
-    columns = columns or data.select_dtypes(include=["object"]).columns
-    for column in columns:
-        data[column] = le.fit_transform(data[column])
-    return data
+    if encoder is None:
+        columns = columns or data.select_dtypes(include=["object"]).columns
+        encoder = CategoricalEncoder(columns).fit(data)
+    return encoder.transform(data, inplace=True)
 
 def rename_columns(data, column_mapping):
     """
@@ -103,23 +112,28 @@ def rename_columns(data, column_mapping):
     """
     return data.rename(columns=column_mapping)
 
-def format_dates(data, date_columns, format="%Y-%m-%d"):
+def format_dates(data, date_columns, format="%Y-%m-%d", errors="coerce"):
     """
     Convert date columns to datetime format.
 
+    Each distinct value is parsed once; values not matching `format` fall back to
+    per-value parsing, and numeric columns are read as epoch timestamps.
+
     Parameters:
     - data (pd.DataFrame): The dataset.
     - date_columns (list): List of date columns.
-    - format (str): Desired date format (default is "%Y-%m-%d").
+    - format (str): Expected date format (default is "%Y-%m-%d"). Detected from the data if None.
+    - errors (str): "coerce" sets unparseable values to NaT and logs how many there were;
+      "raise" raises a ValueError instead.
 
     Returns:
     - pd.DataFrame: Dataset with formatted date columns.
     """
     for column in date_columns:
-        data[column] = pd.to_datetime(data[column], format=format)
+        data[column] = parse_datetimes(data[column], format=format, errors=errors)
     return data
 
-def aggregate_data(data, group_by_columns, aggregations):
+def aggregate_data(data, group_by_columns, aggregations, n_jobs=None):
     """
     Aggregate data by grouping and applying specified aggregation functions.
 
@@ -127,10 +141,14 @@ def aggregate_data(data, group_by_columns, aggregations):
     - data (pd.DataFrame): The dataset.
     - group_by_columns (list): Columns to group by.
     - aggregations (dict): Aggregation functions for specific columns.
+    - n_jobs (int): If set, run a partitioned map-reduce over this many processes
+      with `parallel_aggregate` (sum/count/min/max/mean/nunique/median only).
 
     Returns:
     - pd.DataFrame: Aggregated dataset.
     """
+    if n_jobs is not None:
+        return parallel_aggregate(data, group_by_columns, aggregations, n_jobs=n_jobs)
     return data.groupby(group_by_columns).agg(aggregations).reset_index()
 
 def reorder_columns(data, column_order):
@@ -152,21 +170,15 @@ def detect_outliers(data, column, method="iqr"):
 
     Parameters:
     - data (pd.DataFrame): The dataset.
-    - column (str): The column to analyze.
+    - column (str or list): The column to analyze, or a list of columns to analyze in one pass.
     - method (str): Outlier detection method ("iqr" or "zscore").
 
     Returns:
-    - pd.Series: Boolean series indicating outliers.
-    """
-    if method == "iqr":
-        Q1 = data[column].quantile(0.25)
-        Q3 = data[column].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        return (data[column] < lower_bound) | (data[column] > upper_bound)
-    elif method == "zscore":
-        z_scores = (data[column] - data[column].mean()) / data[column].std()
-        return (z_scores.abs() > 3)
-    else:
+    - pd.Series or pd.DataFrame: Boolean series indicating outliers, or one boolean
+      column per analyzed column when a list is given.
+    """
+    if method not in ("iqr", "zscore"):
         raise ValueError(f"Invalid method: {method}")
+    columns = column if isinstance(column, list) else [column]
+    mask = outlier_mask(data, compute_outlier_bounds(data, columns, method=method))
+    return mask if isinstance(column, list) else mask[column]
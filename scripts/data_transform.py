@@ -1,9 +1,19 @@
+import warnings
+
+import joblib
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import PowerTransformer, PolynomialFeatures
-from sklearn.decomposition import PCA
+from scipy import sparse as sp
+from sklearn.preprocessing import MinMaxScaler, PowerTransformer, PolynomialFeatures
+from sklearn.decomposition import PCA, IncrementalPCA
 from sklearn.feature_selection import SelectKBest, chi2, f_classif
 
+# Default size of one block of generated polynomial features, in bytes.
+DEFAULT_MEMORY_BUDGET = 256 * 1024 ** 2
+
+# Statistics supported by the rolling feature functions.
+ROLLING_STATS = ('mean', 'std', 'min', 'max', 'sum')
+
 def apply_log_transformation(data, columns):
     """
     Apply log transformation to specified columns.
@@ -19,7 +29,7 @@ def apply_log_transformation(data, columns):
         data[column] = np.log1p(data[column])  # log(1 + x) to handle zero values
     return data
 
-def apply_power_transformation(data, columns, method='yeo-johnson'):
+def apply_power_transformation(data, columns, method='yeo-johnson', transformer=None):
     """
     Apply power transformation to specified columns.
 
@@ -27,50 +37,203 @@ def apply_power_transformation(data, columns, method='yeo-johnson'):
     - data (pd.DataFrame): The dataset.
     - columns (list): List of columns to transform.
     - method (str): The power transformation method ('yeo-johnson' or 'box-cox').
+    - transformer (PowerTransformer): Optional already-fitted transformer; it is applied without refitting.
 
     Returns:
     - pd.DataFrame: Dataset with transformed columns.
     """
-    pt = PowerTransformer(method=method)
-    data[columns] = pt.fit_transform(data[columns])
+    if transformer is None:
+        data[columns] = PowerTransformer(method=method).fit_transform(data[columns])
+    else:
+        data[columns] = transformer.transform(data[columns])
     return data
 
-def generate_polynomial_features(data, columns, degree=2, interaction_only=False):
+def _polynomial_terms(columns, degree, interaction_only, pairs):
+    """Input columns, feature names and a block function computing the features."""
+    if pairs is not None:
+        pairs = [(a, b) for a, b in pairs]
+        columns = list(dict.fromkeys(col for pair in pairs for col in pair))
+        index = {col: i for i, col in enumerate(columns)}
+        names = [f'{a}^2' if a == b else f'{a} {b}' for a, b in pairs]
+        left = [index[a] for a, _ in pairs]
+        right = [index[b] for _, b in pairs]
+        return columns, names, lambda values: values[:, left] * values[:, right]
+    columns = list(columns)
+    poly = PolynomialFeatures(degree=degree, interaction_only=interaction_only, include_bias=False)
+    poly.fit(np.zeros((1, len(columns))))
+    return columns, list(poly.get_feature_names_out(columns)), poly.transform
+
+def iter_polynomial_blocks(data, columns, degree=2, interaction_only=False, pairs=None, dtype='float64',
+                           memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Generate polynomial features in row blocks that fit a memory budget.
+
+    Parameters:
+    - data (pd.DataFrame): The dataset.
+    - columns (list): List of columns to transform.
+    - degree (int): The degree of the polynomial features.
+    - interaction_only (bool): If True, only interaction terms are included.
+    - pairs (list): Optional allowlist of (column, column) pairs; only their
+      products are generated (a pair of a column with itself gives its square).
+    - dtype (str): Dtype of the generated blocks, e.g. 'float32'.
+    - memory_budget (int): Maximum bytes of one block, including the float64
+      intermediate.
+
+    Yields:
+    - tuple: (feature names, start row, block as a 2D array).
+    """
+    columns, names, compute = _polynomial_terms(columns, degree, interaction_only, pairs)
+    row_bytes = (len(names) + len(columns)) * 8 + len(names) * np.dtype(dtype).itemsize
+    block_rows = max(1, memory_budget // row_bytes)
+    # Positional row + column slicing copies one block, never the whole column subset.
+    positions = [data.columns.get_loc(col) for col in columns]
+    for start in range(0, len(data), block_rows):
+        values = data.iloc[start:start + block_rows, positions].to_numpy(dtype=np.float64)
+        yield names, start, compute(values).astype(dtype, copy=False)
+
+def generate_polynomial_features(data, columns, degree=2, interaction_only=False, pairs=None, dtype=None,
+                                 sparse=False, memory_budget=None):
     """
     Generate polynomial features from specified columns.
 
+    With any of `pairs`, `dtype`, `sparse` or `memory_budget` set, features are
+    generated in row blocks with `iter_polynomial_blocks` and written straight
+    into one output buffer instead of materializing the full float64 expansion.
+    The returned frame wraps that buffer without copying it, and the kept input
+    columns are inserted next to it, so peak memory is about one output.
+
     Parameters:
     - data (pd.DataFrame): The dataset.
     - columns (list): List of columns to transform.
     - degree (int): The degree of the polynomial features.
     - interaction_only (bool): If True, only interaction terms are included.
+    - pairs (list): Optional allowlist of (column, column) pairs. Only their
+      products are added and the original columns are kept.
+    - dtype (str): Dtype of the generated features, e.g. 'float32' to halve their memory.
+    - sparse (bool): Return the generated features as sparse columns (only
+      non-zero values are stored).
+    - memory_budget (int): Maximum bytes per generated block (default 256 MB in blocked mode).
 
     Returns:
     - pd.DataFrame: Dataset with polynomial features added.
     """
-    poly = PolynomialFeatures(degree=degree, interaction_only=interaction_only, include_bias=False)
-    poly_features = poly.fit_transform(data[columns])
-    feature_names = poly.get_feature_names_out(columns)
-    poly_df = pd.DataFrame(poly_features, columns=feature_names, index=data.index)
-    data = pd.concat([data, poly_df], axis=1).drop(columns=columns)
-    return data
+    if pairs is None and dtype is None and not sparse and memory_budget is None:
+        poly = PolynomialFeatures(degree=degree, interaction_only=interaction_only, include_bias=False)
+        poly_features = poly.fit_transform(data[columns])
+        feature_names = poly.get_feature_names_out(columns)
+        poly_df = pd.DataFrame(poly_features, columns=feature_names, index=data.index)
+        data = pd.concat([data, poly_df], axis=1).drop(columns=columns)
+        return data
 
-def reduce_dimensions_with_pca(data, n_components=2):
+    dtype = dtype or 'float64'
+    blocks = iter_polynomial_blocks(data, columns, degree=degree, interaction_only=interaction_only, pairs=pairs,
+                                    dtype=dtype, memory_budget=memory_budget or DEFAULT_MEMORY_BUDGET)
+    feature_names, output = None, []
+    for feature_names, start, block in blocks:
+        if sparse:
+            output.append(sp.csr_matrix(block))
+        else:
+            if not output:
+                output.append(np.empty((len(data), block.shape[1]), dtype=dtype))
+            output[0][start:start + len(block)] = block
+    if feature_names is None:
+        feature_names = _polynomial_terms(columns, degree, interaction_only, pairs)[1]
+        output = [np.empty((0, len(feature_names)), dtype=dtype)]
+
+    kept, first = data, 0
+    if pairs is None:
+        # The degree-1 terms come first and repeat the input columns, which are dropped.
+        kept = data.drop(columns=columns)
+        first = len(set(columns) & set(feature_names))
+    if sparse:
+        poly_df = pd.DataFrame.sparse.from_spmatrix(sp.vstack(output, format='csr')[:, first:], index=data.index,
+                                                    columns=feature_names[first:])
+    else:
+        poly_df = pd.DataFrame(output[0][:, first:], columns=feature_names[first:], index=data.index, copy=False)
+    # pd.concat would consolidate (copy) the buffer, so the kept columns are inserted instead.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+        for position, (name, values) in enumerate(kept.items()):
+            poly_df.insert(position, name, values)
+    return poly_df
+
+def reduce_dimensions_with_pca(data, n_components=2, svd_solver='auto', random_state=None, pca=None):
     """
     Reduce dimensions using Principal Component Analysis (PCA).
 
     Parameters:
     - data (pd.DataFrame): The dataset.
     - n_components (int): Number of principal components to keep.
+    - svd_solver (str): PCA solver; 'randomized' approximates the top components
+      of large frames much faster than the exact 'full' solver.
+    - random_state (int): Seed for the randomized solver.
+    - pca (PCA or IncrementalPCA): Optional already-fitted model, e.g. from
+      `fit_incremental_pca` or `load_pca`; it is applied without refitting.
 
     Returns:
     - pd.DataFrame: Dataset with reduced dimensions.
     """
-    pca = PCA(n_components=n_components)
-    reduced_data = pca.fit_transform(data)
-    columns = [f'PC{i+1}' for i in range(n_components)]
+    if pca is None:
+        pca = PCA(n_components=n_components, svd_solver=svd_solver, random_state=random_state)
+        reduced_data = pca.fit_transform(data)
+    else:
+        reduced_data = pca.transform(data)
+    columns = [f'PC{i+1}' for i in range(reduced_data.shape[1])]
     return pd.DataFrame(reduced_data, columns=columns, index=data.index)
 
+def fit_incremental_pca(chunks, n_components=2, columns=None):
+    """
+    Fit PCA over a stream of chunks without loading the whole dataset.
+
+    Chunks smaller than `n_components` rows are buffered and merged with the next
+    ones, since every partial fit needs at least that many rows. Each batch is
+    fitted once the next one is ready, so a final remainder of fewer rows is
+    merged into the last partial fit instead of being dropped.
+
+    Parameters:
+    - chunks (iterable of pd.DataFrame): Chunks, e.g. from `load_data(..., chunksize=...)`.
+    - n_components (int): Number of principal components to keep.
+    - columns (list): Columns to use. Defaults to all columns of the chunks.
+
+    Returns:
+    - IncrementalPCA: Fitted model, usable with `reduce_dimensions_with_pca(..., pca=...)`.
+    """
+    pca = IncrementalPCA(n_components=n_components)
+    batch, pending = None, []
+    for chunk in chunks:
+        pending.append(chunk[columns] if columns is not None else chunk)
+        if sum(len(part) for part in pending) >= n_components:
+            if batch is not None:
+                pca.partial_fit(batch)
+            batch, pending = pd.concat(pending) if len(pending) > 1 else pending[0], []
+    if batch is not None:
+        pca.partial_fit(pd.concat([batch] + pending) if pending else batch)
+    if not hasattr(pca, 'components_'):
+        raise ValueError(f"At least {n_components} rows are needed to fit {n_components} components")
+    return pca
+
+def save_pca(pca, file_path):
+    """
+    Save a fitted PCA model to disk with joblib.
+
+    Parameters:
+    - pca (PCA or IncrementalPCA): Fitted model.
+    - file_path (str): Destination path.
+    """
+    joblib.dump(pca, file_path)
+
+def load_pca(file_path):
+    """
+    Load a PCA model saved with `save_pca`.
+
+    Parameters:
+    - file_path (str): Path to the saved model.
+
+    Returns:
+    - PCA or IncrementalPCA: Fitted model.
+    """
+    return joblib.load(file_path)
+
 def select_k_best_features(data, target, k=10, score_func=f_classif):
     """
     Select the top K best features based on a scoring function.
@@ -102,7 +265,7 @@ def one_hot_encode(data, columns):
     """
     return pd.get_dummies(data, columns=columns, drop_first=True)
 
-def scale_data_range(data, columns, feature_range=(0, 1)):
+def scale_data_range(data, columns, feature_range=(0, 1), scaler=None):
     """
     Scale data to a specified range.
 
@@ -110,12 +273,15 @@ def scale_data_range(data, columns, feature_range=(0, 1)):
     - data (pd.DataFrame): The dataset.
     - columns (list): List of columns to scale.
     - feature_range (tuple): Desired range of transformed data.
+    - scaler (MinMaxScaler): Optional already-fitted scaler; it is applied without refitting.
 
     Returns:
     - pd.DataFrame: Dataset with scaled columns.
     """
-    scaler = MinMaxScaler(feature_range=feature_range)
-    data[columns] = scaler.fit_transform(data[columns])
+    if scaler is None:
+        data[columns] = MinMaxScaler(feature_range=feature_range).fit_transform(data[columns])
+    else:
+        data[columns] = scaler.transform(data[columns])
     return data
 
 def bin_numerical_column(data, column, bins, labels=None):
@@ -146,9 +312,8 @@ def create_lagged_features(data, column, lags):
     Returns:
     - pd.DataFrame: Dataset with lagged features added.
     """
-    for lag in range(1, lags + 1):
-        data[f'{column}_lag{lag}'] = data[column].shift(lag)
-    return data
+    lagged = {f'{column}_lag{lag}': data[column].shift(lag) for lag in range(1, lags + 1)}
+    return pd.concat([data, pd.DataFrame(lagged, index=data.index)], axis=1)
 
 def calculate_rolling_statistics(data, column, window, stats=['mean', 'std']):
     """
@@ -163,13 +328,53 @@ def calculate_rolling_statistics(data, column, window, stats=['mean', 'std']):
     Returns:
     - pd.DataFrame: Dataset with rolling statistics added.
     """
-    for stat in stats:
-        if stat == 'mean':
-            data[f'{column}_rolling_mean'] = data[column].rolling(window).mean()
-        elif stat == 'std':
-            data[f'{column}_rolling_std'] = data[column].rolling(window).std()
-        elif stat == 'min':
-            data[f'{column}_rolling_min'] = data[column].rolling(window).min()
-        elif stat == 'max':
-            data[f'{column}_rolling_max'] = data[column].rolling(window).max()
-    return data
+    rolling = data[column].rolling(window)
+    rolled = {f'{column}_rolling_{stat}': getattr(rolling, stat)() for stat in stats if stat in ROLLING_STATS}
+    return pd.concat([data, pd.DataFrame(rolled, index=data.index)], axis=1)
+
+def create_session_features(data, columns, lags=(1,), windows=(3,), stats=('mean', 'std'),
+                            group_column='MSISDN/Number', time_column='Start', min_periods=None):
+    """
+    Create lag and rolling features per user, in session start order.
+
+    Rows are ordered by user and start time, every lag and rolling statistic is
+    computed for all columns at once within each user's sessions, and all outputs
+    are joined to the dataset in a single block. The input order is kept.
+
+    Parameters:
+    - data (pd.DataFrame): The dataset.
+    - columns (list): Columns to create features for.
+    - lags (list): Lags, in sessions, named '<column>_lag<lag>'.
+    - windows (list): Rolling windows, either a number of sessions (3) or a time
+      offset such as '1h' or '7D' over `time_column`; named '<column>_rolling<window>_<stat>'.
+    - stats (list): Rolling statistics: 'mean', 'std', 'min', 'max', 'sum'.
+    - group_column (str): User identifier; sessions of different users never mix.
+    - time_column (str): Session start time. Must be non-missing for time-based windows.
+    - min_periods (int): Minimum sessions per window (defaults as in `pd.Series.rolling`).
+
+    Returns:
+    - pd.DataFrame: Dataset with the features added.
+    """
+    unsupported = set(stats) - set(ROLLING_STATS)
+    if unsupported:
+        raise ValueError(f"Unsupported rolling statistics: {sorted(unsupported)}")
+    columns = list(columns)
+
+    # Work on positions so results realign with the input whatever its index.
+    ordered = data[[group_column, time_column] + columns].reset_index(drop=True)
+    ordered = ordered.sort_values([group_column, time_column], kind='mergesort')
+    grouped = ordered.groupby(group_column, sort=False, dropna=False)
+
+    blocks = [grouped[columns].shift(lag).add_suffix(f'_lag{lag}') for lag in lags]
+    for window in windows:
+        if isinstance(window, str):
+            rolling = grouped[columns + [time_column]].rolling(window, on=time_column, min_periods=min_periods)
+        else:
+            rolling = grouped[columns].rolling(window, min_periods=min_periods)
+        for stat in stats:
+            result = getattr(rolling, stat)()[columns].droplevel(0)
+            blocks.append(result.add_suffix(f'_rolling{window}_{stat}'))
+
+    features = pd.concat(blocks, axis=1).sort_index()
+    features.index = data.index
+    return pd.concat([data, features], axis=1)
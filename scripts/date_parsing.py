@@ -0,0 +1,147 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from scripts.constants import DATETIME_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# Formats tried by `detect_format`, in order of preference.
+CANDIDATE_FORMATS = [
+    DATETIME_FORMAT,
+    '%m/%d/%Y %H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%Y-%m-%d',
+]
+
+# Smallest absolute value at which an epoch integer is read with the given unit.
+_EPOCH_UNITS = [(1e17, 'ns'), (1e14, 'us'), (1e11, 'ms'), (0, 's')]
+
+
+def infer_epoch_unit(values):
+    """
+    Guess the unit of epoch timestamps from their magnitude.
+
+    Parameters:
+    - values (array-like): Numeric epoch values.
+
+    Returns:
+    - str: 's', 'ms', 'us' or 'ns'.
+    """
+    largest = np.nanmax(np.abs(np.asarray(values, dtype=np.float64))) if len(values) else 0
+    return next(unit for bound, unit in _EPOCH_UNITS if largest >= bound)
+
+
+def _parse_epoch(values, unit=None):
+    values = pd.to_numeric(pd.Series(values), errors='coerce')
+    return pd.to_datetime(values, unit=unit or infer_epoch_unit(values.dropna()), errors='coerce')
+
+
+def detect_format(values, sample_size=1000, formats=None):
+    """
+    Pick the candidate format that parses the most values of a sample.
+
+    Parameters:
+    - values (array-like): Date strings.
+    - sample_size (int): Number of values tried against each format.
+    - formats (list): Candidate formats. Defaults to `CANDIDATE_FORMATS`.
+
+    Returns:
+    - str or None: Best format, or None if no candidate parses any value.
+    """
+    sample = pd.Series(values).dropna()
+    sample = sample.iloc[:sample_size].astype(str)
+    best, best_count = None, 0
+    for fmt in formats or CANDIDATE_FORMATS:
+        count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if count > best_count:
+            best, best_count = fmt, count
+            if count == len(sample):
+                break
+    return best
+
+
+def _check_coerced(series, parsed, errors):
+    """Raise or log when non-missing values of `series` were parsed to NaT."""
+    coerced = int((parsed.isna() & series.notna()).sum())
+    if not coerced:
+        return
+    if errors == 'raise':
+        raise ValueError(f"{coerced} values of column {series.name!r} could not be parsed as datetimes")
+    logger.warning(f"{coerced} values of column {series.name!r} could not be parsed and were set to NaT")
+
+
+def parse_datetimes(series, format=None, sample_size=1000, epoch_unit=None, errors='coerce'):
+    """
+    Parse a column of timestamps, converting each distinct value only once.
+
+    Distinct values are factorized and parsed with `format` (or the format detected
+    from a sample of them); values that do not match fall back to per-value
+    parsing. Numeric columns are treated as epoch timestamps; strings never are,
+    so compact dates such as '20190404' keep their calendar meaning.
+
+    Parameters:
+    - series (pd.Series): Column of date strings, epoch integers or datetimes.
+    - format (str): Expected format. Detected from the data if None.
+    - sample_size (int): Number of distinct values used for format detection.
+    - epoch_unit (str): Unit of epoch values. Inferred from their magnitude if None.
+    - errors (str): 'coerce' sets unparseable values to NaT and logs how many there
+      were; 'raise' raises a ValueError instead.
+
+    Returns:
+    - pd.Series: datetime64 column with the index of `series`.
+    """
+    if errors not in ('coerce', 'raise'):
+        raise ValueError(f"Invalid errors value: {errors}")
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if pd.api.types.is_numeric_dtype(series):
+        parsed = pd.Series(_parse_epoch(series, epoch_unit).to_numpy(), index=series.index, name=series.name)
+        _check_coerced(series, parsed, errors)
+        return parsed
+
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(np.asarray(uniques, dtype=object)).astype(str).str.strip()
+    fmt = format or detect_format(uniques, sample_size=sample_size)
+    parsed = pd.to_datetime(uniques, format=fmt, errors='coerce') if fmt else pd.Series(pd.NaT, index=uniques.index)
+
+    failed = parsed.isna()
+    if failed.any():
+        parsed[failed] = pd.to_datetime(uniques[failed], format='mixed', errors='coerce').to_numpy()
+
+    # Code -1 (missing) picks the trailing NaT.
+    values = np.append(parsed.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    parsed = pd.Series(values[codes], index=series.index, name=series.name)
+    _check_coerced(series, parsed, errors)
+    return parsed
+
+
+def parse_xdr_timestamps(df, start_column='Start', end_column='End', format=DATETIME_FORMAT):
+    """
+    Parse the xDR session timestamps and derive duration and hour-of-day features.
+
+    Adds 'Session Duration (s)' (End - Start, including the 'Start ms'/'End ms'
+    millisecond parts when present) and 'Start Hour' to the DataFrame.
+
+    Parameters:
+    - df (pd.DataFrame): xDR data with raw or parsed Start/End columns.
+    - start_column (str): Session start column.
+    - end_column (str): Session end column.
+    - format (str): Expected timestamp format; other values fall back per value.
+
+    Returns:
+    - pd.DataFrame: DataFrame with parsed timestamps and derived features (modified in place).
+    """
+    start = df[start_column] = parse_datetimes(df[start_column], format=format)
+    end = df[end_column] = parse_datetimes(df[end_column], format=format)
+
+    duration = (end - start).dt.total_seconds()
+    if 'Start ms' in df.columns and 'End ms' in df.columns:
+        duration = duration + (df['End ms'] - df['Start ms']) / 1000
+    df['Session Duration (s)'] = duration
+    df['Start Hour'] = start.dt.hour.astype('Int8')
+    return df
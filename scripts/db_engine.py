@@ -0,0 +1,114 @@
+# scripts/db_engine.py
+
+import atexit
+import logging
+import threading
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Connection pool settings shared by every engine in the registry.
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 30
+# Recycle connections before server/firewall idle timeouts drop them.
+POOL_RECYCLE = 1800
+
+_engines: Dict[str, Engine] = {}
+_counters: Dict[str, Dict[str, int]] = {}
+_lock = threading.Lock()
+
+
+def _register_pool_events(engine: Engine, counters: Dict[str, int]) -> None:
+    """
+    Attaches listeners that count pool activity for `get_pool_metrics`.
+
+    :param engine: Engine whose pool should be instrumented.
+    :param counters: Mutable dictionary the listeners increment.
+    """
+    def _increment(name):
+        def listener(*args):
+            with _lock:
+                counters[name] += 1
+        return listener
+
+    event.listen(engine, "connect", _increment("connects"))
+    event.listen(engine, "checkout", _increment("checkouts"))
+    event.listen(engine, "checkin", _increment("checkins"))
+    event.listen(engine, "invalidate", _increment("invalidations"))
+
+
+def get_engine(url: str) -> Engine:
+    """
+    Returns the process-wide pooled engine for a database URL, creating it on first use.
+
+    Engines are cached per URL and never disposed between queries, so repeated
+    queries reuse warm connections instead of paying connection setup and
+    authentication every time. Connections are pre-pinged on checkout and
+    recycled periodically.
+
+    :param url: SQLAlchemy database URL.
+    :return: Shared SQLAlchemy engine.
+    """
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(
+                url,
+                pool_size=POOL_SIZE,
+                max_overflow=MAX_OVERFLOW,
+                pool_timeout=POOL_TIMEOUT,
+                pool_recycle=POOL_RECYCLE,
+                pool_pre_ping=True,
+            )
+            counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+            _register_pool_events(engine, counters)
+            _engines[url] = engine
+            _counters[url] = counters
+            logger.info(f"Created pooled engine for {engine.url.render_as_string(hide_password=True)}")
+    return engine
+
+
+def get_pool_metrics(url: str) -> Dict[str, int]:
+    """
+    Reports the pool state and activity counters of a registered engine.
+
+    :param url: SQLAlchemy database URL used with `get_engine`.
+    :return: Dictionary with pool size, checked-in/out and overflow connections,
+             plus cumulative connects, checkouts, checkins and invalidations.
+    """
+    engine = _engines.get(url)
+    if engine is None:
+        raise KeyError("No engine registered for this URL")
+
+    pool = engine.pool
+    metrics = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    with _lock:
+        metrics.update(_counters[url])
+    return metrics
+
+
+def dispose_engines() -> None:
+    """
+    Disposes every registered engine and clears the registry.
+    """
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _counters.clear()
+
+
+atexit.register(dispose_engines)
@@ -0,0 +1,157 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from scripts.constants import DATETIME_FORMAT
+from scripts.date_parsing import parse_datetimes
+from scripts.xdr_schema import BEARER_ID_COLUMN, DATETIME_COLUMNS
+
+# A session is identified by its bearer and its start time (minute + millisecond).
+DEFAULT_KEY_COLUMNS = [BEARER_ID_COLUMN, 'Start', 'Start ms']
+
+# Keys held in memory before they are spilled to the on-disk key store.
+DEFAULT_MAX_MEMORY_KEYS = 5_000_000
+
+
+def _canonical_key(series):
+    """
+    Cast a key column to the dtype every reader agrees on, so equal keys hash equally.
+
+    Integral numbers (integer columns, and float columns whose values are all
+    whole numbers) become 64-bit nullable integers, so 20-digit Bearer Ids keep
+    every digit; other numbers stay float64. Datetimes and the xDR Start/End
+    strings become datetime64[ns], everything else object.
+
+    Parameters:
+    - series (pd.Series): Key column.
+
+    Returns:
+    - pd.Series: Column in its canonical dtype.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype('datetime64[ns]')
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.dropna()
+        if pd.api.types.is_float_dtype(series) and not np.array_equal(values, np.round(values)):
+            return series.astype('float64')
+        if values.empty or values.min() >= 0:
+            return series.astype('UInt64')
+        return series.astype('Int64')
+    if series.name in DATETIME_COLUMNS:
+        return parse_datetimes(series, format=DATETIME_FORMAT).astype('datetime64[ns]')
+    return series.astype(object)
+
+
+class StreamingDeduplicator:
+    """
+    Drop rows whose key was already seen in earlier chunks, files or runs.
+
+    Each row is reduced to a 64-bit hash of its key columns, so memory grows with
+    the number of distinct keys (8 bytes each) rather than with row width. Keys are
+    kept in a sorted in-memory array and spilled to a SQLite key store once more
+    than `max_memory_keys` are held; with `store_path` set, the store persists and
+    later runs keep filtering against it. Key columns are cast to a canonical
+    dtype before hashing, so chunks from `iter_xdr_chunks` and from a plain
+    `pd.read_csv` produce the same keys. Distinct keys collide with probability
+    about n**2 / 2**65.
+
+    Parameters:
+    - key_columns (list): Columns identifying a row. Defaults to Bearer Id + start time.
+    - store_path (str): SQLite file holding spilled keys. A temporary file is used if None.
+    - max_memory_keys (int): Keys kept in memory before spilling.
+    """
+
+    def __init__(self, key_columns=None, store_path=None, max_memory_keys=DEFAULT_MAX_MEMORY_KEYS):
+        self.key_columns = list(key_columns or DEFAULT_KEY_COLUMNS)
+        self.max_memory_keys = max_memory_keys
+        self.rows_seen = 0
+        self.rows_dropped = 0
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._store_path = store_path
+        self._temp_store = store_path is None
+        self._store = None
+        if store_path is not None:
+            self._open_store()
+
+    def _open_store(self):
+        if self._store_path is None:
+            fd, self._store_path = tempfile.mkstemp(suffix='.sqlite')
+            os.close(fd)
+        self._store = sqlite3.connect(self._store_path)
+        self._store.execute("PRAGMA journal_mode=WAL")
+        self._store.execute("CREATE TABLE IF NOT EXISTS seen_keys (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+
+    def _hash(self, chunk):
+        keys = pd.DataFrame({col: _canonical_key(chunk[col]) for col in self.key_columns})
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+
+    def _in_memory(self, hashes):
+        positions = np.searchsorted(self._keys, hashes)
+        positions[positions == len(self._keys)] = 0
+        return (self._keys[positions] == hashes) if len(self._keys) else np.zeros(len(hashes), dtype=bool)
+
+    def _in_store(self, hashes):
+        if self._store is None or not len(hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        signed = hashes.view(np.int64)
+        self._store.execute("CREATE TEMP TABLE IF NOT EXISTS batch_keys (key INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._store.execute("DELETE FROM batch_keys")
+        self._store.executemany("INSERT OR IGNORE INTO batch_keys VALUES (?)", ((int(key),) for key in signed))
+        found = self._store.execute("SELECT key FROM batch_keys JOIN seen_keys USING (key)").fetchall()
+        return np.isin(signed, np.fromiter((key for (key,) in found), dtype=np.int64, count=len(found)))
+
+    def _spill(self):
+        if self._store is None:
+            self._open_store()
+        with self._store:
+            self._store.executemany("INSERT OR IGNORE INTO seen_keys VALUES (?)",
+                                    ((int(key),) for key in self._keys.view(np.int64)))
+        self._keys = np.empty(0, dtype=np.uint64)
+
+    def filter(self, chunk):
+        """
+        Return the rows of a chunk whose key has not been seen before.
+
+        Within the chunk, the first occurrence of a key is kept.
+
+        Parameters:
+        - chunk (pd.DataFrame): Chunk of data containing the key columns.
+
+        Returns:
+        - pd.DataFrame: Chunk without duplicate rows.
+        """
+        hashes = self._hash(chunk)
+        fresh = ~pd.Series(hashes).duplicated().to_numpy()
+        fresh &= ~self._in_memory(hashes)
+        candidates = np.flatnonzero(fresh)
+        fresh[candidates[self._in_store(hashes[candidates])]] = False
+
+        self._keys = np.union1d(self._keys, hashes[fresh])
+        if len(self._keys) > self.max_memory_keys:
+            self._spill()
+
+        self.rows_seen += len(chunk)
+        self.rows_dropped += int(len(chunk) - fresh.sum())
+        return chunk[fresh]
+
+    def close(self):
+        """Flush in-memory keys to a persistent store and release it. Closing twice is a no-op."""
+        if self._store is None:
+            return
+        if self._temp_store:
+            self._store.close()
+            os.remove(self._store_path)
+        else:
+            if len(self._keys):
+                self._spill()
+            self._store.close()
+        self._store = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,54 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from scripts.minibatch_clustering import DEFAULT_SESSIONS_PATH
+
+
+def simulate_sessions(n_sessions=1000, seed=42):
+    """
+    Simulate session data for the dashboard demo.
+
+    Parameters:
+    - n_sessions (int): Number of sessions (one user each).
+    - seed (int): Random seed; the same seed always gives the same frame.
+
+    Returns:
+    - pd.DataFrame: Session data with the engagement and experience metrics.
+    """
+    rng = np.random.RandomState(seed)
+    data = {
+        'MSISDN': range(n_sessions),
+        'Handset Type': rng.choice(['iPhone', 'Samsung', 'Huawei', 'Xiaomi', 'Other'], n_sessions),
+        'Handset Manufacturer': rng.choice(['Apple', 'Samsung', 'Huawei', 'Xiaomi', 'Other'], n_sessions),
+        'Session ID': rng.randint(1, 100, n_sessions),
+        'Duration': rng.randint(1, 120, n_sessions),
+        'Total DL': rng.randint(1, 1000, n_sessions),
+        'Total UL': rng.randint(1, 500, n_sessions),
+        'TCP Retransmission': rng.random_sample(n_sessions),
+        'RTT': rng.randint(10, 200, n_sessions),
+        'Throughput': rng.randint(1, 100, n_sessions),
+    }
+    df = pd.DataFrame(data)
+    df['Total DL + UL'] = df['Total DL'] + df['Total UL']
+    return df
+
+
+def main(argv=None):
+    """Command-line entry point writing the demo sessions for the dashboard and batch jobs."""
+    parser = argparse.ArgumentParser(description="Write simulated session data for the dashboard demo.")
+    parser.add_argument('output', nargs='?', default=DEFAULT_SESSIONS_PATH, help="Parquet file receiving the sessions")
+    parser.add_argument('--sessions', type=int, default=1000, help="Number of sessions")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    args = parser.parse_args(argv)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    sessions = simulate_sessions(args.sessions, seed=args.seed)
+    sessions.to_parquet(args.output, index=False)
+    print(f"Wrote {len(sessions)} sessions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import os
+
+import pandas as pd
+from joblib import Parallel, delayed
+
+from scripts.minibatch_clustering import (DEFAULT_BATCH_SIZE, DEFAULT_SESSIONS_PATH, MiniBatchClusterer, read_sessions,
+                                          read_table, write_table)
+
+# Per-user engagement metrics: session frequency, total duration and total traffic.
+ENGAGEMENT_FEATURES = ['Session ID', 'Duration', 'Total DL + UL']
+
+# Outputs of the batch job, relative to the project root.
+DEFAULT_MODEL_PATH = os.path.join('data', 'cache', 'engagement_model.joblib')
+DEFAULT_CLUSTERS_PATH = os.path.join('data', 'cache', 'engagement_clusters.parquet')
+
+
+class EngagementClusterer(MiniBatchClusterer):
+    """
+    `MiniBatchClusterer` on the per-user engagement metrics.
+
+    Parameters:
+    - n_clusters (int): Number of clusters.
+    - features (list): Engagement columns. Defaults to `ENGAGEMENT_FEATURES`.
+    - batch_size (int): Rows per MiniBatchKMeans update for DataFrame inputs.
+    - random_state (int): Seed for centroid initialization.
+    """
+
+    def __init__(self, n_clusters=3, features=None, batch_size=DEFAULT_BATCH_SIZE, random_state=42):
+        super().__init__(features or ENGAGEMENT_FEATURES, n_clusters=n_clusters, batch_size=batch_size,
+                         random_state=random_state)
+
+
+def _sweep_inertia(data, k, features, batch_size, random_state):
+    return EngagementClusterer(k, features=features, batch_size=batch_size, random_state=random_state).fit(data).inertia_
+
+
+def elbow_sweep(data, k_values=range(1, 11), features=None, n_jobs=-1, batch_size=DEFAULT_BATCH_SIZE,
+                random_state=42):
+    """
+    Fit one model per candidate k in parallel for the elbow method.
+
+    Parameters:
+    - data (pd.DataFrame): Per-user engagement aggregates.
+    - k_values (iterable): Candidate numbers of clusters.
+    - features (list): Engagement columns. Defaults to `ENGAGEMENT_FEATURES`.
+    - n_jobs (int): Parallel jobs (-1 for all cores).
+    - batch_size (int): Rows per MiniBatchKMeans update.
+    - random_state (int): Seed for centroid initialization.
+
+    Returns:
+    - pd.Series: Within-cluster sum of squares (scaled space), indexed by k.
+    """
+    k_values = list(k_values)
+    inertias = Parallel(n_jobs=n_jobs)(
+        delayed(_sweep_inertia)(data, k, features, batch_size, random_state) for k in k_values
+    )
+    return pd.Series(inertias, index=pd.Index(k_values, name='k'), name='inertia')
+
+
+def engagement_aggregates(sessions, user_column='MSISDN'):
+    """
+    Aggregate session data into the per-user engagement metrics.
+
+    Parameters:
+    - sessions (pd.DataFrame): One row per session with the engagement columns.
+    - user_column (str): User identifier column.
+
+    Returns:
+    - pd.DataFrame: One row per user: session count, total duration and total traffic.
+    """
+    return sessions.groupby(user_column).agg({
+        'Session ID': 'count',
+        'Duration': 'sum',
+        'Total DL + UL': 'sum',
+    }).reset_index()
+
+
+def build_engagement_clusters(engagement, model_path, assignments_path, user_column='MSISDN', n_clusters=3):
+    """
+    Batch job: train the engagement model and cache every user's cluster.
+
+    Next to the Parquet file, a JSON file records the model version and the
+    fingerprint of `engagement`, which `load_engagement_clusters` checks.
+
+    Parameters:
+    - engagement (pd.DataFrame): Per-user engagement aggregates.
+    - model_path (str): Where the fitted model is saved.
+    - assignments_path (str): Parquet file receiving the user column, the
+      engagement features and 'Cluster'.
+    - user_column (str): User identifier column.
+    - n_clusters (int): Number of clusters.
+
+    Returns:
+    - pd.DataFrame: The cached assignments.
+    """
+    model = EngagementClusterer(n_clusters=n_clusters).fit(engagement)
+    model.save(model_path)
+    assignments = engagement[[user_column] + model.features].assign(Cluster=model.assign(engagement))
+    assignments = assignments.reset_index(drop=True)
+    write_table(assignments, assignments_path, engagement)
+    return assignments
+
+
+def load_engagement_clusters(assignments_path, engagement=None):
+    """
+    Read the assignments written by `build_engagement_clusters`, refusing stale ones.
+
+    Parameters:
+    - assignments_path (str): Parquet file written by the batch job.
+    - engagement (pd.DataFrame): Optional current per-user aggregates; if given,
+      they must be the data the assignments were built from.
+
+    Returns:
+    - pd.DataFrame: The cached assignments.
+
+    Raises:
+    - FileNotFoundError: If the batch job has not been run.
+    - ValueError: If the assignments come from another model version or other data.
+    """
+    return read_table(assignments_path, engagement)
+
+
+def main(argv=None):
+    """Command-line entry point of the engagement batch job."""
+    parser = argparse.ArgumentParser(description="Train the engagement model and cache every user's cluster.")
+    parser.add_argument('sessions', nargs='?', default=DEFAULT_SESSIONS_PATH,
+                        help="CSV or Parquet file with one row per session")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="Where the fitted model is saved")
+    parser.add_argument('--output', default=DEFAULT_CLUSTERS_PATH, help="Parquet file receiving the clusters")
+    parser.add_argument('--user-column', default='MSISDN', help="User identifier column")
+    parser.add_argument('--clusters', type=int, default=3, help="Number of clusters")
+    args = parser.parse_args(argv)
+
+    engagement = engagement_aggregates(read_sessions(args.sessions), user_column=args.user_column)
+    assignments = build_engagement_clusters(engagement, args.model, args.output, user_column=args.user_column,
+                                            n_clusters=args.clusters)
+    print(f"Wrote {len(assignments)} user clusters to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
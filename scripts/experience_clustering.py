@@ -0,0 +1,141 @@
+import argparse
+import os
+
+import numpy as np
+
+from scripts.minibatch_clustering import (DEFAULT_BATCH_SIZE, DEFAULT_SESSIONS_PATH, MiniBatchClusterer, read_sessions,
+                                          read_table, write_table)
+
+# Per-user network experience metrics.
+EXPERIENCE_FEATURES = ['TCP Retransmission', 'RTT', 'Throughput']
+
+# Direction in which each metric worsens the experience.
+EXPERIENCE_DIRECTIONS = {'TCP Retransmission': 1, 'RTT': 1, 'Throughput': -1}
+
+# Outputs of the batch job, relative to the project root.
+DEFAULT_MODEL_PATH = os.path.join('data', 'cache', 'experience_model.joblib')
+DEFAULT_SCORES_PATH = os.path.join('data', 'cache', 'experience_scores.parquet')
+
+
+class ExperienceClusterer(MiniBatchClusterer):
+    """
+    `MiniBatchClusterer` on the per-user network experience metrics.
+
+    Parameters:
+    - n_clusters (int): Number of clusters.
+    - features (list): Experience columns. Defaults to `EXPERIENCE_FEATURES`.
+    - batch_size (int): Rows per MiniBatchKMeans update for DataFrame inputs.
+    - random_state (int): Seed for centroid initialization.
+    """
+
+    def __init__(self, n_clusters=3, features=None, batch_size=DEFAULT_BATCH_SIZE, random_state=42):
+        super().__init__(features or EXPERIENCE_FEATURES, n_clusters=n_clusters, batch_size=batch_size,
+                         random_state=random_state)
+
+
+def worst_experience_cluster(model):
+    """
+    Index of the centroid with the worst experience.
+
+    Centroids are compared in scaled space on retransmissions + RTT - throughput.
+
+    Parameters:
+    - model (MiniBatchClusterer): Model fitted on `EXPERIENCE_FEATURES`.
+
+    Returns:
+    - int: Cluster index.
+    """
+    directions = np.array([EXPERIENCE_DIRECTIONS[feature] for feature in model.features])
+    return int((model.centroids_ @ directions).argmax())
+
+
+def experience_aggregates(data, user_column='MSISDN'):
+    """
+    Average the experience metrics per user.
+
+    Parameters:
+    - data (pd.DataFrame): Session or user data with the experience metrics.
+    - user_column (str): User identifier column.
+
+    Returns:
+    - pd.DataFrame: Averaged metrics indexed by user.
+    """
+    return data.groupby(user_column)[EXPERIENCE_FEATURES].mean()
+
+
+def build_experience_scores(data, table_path, model_path=None, user_column='MSISDN', n_clusters=3):
+    """
+    Batch job: cluster users on scaled experience metrics and score them.
+
+    Metrics are averaged per user, standardized and clustered; every user gets
+    their cluster and their distance to the worst-experience centroid (larger
+    means a better experience). The table is written to Parquet indexed by user,
+    with the model version and a fingerprint of the averaged metrics next to it.
+
+    Parameters:
+    - data (pd.DataFrame): Session or user data with the experience metrics.
+    - table_path (str): Parquet file receiving the table.
+    - model_path (str): Optional path where the fitted model is saved.
+    - user_column (str): User identifier column.
+    - n_clusters (int): Number of clusters.
+
+    Returns:
+    - pd.DataFrame: Table indexed by user with the averaged metrics,
+      'Experience Cluster' and 'Experience Score'.
+    """
+    experience = experience_aggregates(data, user_column)
+    model = ExperienceClusterer(n_clusters=n_clusters).fit(experience)
+    if model_path is not None:
+        model.save(model_path)
+
+    distances = model.distances(experience)
+    table = experience.assign(**{
+        'Experience Cluster': distances.argmin(axis=1).astype(np.int32),
+        'Experience Score': distances[:, worst_experience_cluster(model)],
+    })
+    write_table(table, table_path, experience, index=True)
+    return table
+
+
+def load_experience_scores(table_path, users=None, data=None, user_column='MSISDN'):
+    """
+    Read the experience table written by `build_experience_scores`, refusing stale ones.
+
+    Parameters:
+    - table_path (str): Path to the Parquet table.
+    - users (list): Optional users to look up; others are not returned.
+    - data (pd.DataFrame): Optional current session or user data; if given, the
+      table must have been built from it.
+    - user_column (str): User identifier column of `data`.
+
+    Returns:
+    - pd.DataFrame: Table indexed by user.
+
+    Raises:
+    - FileNotFoundError: If the batch job has not been run.
+    - ValueError: If the table comes from another model version or other data.
+    """
+    table = read_table(table_path, None if data is None else experience_aggregates(data, user_column))
+    if users is not None:
+        table = table.loc[table.index.intersection(users)]
+    return table
+
+
+def main(argv=None):
+    """Command-line entry point of the experience batch job."""
+    parser = argparse.ArgumentParser(description="Cluster users on experience metrics and cache their scores.")
+    parser.add_argument('sessions', nargs='?', default=DEFAULT_SESSIONS_PATH,
+                        help="CSV or Parquet file with one row per session")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="Where the fitted model is saved")
+    parser.add_argument('--output', default=DEFAULT_SCORES_PATH, help="Parquet file receiving the scores")
+    parser.add_argument('--user-column', default='MSISDN', help="User identifier column")
+    parser.add_argument('--clusters', type=int, default=3, help="Number of clusters")
+    args = parser.parse_args(argv)
+
+    table = build_experience_scores(read_sessions(args.sessions), args.output, model_path=args.model,
+                                    user_column=args.user_column, n_clusters=args.clusters)
+    print(f"Wrote {len(table)} user experience scores to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
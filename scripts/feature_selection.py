@@ -0,0 +1,238 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from scipy import special
+
+DEFAULT_CHUNKSIZE = 500_000
+
+SCORE_FUNCS = ('f_classif', 'chi2')
+
+
+class FeatureStatistics:
+    """
+    Per-class sufficient statistics for `f_classif` and `chi2` feature scoring.
+
+    Both ANOVA F-values and chi-squared statistics only depend on per-class row
+    counts, feature sums and sums of squares. These add up across chunks, so
+    statistics built on separate chunks, files or processes merge into the
+    statistics of the union, and the scores equal sklearn's on the full data
+    (up to floating-point summation order). Per-feature minimums are kept as
+    well, so `chi2` can reject negative values like sklearn does.
+
+    Parameters:
+    - columns (list): Feature columns. Defaults to every column except the target
+      of the first chunk.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else None
+        self.counts_ = None
+        self.sums_ = None
+        self.squares_ = None
+        self.mins_ = None
+
+    def partial_fit(self, X, y):
+        """
+        Accumulate the statistics of one chunk.
+
+        Parameters:
+        - X (pd.DataFrame): Feature values. Missing values are not allowed.
+        - y (pd.Series or array-like): Class labels aligned with `X`.
+
+        Returns:
+        - FeatureStatistics: The updated statistics.
+        """
+        if self.columns is None:
+            self.columns = list(X.columns)
+        X = X[self.columns].astype(np.float64)
+        if X.isnull().to_numpy().any():
+            raise ValueError("Input contains NaN")
+        y = np.asarray(y)
+        grouped = X.groupby(y)
+        stats = FeatureStatistics(self.columns)
+        stats.counts_ = grouped.size()
+        stats.sums_ = grouped.sum()
+        stats.squares_ = (X ** 2).groupby(y).sum()
+        stats.mins_ = X.min()
+        return self.merge(stats)
+
+    def merge(self, other):
+        """
+        Merge statistics built on other data into these.
+
+        Parameters:
+        - other (FeatureStatistics): Statistics over the same columns.
+
+        Returns:
+        - FeatureStatistics: The merged statistics.
+        """
+        if other.counts_ is None:
+            return self
+        if self.counts_ is None:
+            self.columns = other.columns
+            self.counts_, self.sums_, self.squares_ = other.counts_, other.sums_, other.squares_
+            self.mins_ = other.mins_
+            return self
+        self.counts_ = self.counts_.add(other.counts_, fill_value=0)
+        self.sums_ = self.sums_.add(other.sums_, fill_value=0)
+        self.squares_ = self.squares_.add(other.squares_, fill_value=0)
+        self.mins_ = pd.concat([self.mins_, other.mins_], axis=1).min(axis=1)
+        return self
+
+    def _sorted(self):
+        if self.counts_ is None:
+            raise ValueError("FeatureStatistics is not fitted")
+        counts = self.counts_.sort_index()
+        return counts.to_numpy(dtype=np.float64), self.sums_.loc[counts.index].to_numpy(), \
+            self.squares_.loc[counts.index].to_numpy()
+
+    def f_classif(self):
+        """
+        ANOVA F-values, as `sklearn.feature_selection.f_classif`.
+
+        Returns:
+        - tuple: (F-values, p-values) as pd.Series indexed by feature.
+        """
+        counts, sums, squares = self._sorted()
+        n_samples, n_classes = counts.sum(), len(counts)
+        square_of_sums_alldata = sums.sum(axis=0) ** 2
+        sstot = squares.sum(axis=0) - square_of_sums_alldata / n_samples
+        ssbn = (sums ** 2 / counts[:, None]).sum(axis=0) - square_of_sums_alldata / n_samples
+        sswn = sstot - ssbn
+        msb = ssbn / (n_classes - 1)
+        msw = sswn / (n_samples - n_classes)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = msb / msw
+        pvalues = special.fdtrc(n_classes - 1, n_samples - n_classes, f)
+        return pd.Series(f, index=self.columns), pd.Series(pvalues, index=self.columns)
+
+    def chi2(self):
+        """
+        Chi-squared statistics, as `sklearn.feature_selection.chi2`.
+
+        Returns:
+        - tuple: (chi2 statistics, p-values) as pd.Series indexed by feature.
+        """
+        counts, sums, _ = self._sorted()
+        if (self.mins_ < 0).any():
+            raise ValueError("Input X must be non-negative.")
+        if len(counts) == 1:
+            # sklearn binarizes a single class into two columns, one of them empty.
+            counts, sums = np.append(0.0, counts), np.vstack([np.zeros_like(sums), sums])
+        expected = np.outer(counts / counts.sum(), sums.sum(axis=0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            chisq = ((sums - expected) ** 2 / expected).sum(axis=0)
+        pvalues = special.chdtrc(len(counts) - 1, chisq)
+        return pd.Series(chisq, index=self.columns), pd.Series(pvalues, index=self.columns)
+
+    def select_k_best(self, k=10, score_func='f_classif'):
+        """
+        Pick the k best-scoring features, with `SelectKBest`'s tie and NaN handling.
+
+        Parameters:
+        - k (int): Number of features to keep.
+        - score_func (str): 'f_classif' or 'chi2'.
+
+        Returns:
+        - list: Selected feature columns, in their original order.
+        """
+        if score_func not in SCORE_FUNCS:
+            raise ValueError(f"Unsupported score function: {score_func}")
+        scores = getattr(self, score_func)()[0].to_numpy()
+        scores = np.where(np.isnan(scores), np.finfo(scores.dtype).min, scores)
+        mask = np.zeros(len(scores), dtype=bool)
+        mask[np.argsort(scores, kind='mergesort')[-k:]] = True
+        return [col for col, keep in zip(self.columns, mask) if keep]
+
+
+def _chunk_statistics(chunk, target_column, columns):
+    if isinstance(chunk, tuple):
+        import pyarrow.parquet as pq
+        file_path, row_group = chunk
+        chunk = pq.ParquetFile(file_path).read_row_group(row_group, columns=columns + [target_column]).to_pandas()
+    return FeatureStatistics(columns).partial_fit(chunk[columns], chunk[target_column])
+
+
+def _iter_chunks(data, chunksize):
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+    elif isinstance(data, str):
+        import pyarrow.parquet as pq
+        for row_group in range(pq.ParquetFile(data).num_row_groups):
+            yield (data, row_group)
+    else:
+        yield from data
+
+
+def compute_feature_statistics(data, target_column, columns=None, n_jobs=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Accumulate per-class feature statistics over chunks in a process pool.
+
+    Parameters:
+    - data (pd.DataFrame, str or iterable of pd.DataFrame): Data to score. A Parquet
+      path is read one row group per task inside the workers.
+    - target_column (str): Class label column.
+    - columns (list): Feature columns. Defaults to every numeric column except the target.
+    - n_jobs (int): Worker processes. Defaults to the number of CPUs; 1 runs in-process.
+    - chunksize (int): Rows per task for DataFrame inputs.
+
+    Returns:
+    - FeatureStatistics: Merged statistics of all chunks.
+    """
+    if columns is None:
+        if isinstance(data, str):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            columns = [field.name for field in pq.read_schema(data) if field.name != target_column
+                       and (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))]
+        elif isinstance(data, pd.DataFrame):
+            columns = [col for col in data.select_dtypes(include=[np.number]).columns if col != target_column]
+        else:
+            raise ValueError("columns is required for chunk iterators")
+    columns = list(columns)
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    stats = FeatureStatistics(columns)
+    chunks = _iter_chunks(data, chunksize)
+    if n_jobs == 1:
+        for chunk in chunks:
+            stats.merge(_chunk_statistics(chunk, target_column, columns))
+        return stats
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        # Bound the chunks in flight so the driver never buffers the whole input.
+        pending = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * n_jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.merge(future.result())
+            pending.add(pool.submit(_chunk_statistics, chunk, target_column, columns))
+        for future in pending:
+            stats.merge(future.result())
+    return stats
+
+
+def select_k_best_streaming(data, target_column, k=10, score_func='f_classif', columns=None, n_jobs=None,
+                            chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Select the top K features of a dataset too large for memory.
+
+    Scores match `data_transform.select_k_best_features` run on the full data.
+
+    Parameters:
+    - data (pd.DataFrame, str or iterable of pd.DataFrame): Data to score.
+    - target_column (str): Class label column.
+    - k (int): Number of top features to select.
+    - score_func (str): 'f_classif' or 'chi2'.
+    - columns (list): Candidate feature columns.
+    - n_jobs (int): Worker processes.
+    - chunksize (int): Rows per task for DataFrame inputs.
+
+    Returns:
+    - list: Selected feature columns.
+    """
+    stats = compute_feature_statistics(data, target_column, columns=columns, n_jobs=n_jobs, chunksize=chunksize)
+    return stats.select_k_best(k=k, score_func=score_func)
@@ -0,0 +1,185 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from scripts.quantile_sketch import DEFAULT_K, sketch_quantiles, update_sketches
+
+STRATEGIES = ('mean', 'median', 'mode', 'constant')
+
+
+def _to_json_value(value):
+    """Convert numpy scalars to plain Python values for JSON serialization."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+class Imputer:
+    """
+    Missing-value imputer with a fit/transform split.
+
+    `fit` computes the fill value of every column in one vectorized pass;
+    `partial_fit` merges statistics chunk by chunk so a stream gets the same fill
+    values in every batch. `transform` fills all columns with a single `fillna`
+    call. Fitted statistics can be saved to and loaded from JSON.
+
+    Parameters:
+    - strategy (str): 'mean', 'median', 'mode' or 'constant'.
+    - columns (list): Columns to impute. Defaults to numeric columns for
+      'mean'/'median' and to all columns otherwise.
+    - fill_value (any): Value used by the 'constant' strategy.
+    - sketch_k (int): Accuracy of the quantile sketches used by `partial_fit` for medians.
+    """
+
+    def __init__(self, strategy='mean', columns=None, fill_value=None, sketch_k=DEFAULT_K):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported strategy: {strategy}")
+        if strategy == 'constant' and fill_value is None:
+            raise ValueError("fill_value is required for the 'constant' strategy")
+        self.strategy = strategy
+        self.columns = list(columns) if columns is not None else None
+        self.fill_value = fill_value
+        self.sketch_k = sketch_k
+        self.statistics_ = None
+        self._sums = None
+        self._counts = None
+        self._value_counts = None
+        self._sketches = None
+
+    def _resolve_columns(self, df):
+        if self.columns is not None:
+            return self.columns
+        if self.strategy in ('mean', 'median'):
+            return list(df.select_dtypes(include=[np.number]).columns)
+        return list(df.columns)
+
+    def fit(self, df):
+        """
+        Compute the fill value of every column from a full DataFrame.
+
+        Parameters:
+        - df (pd.DataFrame): Data to fit on.
+
+        Returns:
+        - Imputer: The fitted imputer.
+        """
+        self.columns = self._resolve_columns(df)
+        data = df[self.columns]
+        if self.strategy == 'mean':
+            self.statistics_ = data.mean()
+        elif self.strategy == 'median':
+            self.statistics_ = data.median()
+        elif self.strategy == 'mode':
+            modes = data.mode(dropna=True)
+            self.statistics_ = modes.iloc[0] if len(modes) else pd.Series(np.nan, index=self.columns)
+        else:
+            self.statistics_ = pd.Series(self.fill_value, index=self.columns, dtype=object)
+        return self
+
+    def partial_fit(self, df):
+        """
+        Merge the statistics of one chunk into the running fit.
+
+        Means are merged exactly through running sums and counts, modes through
+        running value counts and medians through mergeable quantile sketches
+        (exact for small data, within the sketch's rank error otherwise).
+
+        Parameters:
+        - df (pd.DataFrame): Chunk to accumulate.
+
+        Returns:
+        - Imputer: The updated imputer.
+        """
+        if self.columns is None:
+            self.columns = self._resolve_columns(df)
+        data = df[self.columns]
+
+        if self.strategy == 'mean':
+            sums, counts = data.sum(), data.count()
+            self._sums = sums if self._sums is None else self._sums.add(sums, fill_value=0)
+            self._counts = counts if self._counts is None else self._counts.add(counts, fill_value=0)
+            self.statistics_ = self._sums / self._counts.replace(0, np.nan)
+        elif self.strategy == 'mode':
+            if self._value_counts is None:
+                self._value_counts = {col: pd.Series(dtype='int64') for col in self.columns}
+            for col in self.columns:
+                self._value_counts[col] = self._value_counts[col].add(data[col].value_counts(), fill_value=0)
+            self.statistics_ = pd.Series({
+                col: counts.idxmax() if len(counts) else np.nan
+                for col, counts in self._value_counts.items()
+            })
+        elif self.strategy == 'median':
+            self._sketches = update_sketches(self._sketches or {}, data, self.columns, k=self.sketch_k)
+            self.statistics_ = sketch_quantiles(self._sketches, 0.5)
+        else:
+            self.fit(df)
+        return self
+
+    def transform(self, df, inplace=False):
+        """
+        Fill missing values of every fitted column in one call.
+
+        Parameters:
+        - df (pd.DataFrame): Data to fill.
+        - inplace (bool): Modify `df` instead of returning a filled copy.
+
+        Returns:
+        - pd.DataFrame: DataFrame with missing values filled.
+        """
+        if self.statistics_ is None:
+            raise ValueError("Imputer is not fitted")
+        values = {col: value for col, value in self.statistics_.items() if col in df.columns and pd.notna(value)}
+        if inplace:
+            df.fillna(values, inplace=True)
+            return df
+        return df.fillna(values)
+
+    def fit_transform(self, df, inplace=False):
+        """
+        Fit on a DataFrame and fill it.
+
+        Parameters:
+        - df (pd.DataFrame): Data to fit on and fill.
+        - inplace (bool): Modify `df` in place.
+
+        Returns:
+        - pd.DataFrame: DataFrame with missing values filled.
+        """
+        return self.fit(df).transform(df, inplace=inplace)
+
+    def save(self, file_path):
+        """
+        Save the fitted statistics to a JSON file.
+
+        Parameters:
+        - file_path (str): Destination path.
+        """
+        if self.statistics_ is None:
+            raise ValueError("Imputer is not fitted")
+        state = {
+            'strategy': self.strategy,
+            'fill_value': _to_json_value(self.fill_value),
+            'statistics': {col: _to_json_value(value) for col, value in self.statistics_.items()},
+        }
+        with open(file_path, 'w') as f:
+            json.dump(state, f, indent=4)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load an imputer saved with `save`.
+
+        Parameters:
+        - file_path (str): Path to the JSON file.
+
+        Returns:
+        - Imputer: Fitted imputer.
+        """
+        with open(file_path) as f:
+            state = json.load(f)
+        imputer = cls(state['strategy'], columns=list(state['statistics']), fill_value=state['fill_value'])
+        imputer.statistics_ = pd.Series(state['statistics'], dtype=object)
+        return imputer
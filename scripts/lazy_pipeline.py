@@ -0,0 +1,271 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from scripts.imputer import Imputer
+from scripts.outliers import compute_outlier_bounds, filter_outliers, inlier_mask
+
+# Operations that only change column values (never the set of rows).
+_COLUMN_OPS = ('impute', 'scale')
+
+
+def _standard_name(col):
+    """Column name produced by `data_cleaning.standardize_columns`."""
+    return col.strip().lower().replace(' ', '_')
+
+
+def _source_columns(source, file_type):
+    """Read the column names of a source without loading its rows."""
+    if isinstance(source, pd.DataFrame):
+        return list(source.columns)
+    if file_type == 'parquet':
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(source).names)
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+class LazyPipeline:
+    """
+    Lazy builder for cleaning and formatting chains over the `scripts/` functions.
+
+    Calls such as `.standardize_columns().drop_duplicates().handle_missing_values()`
+    only record steps. `collect()` optimizes the recorded plan and runs it:
+
+    - projection pushdown: when the chain ends in `select`, only the selected
+      columns plus those needed by row filters are loaded (and for Parquet/CSV
+      sources, only those columns are read from disk);
+    - consecutive missing-value steps are merged into one `fillna`, and
+      consecutive scaling steps into one column assignment;
+    - an outlier filter directly followed by a full-row `drop_duplicates` is fused
+      into one combined mask and a single row filter;
+    - the input is copied once (the projection doubles as that copy) and every
+      later step works in place.
+
+    `explain()` shows the optimized plan.
+
+    Parameters:
+    - source (pd.DataFrame or str): DataFrame or path to a CSV/Parquet file.
+    - file_type (str): 'csv' or 'parquet' for path sources. Inferred from the extension if None.
+    """
+
+    def __init__(self, source, file_type=None):
+        if file_type is None and not isinstance(source, pd.DataFrame):
+            file_type = 'parquet' if str(source).endswith('.parquet') else 'csv'
+        self.source = source
+        self.file_type = file_type
+        self.steps = []
+
+    def _add(self, op, **params):
+        self.steps.append({'op': op, **params})
+        return self
+
+    def standardize_columns(self):
+        """Record `data_cleaning.standardize_columns`."""
+        return self._add('rename')
+
+    def drop_duplicates(self, subset=None):
+        """Record `data_cleaning.drop_duplicates`, optionally on a subset of columns."""
+        return self._add('dedup', subset=list(subset) if subset is not None else None)
+
+    def handle_missing_values(self, strategy='mean', columns=None):
+        """Record `data_cleaning.handle_missing_values`."""
+        if strategy not in ('mean', 'median', 'mode', 'drop'):
+            raise ValueError(f"Unsupported strategy: {strategy}")
+        columns = list(columns) if columns is not None else None
+        if strategy == 'drop':
+            return self._add('dropna', columns=columns)
+        return self._add('impute', groups=[(strategy, columns)], merged=1)
+
+    def remove_outliers(self, columns, method='zscore', threshold=None, action='drop'):
+        """Record `data_cleaning.remove_outliers`."""
+        return self._add('outliers', columns=list(columns), method=method, threshold=threshold, action=action)
+
+    def normalize(self, columns=None):
+        """Record `data_formmating.normalize_data`."""
+        return self._add('scale', groups=[('normalize', list(columns) if columns else None)], merged=1)
+
+    def standardize(self, columns=None):
+        """Record `data_formmating.standardize_data`."""
+        return self._add('scale', groups=[('standardize', list(columns) if columns else None)], merged=1)
+
+    def select(self, columns):
+        """Record a final column selection; enables projection pushdown."""
+        return self._add('select', columns=list(columns))
+
+    # Optimization
+
+    def _required_columns(self, source_columns):
+        """
+        Raw source columns needed by the plan, or None if every column is needed.
+        """
+        selects = [i for i, step in enumerate(self.steps) if step['op'] == 'select']
+        if not selects:
+            return None
+        last_select = selects[-1]
+
+        renamed = False
+        needed = set()
+        for step in self.steps[:last_select + 1]:
+            op = step['op']
+            if op == 'rename':
+                renamed = True
+                continue
+            if op == 'dedup':
+                columns = step['subset']
+            elif op in ('dropna', 'outliers'):
+                columns = step['columns']
+            elif op == 'select' and step is self.steps[last_select]:
+                columns = step['columns']
+            else:
+                continue
+            if columns is None:
+                return None
+            needed.update((col, renamed) for col in columns)
+
+        raw_by_standard = {_standard_name(col): col for col in source_columns}
+        required = {raw_by_standard.get(col, col) if was_renamed else col for col, was_renamed in needed}
+        return [col for col in source_columns if col in required]
+
+    def _optimized_steps(self):
+        steps = []
+        for step in self.steps:
+            previous = steps[-1] if steps else None
+            if previous is not None and step['op'] in _COLUMN_OPS and previous['op'] == step['op']:
+                steps[-1] = {**previous, 'groups': previous['groups'] + step['groups'],
+                             'merged': previous['merged'] + step['merged']}
+            elif (previous is not None and step['op'] == 'dedup' and step['subset'] is None
+                  and previous['op'] == 'outliers' and previous['action'] == 'drop'):
+                # Identical rows share their outlier status, so the duplicate mask can
+                # be computed on the unfiltered frame and combined with the outlier mask.
+                steps[-1] = {'op': 'filter', 'outliers': previous, 'dedup': True}
+            else:
+                steps.append(dict(step))
+        return steps
+
+    def explain(self):
+        """
+        Describe the optimized execution plan.
+
+        Returns:
+        - str: One line per physical step.
+        """
+        source_columns = _source_columns(self.source, self.file_type)
+        required = self._required_columns(source_columns)
+        steps = self._optimized_steps()
+
+        source = 'DataFrame' if isinstance(self.source, pd.DataFrame) else f"{self.file_type} file {self.source}"
+        if required is None:
+            load = f"load {source}: all {len(source_columns)} columns"
+        else:
+            load = f"load {source}: {len(required)} of {len(source_columns)} columns (projection pushdown) {required}"
+        lines = [load]
+        for step in steps:
+            op = step['op']
+            if op == 'rename':
+                lines.append("rename columns (standardize_columns, metadata only)")
+            elif op == 'dedup':
+                lines.append(f"drop_duplicates subset={step['subset']}")
+            elif op == 'dropna':
+                lines.append(f"dropna columns={step['columns']}")
+            elif op == 'outliers':
+                lines.append(f"remove_outliers {step['method']} action={step['action']} columns={step['columns']}")
+            elif op == 'filter':
+                outliers = step['outliers']
+                lines.append(f"fused filter: remove_outliers {outliers['method']} columns={outliers['columns']}"
+                             " + drop_duplicates, one mask")
+            elif op in _COLUMN_OPS:
+                groups = ', '.join(f"{kind} {columns or 'numeric'}" for kind, columns in step['groups'])
+                name = 'fillna' if op == 'impute' else 'scale'
+                lines.append(f"{name} [{groups}] ({step['merged']} step(s) merged, one assignment)")
+            elif op == 'select':
+                lines.append(f"select {step['columns']}")
+
+        passes = 1 + sum(step['op'] not in ('rename', 'select') for step in steps)
+        header = f"== Optimized plan: {len(self.steps)} recorded steps, {passes} passes over the data =="
+        return '\n'.join([header] + [f"{i + 1}. {line}" for i, line in enumerate(lines)])
+
+    # Execution
+
+    def _load(self, required):
+        if isinstance(self.source, pd.DataFrame):
+            return self.source[required].copy() if required is not None else self.source.copy()
+        if self.file_type == 'parquet':
+            return pd.read_parquet(self.source, columns=required)
+        return pd.read_csv(self.source, usecols=required)
+
+    @staticmethod
+    def _prune(groups, df, pruned):
+        """Drop columns removed by projection pushdown from column-wise step groups."""
+        if not pruned:
+            return groups
+        return [(kind, [col for col in columns if col in df.columns] if columns else columns)
+                for kind, columns in groups]
+
+    @staticmethod
+    def _impute(df, groups):
+        values = {}
+        for strategy, columns in groups:
+            if columns is not None:
+                columns = [col for col in columns if df[col].isnull().any()]
+            imputer = Imputer(strategy, columns=columns).fit(df)
+            for col, value in imputer.statistics_.items():
+                if col not in values and pd.notna(value):
+                    values[col] = value
+        df.fillna(values, inplace=True)
+        return df
+
+    @staticmethod
+    def _scale(df, groups):
+        blocks = {}
+        for kind, columns in groups:
+            columns = list(df.select_dtypes(include=[np.number]).columns) if columns is None else columns
+            if not columns:
+                continue
+            scaler = MinMaxScaler() if kind == 'normalize' else StandardScaler()
+            current = pd.DataFrame({col: blocks[col] if col in blocks else df[col] for col in columns})
+            scaled = scaler.fit_transform(current)
+            for i, col in enumerate(columns):
+                blocks[col] = scaled[:, i]
+        if blocks:
+            df[list(blocks)] = np.column_stack(list(blocks.values()))
+        return df
+
+    def collect(self):
+        """
+        Optimize and run the recorded chain.
+
+        Returns:
+        - pd.DataFrame: Result of the chain.
+        """
+        required = self._required_columns(_source_columns(self.source, self.file_type))
+        df = self._load(required)
+
+        for step in self._optimized_steps():
+            op = step['op']
+            if op == 'rename':
+                df.columns = [_standard_name(col) for col in df.columns]
+            elif op == 'dedup':
+                df = df[~df.duplicated(subset=step['subset'])]
+            elif op == 'dropna':
+                df = df.dropna(subset=step['columns'])
+            elif op == 'outliers':
+                df = self._filter(df, step, dedup=False)
+            elif op == 'filter':
+                df = self._filter(df, step['outliers'], dedup=True)
+            elif op == 'impute':
+                df = self._impute(df, self._prune(step['groups'], df, required is not None))
+            elif op == 'scale':
+                df = self._scale(df, self._prune(step['groups'], df, required is not None))
+            elif op == 'select':
+                df = df[step['columns']]
+        return df
+
+    @staticmethod
+    def _filter(df, step, dedup):
+        if not dedup:
+            return filter_outliers(df, step['columns'], method=step['method'], threshold=step['threshold'],
+                                   action=step['action'], ddof=0)
+        bounds = compute_outlier_bounds(df, step['columns'], method=step['method'],
+                                        threshold=step['threshold'], ddof=0)
+        keep = inlier_mask(df, bounds) & ~df.duplicated()
+        return df[keep]
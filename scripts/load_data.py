@@ -1,17 +1,19 @@
 # scripts/load_data.py
 
 import os
+import uuid
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 
 import psycopg2
 import pandas as pd
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from contextlib import contextmanager
 from urllib.parse import quote_plus
 
+from scripts.db_engine import get_engine
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +28,23 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+# Rows transferred per network round trip by server-side cursors.
+DEFAULT_FETCH_SIZE = 10_000
+
+def _connect_psycopg2():
+    """
+    Opens a psycopg2 connection using the environment configuration.
+
+    :return: An open psycopg2 connection.
+    """
+    return psycopg2.connect(
+        host=DB_HOST,
+        port=DB_PORT,
+        database=DB_NAME,
+        user=DB_USER,
+        password=DB_PASSWORD
+    )
+
 def load_data_from_postgres(query: str) -> Optional[pd.DataFrame]:
     """
     Connects to the PostgreSQL database and loads data based on the provided SQL query.
@@ -35,13 +54,7 @@ def load_data_from_postgres(query: str) -> Optional[pd.DataFrame]:
     """
     try:
         # Establish a connection to the database
-        with psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASSWORD
-        ) as connection:
+        with _connect_psycopg2() as connection:
             # Load data using pandas
             df = pd.read_sql_query(query, connection)
 
@@ -51,32 +64,104 @@ def load_data_from_postgres(query: str) -> Optional[pd.DataFrame]:
         logger.error(f"An error occurred: {e}")
         return None
 
+def stream_data_from_postgres(query: str, fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Streams the results of a query as DataFrame batches using a named server-side cursor.
+
+    Rows stay on the server until they are fetched, so at most `fetch_size` rows are
+    buffered client-side at any time instead of the full result set.
+
+    :param query: SQL query to execute.
+    :param fetch_size: Number of rows fetched per round trip and per yielded batch.
+    :return: Iterator of DataFrames with at most `fetch_size` rows each. An empty result
+        set yields a single empty DataFrame that still carries the column names.
+    """
+    connection = _connect_psycopg2()
+    try:
+        # Named cursors only live inside a transaction, so autocommit stays off.
+        with connection.cursor(name=f"xdr_stream_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = fetch_size
+            cursor.execute(query)
+            columns = None
+            yielded = False
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if columns is None:
+                    columns = [desc[0] for desc in cursor.description]
+                if not rows:
+                    break
+                yielded = True
+                yield pd.DataFrame.from_records(rows, columns=columns)
+            if not yielded:
+                yield pd.DataFrame(columns=columns)
+        connection.rollback()
+    finally:
+        connection.close()
+
+def stream_query_to_file(query: str, file_path: str, file_type: str = "parquet",
+                         fetch_size: int = DEFAULT_FETCH_SIZE) -> int:
+    """
+    Streams the results of a query to disk batch by batch.
+
+    :param query: SQL query to execute.
+    :param file_path: Destination file.
+    :param file_type: Output format, either 'parquet' or 'csv'.
+    :param fetch_size: Number of rows fetched per round trip.
+    :return: Number of rows written.
+    """
+    batches = stream_data_from_postgres(query, fetch_size=fetch_size)
+    if file_type == "parquet":
+        from scripts.columnar_storage import write_parquet_batches
+        rows = write_parquet_batches(batches, file_path)
+    elif file_type == "csv":
+        rows = 0
+        header = True
+        for batch in batches:
+            # The first batch (possibly empty) creates the file with its header.
+            batch.to_csv(file_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            rows += len(batch)
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+    logger.info(f"Wrote {rows} rows to {file_path}")
+    return rows
+
+def get_connection_string() -> str:
+    """
+    Builds the SQLAlchemy connection string from the environment configuration.
+
+    :return: PostgreSQL connection URL with the password URL-encoded.
+    """
+    password = quote_plus(DB_PASSWORD)
+    return f"postgresql+psycopg2://{DB_USER}:{password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
 @contextmanager
 def get_sqlalchemy_engine() -> Engine:
     """
-    Creates and yields an SQLAlchemy engine, ensuring proper cleanup.
+    Yields the shared, pooled SQLAlchemy engine for the configured database.
+
+    The engine is created once per process and kept alive across calls so that
+    repeated queries reuse pooled connections; see `scripts.db_engine`.
     """
     print(f"Connecting to: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
-    password = quote_plus(DB_PASSWORD)
-    connection_string = f"postgresql+psycopg2://{DB_USER}:{password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-   
-    engine = create_engine(connection_string)
-    try:
-        yield engine
-    finally:
-        engine.dispose()
+    yield get_engine(get_connection_string())
 
-def load_data_using_sqlalchemy(query: str) -> Optional[pd.DataFrame]:
+def load_data_using_sqlalchemy(query: str, cache=None) -> Optional[pd.DataFrame]:
     """
     Connects to the PostgreSQL database and loads data based on the provided SQL query using SQLAlchemy.
 
     :param query: SQL query to execute.
+    :param cache: Optional `scripts.query_cache.QueryCache`; results are served from it when fresh.
     :return: DataFrame containing the results of the query, or None if an error occurs.
     """
     try:
         with get_sqlalchemy_engine() as engine:
             # Load data into a pandas DataFrame
-            df = pd.read_sql_query(query, engine)
+            if cache is not None:
+                df = cache.get_or_load(query, lambda: pd.read_sql_query(query, engine), engine=engine)
+            else:
+                df = pd.read_sql_query(query, engine)
         return df
 
     except Exception as e:
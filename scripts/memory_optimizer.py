@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from scripts.xdr_schema import BEARER_ID_COLUMN, ID_COLUMNS, XDR_DTYPES, to_nullable_int
+
+# Smallest-first candidates for integral columns that contain missing values.
+_NULLABLE_INT_DTYPES = ['UInt8', 'Int8', 'UInt16', 'Int16', 'UInt32', 'Int32', 'UInt64', 'Int64']
+
+
+def _smallest_nullable_int(values, candidates=_NULLABLE_INT_DTYPES):
+    """
+    Pick the smallest nullable integer dtype that holds every value of a column.
+
+    Parameters:
+    - values (pd.Series): Integral numeric column (NaN allowed).
+    - candidates (list): Dtype names to try, smallest first.
+
+    Returns:
+    - str: Integer dtype name, or 'Float64' if none fits.
+    """
+    low, high = values.min(), values.max()
+    for dtype in candidates:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return dtype
+    return 'Float64'
+
+
+def _float_dtype(series, float_dtype):
+    """
+    Pick a narrower dtype for a float column: integers for integral values, optionally float32 otherwise.
+
+    Parameters:
+    - series (pd.Series): Float column.
+    - float_dtype (str): Dtype for non-integral floats ('float32'), or None to keep float64.
+
+    Returns:
+    - dtype: Planned dtype of the column.
+    """
+    values = series.dropna()
+    if values.empty:
+        return series.dtype
+    if np.array_equal(values, np.round(values)):
+        candidates = _NULLABLE_INT_DTYPES
+        if len(values) == len(series):
+            candidates = [dtype.lower() for dtype in _NULLABLE_INT_DTYPES]
+        dtype = _smallest_nullable_int(values, candidates)
+        return series.dtype if dtype == 'Float64' else dtype
+    if float_dtype is not None:
+        return np.dtype(float_dtype)
+    return series.dtype
+
+
+def fit_dtype_plan(sample, categorical_threshold=0.5, float_dtype=None, id_columns=None, dtypes=None):
+    """
+    Choose one compact dtype per column from a sample of the data.
+
+    - Identifier columns (Bearer Id, IMSI, MSISDN, IMEI) become nullable integers.
+    - Integer columns and integral floats (byte counters, durations) get the
+      smallest integer dtype holding the sample's range, nullable when the sample
+      has missing values.
+    - String columns whose share of distinct values is below
+      `categorical_threshold` become categoricals.
+
+    The plan is applied with `apply_dtype_plan`, so every chunk of a stream gets
+    the same dtypes. Integer widths only cover the sample's range: fit on a
+    sample that spans the data (e.g. rows from several chunks), or fix the
+    dtypes of the columns that matter with `dtypes`.
+
+    Parameters:
+    - sample (pd.DataFrame): Sample of the data, or the whole frame.
+    - categorical_threshold (float): Maximum distinct/total ratio for categorical conversion.
+    - float_dtype (str): Dtype for non-integral floats, e.g. 'float32'. Defaults to keeping float64.
+    - id_columns (list): Identifier columns. Defaults to the xDR identifiers.
+    - dtypes (dict): Dtypes chosen by the caller, e.g. `XDR_DTYPES`; they take
+      precedence over the inferred ones.
+
+    Returns:
+    - dict: Planned dtype per column.
+    """
+    if id_columns is None:
+        id_columns = [BEARER_ID_COLUMN, *ID_COLUMNS]
+    dtypes = dtypes or {}
+
+    plan = {}
+    for col in sample.columns:
+        series = sample[col]
+        if col in dtypes:
+            plan[col] = dtypes[col]
+        elif col in id_columns and pd.api.types.is_numeric_dtype(series):
+            plan[col] = XDR_DTYPES.get(col, 'Int64')
+        elif pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            plan[col] = series.dtype
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+            plan[col] = pd.to_numeric(series, downcast='unsigned' if series.min() >= 0 else 'integer').dtype
+        elif pd.api.types.is_float_dtype(series) and not pd.api.types.is_extension_array_dtype(series):
+            plan[col] = _float_dtype(series, float_dtype)
+        elif series.dtype == object and len(series) and series.nunique() / len(series) < categorical_threshold:
+            plan[col] = 'category'
+        else:
+            plan[col] = series.dtype
+    return plan
+
+
+def _cast(series, dtype):
+    """
+    Cast a column to its planned dtype, refusing integer casts that would lose values.
+
+    Parameters:
+    - series (pd.Series): Column to cast.
+    - dtype: Planned dtype.
+
+    Returns:
+    - pd.Series: Cast column.
+    """
+    if not pd.api.types.is_integer_dtype(dtype) or not pd.api.types.is_numeric_dtype(series):
+        return series.astype(dtype)
+    values = series.dropna()
+    nullable = pd.api.types.is_extension_array_dtype(dtype)
+    info = np.iinfo(str(dtype).lower())
+    if (not nullable and len(values) < len(series)) or (len(values) and (
+            not np.array_equal(values, np.round(values)) or values.min() < info.min or values.max() > info.max)):
+        raise ValueError(f"Column {series.name!r} does not fit the planned dtype {dtype}; "
+                         f"fit the plan on a wider sample or set its dtype explicitly")
+    return series.round().astype(dtype) if pd.api.types.is_float_dtype(series) else series.astype(dtype)
+
+
+def apply_dtype_plan(df, plan):
+    """
+    Cast a frame or a chunk to a dtype plan from `fit_dtype_plan`.
+
+    Columns missing from the plan are left untouched. Categoricals planned as
+    'category' get the categories of each chunk; plan a `pd.CategoricalDtype`
+    to share them across chunks.
+
+    Parameters:
+    - df (pd.DataFrame): Frame or chunk to cast.
+    - plan (dict): Planned dtype per column.
+
+    Returns:
+    - pd.DataFrame: Cast frame.
+
+    Raises:
+    - ValueError: If an integer column holds missing, fractional or out-of-range
+      values for its planned dtype.
+    """
+    return pd.DataFrame({
+        col: df[col] if col not in plan or df[col].dtype == plan[col] else _cast(df[col], plan[col])
+        for col in df.columns
+    }, index=df.index)
+
+
+def memory_optimize(df, categorical_threshold=0.5, float_dtype=None, id_columns=None, return_report=False,
+                    plan=None):
+    """
+    Shrink the memory footprint of a DataFrame by choosing compact dtypes per column.
+
+    Without a plan, dtypes are fitted on `df` itself with `fit_dtype_plan`, so
+    separately optimized chunks can end up with different integer widths and
+    categories, and a Parquet writer or `pd.concat` will not accept them as one
+    schema. For chunked data, fit a plan once on a sample (or pass a fixed map
+    such as `XDR_DTYPES` as `dtypes` to `fit_dtype_plan`) and pass it as `plan`
+    for every chunk.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame to optimize.
+    - categorical_threshold (float): Maximum distinct/total ratio for categorical conversion.
+    - float_dtype (str): Dtype for non-integral floats, e.g. 'float32'. Defaults to keeping float64.
+    - id_columns (list): Identifier columns. Defaults to the xDR identifiers.
+    - return_report (bool): Also return a before/after memory report.
+    - plan (dict): Dtype plan from `fit_dtype_plan`. The other dtype options are
+      ignored when it is given.
+
+    Returns:
+    - pd.DataFrame: Optimized DataFrame, or (DataFrame, dict) when `return_report` is True.
+      The report holds 'before_bytes', 'after_bytes', 'reduction' and per-column
+      'dtypes' changes.
+    """
+    before_bytes = int(df.memory_usage(deep=True).sum()) if return_report else 0
+    before_dtypes = df.dtypes.astype(str).to_dict()
+
+    if plan is None:
+        plan = fit_dtype_plan(df, categorical_threshold=categorical_threshold, float_dtype=float_dtype,
+                              id_columns=id_columns)
+    result = apply_dtype_plan(df, plan)
+
+    if not return_report:
+        return result
+
+    after_bytes = int(result.memory_usage(deep=True).sum())
+    report = {
+        'before_bytes': before_bytes,
+        'after_bytes': after_bytes,
+        'reduction': before_bytes / after_bytes if after_bytes else float('inf'),
+        'dtypes': {
+            col: (before_dtypes[col], str(result[col].dtype))
+            for col in result.columns if before_dtypes[col] != str(result[col].dtype)
+        },
+    }
+    return result, report
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import StandardScaler
+
+MODEL_VERSION = 1
+
+DEFAULT_BATCH_SIZE = 4096
+
+# Session input shared by the batch jobs and the dashboard, relative to the project root.
+DEFAULT_SESSIONS_PATH = os.path.join('data', 'sessions.parquet')
+
+
+def _iter_batches(data, batch_size):
+    """Yield DataFrame batches from a DataFrame or a function returning an iterable of DataFrames."""
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), batch_size):
+            yield data.iloc[start:start + batch_size]
+    else:
+        yield from data()
+
+
+class MiniBatchClusterer:
+    """
+    Clustering on standardized features, trained offline and applied with plain NumPy.
+
+    Training streams over the per-user aggregates: one pass fits the scaler with
+    `partial_fit`, one fits MiniBatchKMeans on the scaled batches and one sums the
+    inertia, so the aggregates never have to fit in memory. The fitted
+    means, scales and centroids are kept as arrays, so `assign` scores new users
+    with a few vectorized operations and no sklearn call.
+
+    Parameters:
+    - features (list): Feature columns.
+    - n_clusters (int): Number of clusters.
+    - batch_size (int): Rows per MiniBatchKMeans update for DataFrame inputs.
+    - random_state (int): Seed for centroid initialization.
+    """
+
+    def __init__(self, features, n_clusters=3, batch_size=DEFAULT_BATCH_SIZE, random_state=42):
+        self.n_clusters = n_clusters
+        self.features = list(features)
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.mean_ = None
+        self.scale_ = None
+        self.centroids_ = None
+        self.inertia_ = None
+
+    def fit(self, data):
+        """
+        Fit the scaler and the clusters over the aggregates.
+
+        Parameters:
+        - data (pd.DataFrame or callable): Per-user aggregates, or a function
+          returning a fresh iterable of aggregate chunks (called once per pass).
+
+        Returns:
+        - MiniBatchClusterer: The fitted model.
+        """
+        scaler = StandardScaler()
+        for batch in _iter_batches(data, self.batch_size):
+            scaler.partial_fit(batch[self.features].to_numpy(dtype=np.float64))
+        self.mean_, self.scale_ = scaler.mean_, scaler.scale_
+
+        # partial_fit initializes the centroids once from the first batch, so n_init does not apply.
+        kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=self.random_state)
+        pending = []
+        for batch in _iter_batches(data, self.batch_size):
+            # The first update also initializes the centroids, so it gets a full batch.
+            pending.append(self._scale(batch))
+            if hasattr(kmeans, 'cluster_centers_') or sum(len(part) for part in pending) >= self.batch_size:
+                kmeans.partial_fit(np.vstack(pending))
+                pending = []
+        if pending and sum(len(part) for part in pending) >= self.n_clusters:
+            kmeans.partial_fit(np.vstack(pending))
+        if not hasattr(kmeans, 'cluster_centers_'):
+            raise ValueError(f"At least {self.n_clusters} users are needed to fit {self.n_clusters} clusters")
+        self.centroids_ = kmeans.cluster_centers_
+
+        self.inertia_ = 0.0
+        for batch in _iter_batches(data, self.batch_size):
+            self.inertia_ += float((self.distances(batch).min(axis=1) ** 2).sum())
+        return self
+
+    def _scale(self, data):
+        values = data[self.features].to_numpy(dtype=np.float64) if isinstance(data, pd.DataFrame) else \
+            np.atleast_2d(np.asarray(data, dtype=np.float64))
+        return (values - self.mean_) / self.scale_
+
+    def distances(self, data):
+        """
+        Euclidean distance of every user to every centroid, in scaled space.
+
+        Parameters:
+        - data (pd.DataFrame or array-like): Features, one row per user.
+
+        Returns:
+        - np.ndarray: Array of shape (n_users, n_clusters).
+        """
+        if self.centroids_ is None:
+            raise ValueError(f"{type(self).__name__} is not fitted")
+        scaled = self._scale(data)
+        squared = (np.einsum('ij,ij->i', scaled, scaled)[:, None] - 2 * scaled @ self.centroids_.T
+                   + np.einsum('ij,ij->i', self.centroids_, self.centroids_))
+        return np.sqrt(np.maximum(squared, 0))
+
+    def assign(self, data):
+        """
+        Assign users to their nearest cluster.
+
+        Parameters:
+        - data (pd.DataFrame or array-like): Features, one row per user.
+
+        Returns:
+        - np.ndarray: int32 cluster labels.
+        """
+        return self.distances(data).argmin(axis=1).astype(np.int32)
+
+    def save(self, file_path):
+        """
+        Save the fitted scaler and centroids to disk with joblib.
+
+        Parameters:
+        - file_path (str): Destination path.
+        """
+        if self.centroids_ is None:
+            raise ValueError(f"{type(self).__name__} is not fitted")
+        os.makedirs(os.path.dirname(str(file_path)) or '.', exist_ok=True)
+        joblib.dump({
+            'version': MODEL_VERSION,
+            'n_clusters': self.n_clusters,
+            'features': self.features,
+            'mean': self.mean_,
+            'scale': self.scale_,
+            'centroids': self.centroids_,
+            'inertia': self.inertia_,
+        }, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a model saved with `save`.
+
+        Parameters:
+        - file_path (str): Path to the saved model.
+
+        Returns:
+        - MiniBatchClusterer: Fitted model of the calling class.
+        """
+        state = joblib.load(file_path)
+        if state['version'] != MODEL_VERSION:
+            raise ValueError(f"Unsupported model version: {state['version']}")
+        model = cls(n_clusters=state['n_clusters'], features=state['features'])
+        model.mean_, model.scale_ = state['mean'], state['scale']
+        model.centroids_, model.inertia_ = state['centroids'], state['inertia']
+        return model
+
+
+def data_fingerprint(data):
+    """
+    Fingerprint the contents of a DataFrame, to tell whether cached results are stale.
+
+    Parameters:
+    - data (pd.DataFrame): Data the results were computed from.
+
+    Returns:
+    - str: Hex SHA-256 of the column names and row hashes.
+    """
+    digest = hashlib.sha256(json.dumps([str(col) for col in data.columns]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _metadata_path(table_path):
+    return f"{table_path}.json"
+
+
+def write_table(table, table_path, data, index=False):
+    """
+    Write a batch-job table to Parquet, with the model version and data fingerprint next to it.
+
+    Parameters:
+    - table (pd.DataFrame): Table to write.
+    - table_path (str): Destination Parquet file; the metadata goes to `<table_path>.json`.
+    - data (pd.DataFrame): Data the table was computed from.
+    - index (bool): Whether to store the index of `table`.
+    """
+    os.makedirs(os.path.dirname(str(table_path)) or '.', exist_ok=True)
+    table.to_parquet(table_path, index=index)
+    with open(_metadata_path(table_path), 'w') as f:
+        json.dump({'version': MODEL_VERSION, 'fingerprint': data_fingerprint(data)}, f)
+
+
+def read_table(table_path, data=None):
+    """
+    Read a table written by `write_table`, refusing stale ones.
+
+    Parameters:
+    - table_path (str): Parquet file written by a batch job.
+    - data (pd.DataFrame): Optional current input data; if given, it must be the
+      data the table was computed from.
+
+    Returns:
+    - pd.DataFrame: The table.
+
+    Raises:
+    - FileNotFoundError: If the batch job has not been run.
+    - ValueError: If the table comes from another model version or other data.
+    """
+    if not os.path.exists(table_path) or not os.path.exists(_metadata_path(table_path)):
+        raise FileNotFoundError(f"No batch results at {table_path}")
+    with open(_metadata_path(table_path)) as f:
+        metadata = json.load(f)
+    if metadata.get('version') != MODEL_VERSION:
+        raise ValueError(f"{table_path} was built by model version {metadata.get('version')}")
+    if data is not None and metadata.get('fingerprint') != data_fingerprint(data):
+        raise ValueError(f"{table_path} was built from different data")
+    return pd.read_parquet(table_path)
+
+
+def read_sessions(file_path):
+    """
+    Read the session input of a batch job.
+
+    CSV floats are parsed with round-trip precision, so fingerprints of the data
+    match those of the frame the file was written from.
+
+    Parameters:
+    - file_path (str): CSV or Parquet file with one row per session.
+
+    Returns:
+    - pd.DataFrame: Session data.
+    """
+    return pd.read_parquet(file_path) if str(file_path).endswith('.parquet') else \
+        pd.read_csv(file_path, float_precision='round_trip')
@@ -0,0 +1,127 @@
+import pandas as pd
+
+from scripts.quantile_sketch import sketch_quantiles
+
+# Default multipliers: Tukey fences for IQR, standard deviations for z-scores.
+DEFAULT_THRESHOLDS = {'iqr': 1.5, 'zscore': 3}
+
+
+def compute_outlier_bounds(data, columns, method='iqr', threshold=None, ddof=1):
+    """
+    Compute lower and upper outlier bounds for several columns in one vectorized pass.
+
+    Parameters:
+    - data (pd.DataFrame): The dataset.
+    - columns (list): Numeric columns to compute bounds for.
+    - method (str): 'iqr' (Q1 - k*IQR, Q3 + k*IQR) or 'zscore' (mean -/+ k*std).
+    - threshold (float): Multiplier k. Defaults to 1.5 for 'iqr' and 3 for 'zscore'.
+    - ddof (int): Delta degrees of freedom of the standard deviation ('zscore' only).
+
+    Returns:
+    - pd.DataFrame: Bounds indexed by column, with 'lower' and 'upper' columns.
+    """
+    if method not in DEFAULT_THRESHOLDS:
+        raise ValueError(f"Unsupported method: {method}")
+    k = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+    values = data[list(columns)]
+
+    if method == 'iqr':
+        quartiles = values.quantile([0.25, 0.75])
+        q1, q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+        spread = q3 - q1
+        lower, upper = q1 - k * spread, q3 + k * spread
+    else:
+        mean, std = values.mean(), values.std(ddof=ddof)
+        lower, upper = mean - k * std, mean + k * std
+
+    return pd.DataFrame({'lower': lower, 'upper': upper})
+
+
+def compute_outlier_bounds_from_sketches(sketches, threshold=None):
+    """
+    Compute IQR bounds from per-column quantile sketches.
+
+    This is the out-of-core counterpart of `compute_outlier_bounds(method='iqr')`:
+    sketches built chunk by chunk (see `scripts.quantile_sketch.build_sketches`)
+    give the quartiles of the full data within the sketch's rank error.
+
+    Parameters:
+    - sketches (dict): Column name to `QuantileSketch`.
+    - threshold (float): IQR multiplier k. Defaults to 1.5.
+
+    Returns:
+    - pd.DataFrame: Bounds indexed by column, with 'lower' and 'upper' columns.
+    """
+    k = DEFAULT_THRESHOLDS['iqr'] if threshold is None else threshold
+    quartiles = sketch_quantiles(sketches, [0.25, 0.75])
+    q1, q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+    spread = q3 - q1
+    return pd.DataFrame({'lower': q1 - k * spread, 'upper': q3 + k * spread})
+
+
+def outlier_mask(data, bounds):
+    """
+    Flag values that fall outside their column's bounds.
+
+    Missing values are never flagged.
+
+    Parameters:
+    - data (pd.DataFrame): The dataset.
+    - bounds (pd.DataFrame): Bounds from `compute_outlier_bounds`.
+
+    Returns:
+    - pd.DataFrame: Boolean frame with one column per bounded column.
+    """
+    values = data[bounds.index]
+    return values.lt(bounds['lower'], axis=1) | values.gt(bounds['upper'], axis=1)
+
+
+def inlier_mask(data, bounds):
+    """
+    Flag rows whose values lie within the bounds in every bounded column.
+
+    Rows with a missing value in any bounded column are not inliers.
+
+    Parameters:
+    - data (pd.DataFrame): The dataset.
+    - bounds (pd.DataFrame): Bounds from `compute_outlier_bounds`.
+
+    Returns:
+    - pd.Series: Boolean mask aligned with `data`.
+    """
+    values = data[bounds.index]
+    return (values.ge(bounds['lower'], axis=1) & values.le(bounds['upper'], axis=1)).all(axis=1)
+
+
+def filter_outliers(data, columns, method='iqr', threshold=None, action='drop', ddof=1, bounds=None):
+    """
+    Remove or clip outliers across many columns with a single combined mask.
+
+    All bounds are computed from the input frame in one pass (or taken from
+    `bounds`), the per-column masks are combined, and the frame is filtered once.
+    With action='drop', rows with a missing value in any checked column are
+    dropped as well, matching the comparison semantics of the IQR filter.
+
+    Parameters:
+    - data (pd.DataFrame): The dataset.
+    - columns (list): Columns to check.
+    - method (str): 'iqr' or 'zscore'.
+    - threshold (float): Bound multiplier; see `compute_outlier_bounds`.
+    - action (str): 'drop' to remove rows, 'clip' to clip values to the bounds in place.
+    - ddof (int): Delta degrees of freedom of the standard deviation ('zscore' only).
+    - bounds (pd.DataFrame): Precomputed bounds, e.g. fitted on a reference dataset.
+
+    Returns:
+    - pd.DataFrame: Filtered or clipped dataset.
+    """
+    if bounds is None:
+        bounds = compute_outlier_bounds(data, columns, method=method, threshold=threshold, ddof=ddof)
+    columns = list(bounds.index)
+
+    if action == 'clip':
+        data[columns] = data[columns].clip(lower=bounds['lower'], upper=bounds['upper'], axis=1)
+        return data
+    if action != 'drop':
+        raise ValueError(f"Unsupported action: {action}")
+
+    return data[inlier_mask(data, bounds)]
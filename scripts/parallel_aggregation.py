@@ -0,0 +1,200 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_extraction import iter_xdr_chunks
+
+# Aggregations computed from mergeable partial results (sums, counts, extremes).
+PARTIAL_FUNCS = ('sum', 'count', 'min', 'max', 'mean')
+
+# Aggregations computed exactly from the values of one hash partition.
+PARTITION_FUNCS = ('nunique', 'median')
+
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+def _normalize_aggregations(aggregations):
+    """
+    Turn a `DataFrame.agg`-style dict into a list of (column, func, output name).
+
+    As in pandas, output names are (column, func) pairs as soon as any column
+    has a list of functions, and plain column names otherwise.
+    """
+    nested = not all(isinstance(funcs, str) for funcs in aggregations.values())
+    specs = []
+    for col, funcs in aggregations.items():
+        for func in ([funcs] if isinstance(funcs, str) else funcs):
+            if func not in PARTIAL_FUNCS + PARTITION_FUNCS:
+                raise ValueError(f"Unsupported aggregation: {func}")
+            specs.append((col, func, (col, func) if nested else col))
+    return specs
+
+
+def _partition_ids(chunk, keys, n_partitions):
+    hashes = pd.util.hash_pandas_object(chunk[keys], index=False).to_numpy()
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+
+def _map_chunk(chunk, keys, specs, n_partitions, spill_dir, chunk_id):
+    """
+    Compute the partial aggregates of one chunk, split by hash partition.
+
+    Writes one Parquet file of grouped partials per partition and, for
+    'nunique'/'median', one file of (keys, value) rows per partition.
+    """
+    if isinstance(chunk, tuple):
+        file_path, row_group = chunk
+        import pyarrow.parquet as pq
+        columns = list(dict.fromkeys(keys + [col for col, _, _ in specs]))
+        chunk = pq.ParquetFile(file_path).read_row_group(row_group, columns=columns).to_pandas()
+
+    chunk = chunk.dropna(subset=keys)
+    partitions = _partition_ids(chunk, keys, n_partitions)
+    for partition, part in chunk.groupby(partitions, sort=False):
+        grouped = part.groupby(keys, sort=False, observed=True)
+        partial = {}
+        for i, (col, func, _) in enumerate(specs):
+            if func in ('sum', 'mean'):
+                partial[f"s{i}"] = grouped[col].sum()
+            if func in ('count', 'mean'):
+                partial[f"c{i}"] = grouped[col].count()
+            if func in ('min', 'max'):
+                partial[f"m{i}"] = getattr(grouped[col], func)()
+            if func in PARTITION_FUNCS:
+                values = part[keys + [col]].dropna(subset=[col])
+                if func == 'nunique':
+                    values = values.drop_duplicates()
+                values.columns = keys + ['value']
+                values.to_parquet(os.path.join(spill_dir, f"p{partition}-v{i}-{chunk_id}.parquet"), index=False)
+        if partial:
+            frame = pd.DataFrame(partial).reset_index()
+            frame.to_parquet(os.path.join(spill_dir, f"p{partition}-partial-{chunk_id}.parquet"), index=False)
+
+
+def _read_spilled(spill_dir, prefix):
+    files = sorted(name for name in os.listdir(spill_dir) if name.startswith(prefix))
+    if not files:
+        return None
+    return pd.concat([pd.read_parquet(os.path.join(spill_dir, name)) for name in files], ignore_index=True)
+
+
+def _merge_funcs(specs):
+    """How each partial column is combined across chunks."""
+    funcs = {}
+    for i, (_, func, _) in enumerate(specs):
+        if func in ('sum', 'mean'):
+            funcs[f"s{i}"] = 'sum'
+        if func in ('count', 'mean'):
+            funcs[f"c{i}"] = 'sum'
+        if func in ('min', 'max'):
+            funcs[f"m{i}"] = func
+    return funcs
+
+
+def _reduce_partition(partition, keys, specs, spill_dir):
+    """Merge the partial aggregates of one hash partition into final values."""
+    result = {}
+    partials = _read_spilled(spill_dir, f"p{partition}-partial-")
+    if partials is not None:
+        merged = partials.groupby(keys, sort=False, observed=True).agg(_merge_funcs(specs))
+        for i, (_, func, _) in enumerate(specs):
+            if func == 'mean':
+                result[f"r{i}"] = merged[f"s{i}"] / merged[f"c{i}"].replace(0, np.nan)
+            elif func in PARTIAL_FUNCS:
+                result[f"r{i}"] = merged[{'sum': 's', 'count': 'c'}.get(func, 'm') + str(i)]
+    for i, (_, func, _) in enumerate(specs):
+        if func in PARTITION_FUNCS:
+            values = _read_spilled(spill_dir, f"p{partition}-v{i}-")
+            if values is not None:
+                result[f"r{i}"] = getattr(values.groupby(keys, sort=False, observed=True)['value'], func)()
+    if not result:
+        return None
+    return pd.DataFrame(result)
+
+
+def _iter_tasks(data, keys, specs, chunksize):
+    """Yield map-task inputs: DataFrame chunks or (parquet path, row group) pairs."""
+    columns = list(dict.fromkeys(keys + [col for col, _, _ in specs]))
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize][columns]
+    elif isinstance(data, str) and data.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for row_group in range(pq.ParquetFile(data).num_row_groups):
+            yield (data, row_group)
+    elif isinstance(data, str):
+        yield from iter_xdr_chunks(data, chunksize=chunksize, usecols=columns)
+    else:
+        for chunk in data:
+            yield chunk[columns]
+
+
+def parallel_aggregate(data, group_by_columns, aggregations, n_jobs=None, n_partitions=None,
+                       chunksize=DEFAULT_CHUNKSIZE, spill_dir=None):
+    """
+    Group and aggregate data with a map-reduce over a process pool.
+
+    Map tasks compute partial aggregates (sums, counts, extremes) of each chunk,
+    hash-partitioned by the group keys, and spill them to Parquet. Reduce tasks
+    then merge the partials of one partition each, so no process ever holds more
+    than one chunk or one partition. 'nunique' and 'median' are exact: every key
+    lives in a single partition, so its distinct values or raw values are combined
+    there. Results match `data.groupby(group_by_columns).agg(aggregations)`.
+
+    Parameters:
+    - data (pd.DataFrame, str or iterable of pd.DataFrame): Data to aggregate. A
+      Parquet path is read one row group per task inside the workers; a CSV path
+      is streamed with `iter_xdr_chunks`.
+    - group_by_columns (list): Columns to group by.
+    - aggregations (dict): Column to function name or list of names. Supported:
+      'sum', 'count', 'min', 'max', 'mean', 'nunique', 'median'.
+    - n_jobs (int): Worker processes. Defaults to the number of CPUs.
+    - n_partitions (int): Hash partitions for the reduce phase. Defaults to 4 * n_jobs.
+    - chunksize (int): Rows per map task for DataFrame and CSV inputs.
+    - spill_dir (str): Directory for partial results. A temporary directory is used if None.
+
+    Returns:
+    - pd.DataFrame: Aggregated dataset with the group columns reset to columns.
+    """
+    keys = list(group_by_columns)
+    specs = _normalize_aggregations(aggregations)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_partitions = n_partitions or 4 * n_jobs
+    temp_dir = tempfile.mkdtemp(dir=spill_dir)
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            # Bound the chunks in flight so the driver never buffers the whole input.
+            pending = set()
+            for chunk_id, task in enumerate(_iter_tasks(data, keys, specs, chunksize)):
+                if len(pending) >= 2 * n_jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(pool.submit(_map_chunk, task, keys, specs, n_partitions, temp_dir, chunk_id))
+            for future in pending:
+                future.result()
+
+            parts = list(pool.map(_reduce_partition, range(n_partitions), [keys] * n_partitions,
+                                  [specs] * n_partitions, [temp_dir] * n_partitions))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    parts = [part for part in parts if part is not None]
+    names = [name for _, _, name in specs]
+    if not parts:
+        return pd.DataFrame(columns=keys + names)
+    result = pd.concat(parts).reindex(columns=[f"r{i}" for i in range(len(specs))]).sort_index()
+    for i, (_, func, _) in enumerate(specs):
+        if func == 'nunique':
+            # Groups whose values are all missing have no spilled rows.
+            result[f"r{i}"] = result[f"r{i}"].fillna(0).astype('int64')
+    if specs and isinstance(names[0], tuple):
+        result.columns = pd.MultiIndex.from_tuples(names)
+    else:
+        result.columns = names
+    return result.reset_index()
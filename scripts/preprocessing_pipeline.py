@@ -0,0 +1,161 @@
+import joblib
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler, PowerTransformer, StandardScaler
+
+from scripts.categorical_encoder import CategoricalEncoder
+from scripts.data_formmating import encode_categorical_columns, fill_missing_values, normalize_data, standardize_data
+from scripts.data_transform import apply_log_transformation, apply_power_transformation, scale_data_range
+from scripts.imputer import Imputer
+
+PIPELINE_VERSION = 1
+
+
+def _make_scaler(kind, params):
+    """Create the unfitted sklearn transformer for a scaling step."""
+    if kind == 'normalize':
+        return MinMaxScaler()
+    if kind == 'scale_range':
+        return MinMaxScaler(feature_range=params.get('feature_range', (0, 1)))
+    if kind == 'standardize':
+        return StandardScaler()
+    if kind == 'power':
+        return PowerTransformer(method=params.get('method', 'yeo-johnson'))
+    raise ValueError(f"Unsupported step: {kind}")
+
+
+class PreprocessingPipeline:
+    """
+    Chain of preprocessing steps that is fitted once and reused to transform batches.
+
+    Each step is a `(kind, params)` tuple and is applied by the matching function
+    of `data_formmating` or `data_transform`, given the step's fitted transformer:
+
+    - 'fill': missing values, params passed to `Imputer` (strategy, columns, fill_value)
+    - 'encode': label codes with a stable vocabulary (columns)
+    - 'log': log1p (columns)
+    - 'normalize', 'standardize': MinMax / standard scaling (columns)
+    - 'scale_range': MinMax scaling (columns, feature_range)
+    - 'power': power transformation (columns, method)
+
+    Every fitted transformer is kept, so `transform` only applies the training-time
+    parameters and never refits. The fitted pipeline can be saved and loaded.
+
+    Parameters:
+    - steps (list): `(kind, params)` tuples, applied in order.
+    """
+
+    def __init__(self, steps):
+        self.steps = [(kind, dict(params)) for kind, params in steps]
+        self.fitted_ = None
+
+    def _numeric_columns(self, data, params):
+        return list(params.get('columns') or data.select_dtypes(include=[np.number]).columns)
+
+    def _apply(self, data, kind, params, fitted, dtype):
+        if kind == 'fill':
+            return fill_missing_values(data, imputer=fitted)
+        if kind == 'encode':
+            return encode_categorical_columns(data, encoder=fitted)
+        columns = params['columns_']
+        data[columns] = data[columns].astype(dtype or np.float64)
+        if kind == 'log':
+            return apply_log_transformation(data, columns)
+        if kind == 'normalize':
+            return normalize_data(data, columns, scaler=fitted)
+        if kind == 'standardize':
+            return standardize_data(data, columns, scaler=fitted)
+        if kind == 'scale_range':
+            return scale_data_range(data, columns, scaler=fitted)
+        return apply_power_transformation(data, columns, transformer=fitted)
+
+    def _fit(self, data):
+        self.fitted_ = []
+        for kind, params in self.steps:
+            if kind == 'fill':
+                fitted = Imputer(params.get('strategy', 'mean'), columns=params.get('columns'),
+                                 fill_value=params.get('fill_value')).fit(data)
+            elif kind == 'encode':
+                columns = params.get('columns') or list(data.select_dtypes(include=['object']).columns)
+                fitted = CategoricalEncoder(columns).fit(data)
+            else:
+                params['columns_'] = self._numeric_columns(data, params)
+                fitted = None
+                if kind != 'log':
+                    fitted = _make_scaler(kind, params).fit(data[params['columns_']].astype(np.float64))
+            self.fitted_.append(fitted)
+            data = self._apply(data, kind, params, fitted, None)
+        return data
+
+    def fit(self, data):
+        """
+        Fit every step in order on a training DataFrame.
+
+        Parameters:
+        - data (pd.DataFrame): Training data. It is not modified.
+
+        Returns:
+        - PreprocessingPipeline: The fitted pipeline.
+        """
+        self._fit(data.copy())
+        return self
+
+    def transform(self, data, inplace=False, dtype=None):
+        """
+        Apply the fitted steps to a batch without refitting.
+
+        Parameters:
+        - data (pd.DataFrame): Batch to transform.
+        - inplace (bool): Overwrite the columns of `data` instead of working on a copy.
+        - dtype (str): Dtype of the scaled columns, e.g. 'float32' to halve their memory.
+
+        Returns:
+        - pd.DataFrame: Transformed batch.
+        """
+        if self.fitted_ is None:
+            raise ValueError("PreprocessingPipeline is not fitted")
+        if not inplace:
+            data = data.copy()
+        for (kind, params), fitted in zip(self.steps, self.fitted_):
+            data = self._apply(data, kind, params, fitted, dtype)
+        return data
+
+    def fit_transform(self, data):
+        """
+        Fit on a DataFrame and return its transformed copy in the same pass.
+
+        Parameters:
+        - data (pd.DataFrame): Training data.
+
+        Returns:
+        - pd.DataFrame: Transformed data.
+        """
+        return self._fit(data.copy())
+
+    def save(self, file_path):
+        """
+        Serialize the fitted pipeline to disk with joblib.
+
+        Parameters:
+        - file_path (str): Destination path.
+        """
+        if self.fitted_ is None:
+            raise ValueError("PreprocessingPipeline is not fitted")
+        joblib.dump({'version': PIPELINE_VERSION, 'steps': self.steps, 'fitted': self.fitted_}, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load a pipeline saved with `save`.
+
+        Parameters:
+        - file_path (str): Path to the saved pipeline.
+
+        Returns:
+        - PreprocessingPipeline: Fitted pipeline.
+        """
+        state = joblib.load(file_path)
+        if state['version'] != PIPELINE_VERSION:
+            raise ValueError(f"Unsupported pipeline version: {state['version']}")
+        pipeline = cls(state['steps'])
+        pipeline.fitted_ = state['fitted']
+        return pipeline
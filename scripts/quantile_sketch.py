@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_K = 200
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch (KLL).
+
+    Values are kept in levels of compactors; an item at level h stands for 2**h
+    input values. When a level exceeds its capacity it is sorted and every other
+    item (random offset) is promoted to the next level. Memory is O(k log(n/k)),
+    sketches built on separate chunks or files merge into one sketch of the
+    union, and the normalized rank error is about 1.7/k with high probability
+    (under 1% for the default k=200). Until the first compaction (fewer than
+    about k values) the sketch is exact and `quantile` matches `pd.Series.quantile`.
+
+    Parameters:
+    - k (int): Accuracy parameter; capacity of the top compactor.
+    - seed (int): Seed for the compaction offsets.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item stays behind so every promoted pair is complete.
+                leftover, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = leftover
+                # Capacities shrink as the sketch grows taller, so restart from the bottom.
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        """
+        Add values to the sketch. Missing values are ignored.
+
+        Parameters:
+        - values (array-like): Numeric values.
+
+        Returns:
+        - QuantileSketch: The updated sketch.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+
+        Parameters:
+        - other (QuantileSketch): Sketch built on other data.
+
+        Returns:
+        - QuantileSketch: The merged sketch.
+        """
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    @property
+    def is_exact(self):
+        """True while no compaction has happened, i.e. every value is still stored."""
+        return all(len(items) == 0 for items in self.levels[1:])
+
+    def quantile(self, q):
+        """
+        Estimate one or more quantiles.
+
+        Parameters:
+        - q (float or list): Quantile(s) in [0, 1].
+
+        Returns:
+        - float or np.ndarray: Estimated quantile value(s); NaN for an empty sketch.
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        if self.is_exact:
+            return np.quantile(self.levels[0], q)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items)
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1], side='left')
+        return items[np.minimum(positions, len(items) - 1)]
+
+    def to_dict(self):
+        """
+        Serialize the sketch to plain Python types (JSON-compatible).
+
+        Returns:
+        - dict: Sketch state.
+        """
+        return {'k': self.k, 'n': self.n, 'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a sketch serialized with `to_dict`.
+
+        Parameters:
+        - state (dict): Sketch state.
+
+        Returns:
+        - QuantileSketch: Restored sketch.
+        """
+        sketch = cls(k=state['k'])
+        sketch.n = state['n']
+        sketch.levels = [np.asarray(items, dtype=float) for items in state['levels']]
+        return sketch
+
+
+def update_sketches(sketches, df, columns, k=DEFAULT_K):
+    """
+    Update one sketch per column with the values of a chunk.
+
+    Parameters:
+    - sketches (dict): Column name to `QuantileSketch`; missing entries are created.
+    - df (pd.DataFrame): Chunk of data.
+    - columns (list): Numeric columns to sketch.
+    - k (int): Accuracy parameter for new sketches.
+
+    Returns:
+    - dict: The updated `sketches`.
+    """
+    for col in columns:
+        sketches.setdefault(col, QuantileSketch(k=k)).update(df[col].to_numpy(dtype=float, na_value=np.nan))
+    return sketches
+
+
+def build_sketches(chunks, columns, k=DEFAULT_K):
+    """
+    Build per-column quantile sketches over a stream of chunks.
+
+    Parameters:
+    - chunks (iterable of pd.DataFrame): Chunks, e.g. from `load_data(..., chunksize=...)`.
+    - columns (list): Numeric columns to sketch.
+    - k (int): Accuracy parameter.
+
+    Returns:
+    - dict: Column name to `QuantileSketch`.
+    """
+    sketches = {}
+    for chunk in chunks:
+        update_sketches(sketches, chunk, columns, k=k)
+    return sketches
+
+
+def sketch_quantiles(sketches, q):
+    """
+    Read the same quantile(s) from several sketches.
+
+    Parameters:
+    - sketches (dict): Column name to `QuantileSketch`.
+    - q (float or list): Quantile(s).
+
+    Returns:
+    - pd.Series or pd.DataFrame: One value per column, or a frame indexed by quantile.
+    """
+    if np.ndim(q):
+        return pd.DataFrame({col: sketch.quantile(q) for col, sketch in sketches.items()}, index=list(q))
+    return pd.Series({col: sketch.quantile(q) for col, sketch in sketches.items()}, dtype=float)
@@ -0,0 +1,264 @@
+# scripts/query_cache.py
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from scripts.columnar_storage import read_parquet, write_parquet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "queries")
+
+# Cheap fingerprint of xdr_data: any load, delete or late-arriving session moves it.
+# Only compares values, so it works on any backend and any "End" column type.
+DEFAULT_WATERMARK_QUERY = """
+    SELECT COUNT(*) AS row_count,
+           MAX("End") AS max_end
+    FROM xdr_data;
+"""
+
+# Quoted literals and identifiers are matched first so their content is left untouched.
+_TOKEN_RE = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|(?:--[^\n]*|\s)+""")
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normalizes SQL text so formatting differences map to the same cache key.
+
+    Comments are removed, whitespace runs collapsed and trailing semicolons dropped.
+    Text inside quoted literals and identifiers is kept as is.
+
+    :param query: SQL text.
+    :return: Normalized SQL text.
+    """
+    query = _TOKEN_RE.sub(lambda match: match.group(1) or " ", query)
+    return query.strip().rstrip(";").strip()
+
+
+def engine_id(engine) -> Optional[str]:
+    """
+    Identifies the database behind an engine or connection, without its password.
+
+    :param engine: SQLAlchemy engine or connection, or None.
+    :return: Database URL with the password masked, or None.
+    """
+    if engine is None:
+        return None
+    return getattr(engine, "engine", engine).url.render_as_string(hide_password=True)
+
+
+class QueryCache:
+    """
+    On-disk cache of query results stored as Parquet files.
+
+    Entries are keyed by a fingerprint of the database URL, the normalized SQL and
+    its parameters, expire after `ttl` seconds and are evicted least-recently-used
+    once the cache exceeds `max_bytes`. When an engine is passed to `get_or_load`,
+    that database's xdr_data watermark (row count and latest session end) is
+    checked at most every `watermark_interval` seconds and its entries are
+    invalidated if it changed. Hits only update access times in memory; the index
+    is written on `put` and on invalidation.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = 3600,
+                 max_bytes: int = 1024 ** 3, watermark_query: str = DEFAULT_WATERMARK_QUERY,
+                 watermark_interval: float = 60):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.watermark_query = watermark_query
+        self.watermark_interval = watermark_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._last_watermark_check: Dict[Optional[str], float] = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._read_index()
+
+    def _read_index(self) -> Dict[str, Any]:
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                index = json.load(f)
+            index.pop("watermark", None)
+            index.setdefault("watermarks", {})
+            return index
+        return {"watermarks": {}, "entries": {}}
+
+    def _write_index(self) -> None:
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _remove(self, key: str) -> None:
+        entry = self._index["entries"].pop(key, None)
+        if entry is not None:
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Dict[str, Any]] = None, engine=None) -> str:
+        """
+        Computes the cache key for a query and its parameters on a database.
+
+        :param query: SQL text.
+        :param params: Optional query parameters.
+        :param engine: Optional engine or connection the query runs on.
+        :return: Hex SHA-256 fingerprint.
+        """
+        payload = json.dumps([engine_id(engine), normalize_sql(query), params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, query: str, params: Optional[Dict[str, Any]] = None, engine=None) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached result of a query, or None on a miss or expired entry.
+
+        :param query: SQL text.
+        :param params: Optional query parameters.
+        :param engine: Optional engine or connection the query runs on.
+        :return: Cached DataFrame or None.
+        """
+        key = self.make_key(query, params, engine)
+        with self._lock:
+            entry = self._index["entries"].get(key)
+            if entry is None or time.time() - entry["created"] > self.ttl:
+                # Expired entries are dropped from the index on the next write
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            try:
+                df = read_parquet(os.path.join(self.cache_dir, entry["file"]))
+            except (FileNotFoundError, OSError):
+                self._remove(key)
+                self.misses += 1
+                return None
+            entry["last_access"] = time.time()
+            self.hits += 1
+            return df
+
+    def put(self, query: str, df: pd.DataFrame, params: Optional[Dict[str, Any]] = None, engine=None) -> None:
+        """
+        Stores a query result and evicts least-recently-used entries beyond `max_bytes`.
+
+        :param query: SQL text.
+        :param df: Result to cache.
+        :param params: Optional query parameters.
+        :param engine: Optional engine or connection the query runs on.
+        """
+        key = self.make_key(query, params, engine)
+        file_name = f"{key}.parquet"
+        path = os.path.join(self.cache_dir, file_name)
+        with self._lock:
+            write_parquet(df, path)
+            now = time.time()
+            self._index["entries"][key] = {
+                "file": file_name,
+                "engine": engine_id(engine),
+                "created": now,
+                "last_access": now,
+                "bytes": os.path.getsize(path),
+            }
+            self._evict()
+            self._write_index()
+
+    def _evict(self) -> None:
+        entries = self._index["entries"]
+        total = sum(entry["bytes"] for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]["bytes"]
+            self._remove(key)
+            self.evictions += 1
+
+    def invalidate(self, query: Optional[str] = None, params: Optional[Dict[str, Any]] = None,
+                   engine=None) -> None:
+        """
+        Drops one cached query, or every entry when no query is given.
+
+        :param query: SQL text to invalidate; None clears the cache.
+        :param params: Optional query parameters.
+        :param engine: Optional engine or connection the query runs on.
+        """
+        with self._lock:
+            keys = [self.make_key(query, params, engine)] if query is not None else list(self._index["entries"])
+            for key in keys:
+                self._remove(key)
+            self._write_index()
+
+    def check_watermark(self, engine) -> bool:
+        """
+        Invalidates the engine's entries if its xdr_data watermark changed since the last check.
+
+        :param engine: SQLAlchemy engine or connection used to read the watermark.
+        :return: True if entries were invalidated.
+        """
+        database = engine_id(engine)
+        watermark = pd.read_sql_query(self.watermark_query, engine).iloc[0].tolist()
+        watermark = json.loads(json.dumps(watermark, default=str))
+        with self._lock:
+            self._last_watermark_check[database] = time.time()
+            previous = self._index["watermarks"].get(database)
+            if watermark == previous:
+                return False
+            changed = previous is not None
+            if changed:
+                logger.info(f"xdr_data watermark changed on {database}, invalidating its cached queries")
+                for key, entry in list(self._index["entries"].items()):
+                    if entry.get("engine") == database:
+                        self._remove(key)
+            self._index["watermarks"][database] = watermark
+            self._write_index()
+            return changed
+
+    def get_or_load(self, query: str, loader: Callable[[], pd.DataFrame],
+                    params: Optional[Dict[str, Any]] = None, engine=None) -> pd.DataFrame:
+        """
+        Returns the cached result of a query, running `loader` and caching its result on a miss.
+
+        :param query: SQL text.
+        :param loader: Zero-argument callable that executes the query.
+        :param params: Optional query parameters.
+        :param engine: If given, scopes the entry to this database and is used to check
+            its xdr_data watermark first.
+        :return: Query result.
+        """
+        if engine is not None and \
+                time.time() - self._last_watermark_check.get(engine_id(engine), 0.0) >= self.watermark_interval:
+            self.check_watermark(engine)
+
+        df = self.get(query, params, engine)
+        if df is None:
+            df = loader()
+            self.put(query, df, params, engine)
+        return df
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Reports hit/miss/eviction counters and the current cache size.
+
+        :return: Dictionary of counters.
+        """
+        with self._lock:
+            entries = self._index["entries"]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "bytes": sum(entry["bytes"] for entry in entries.values()),
+            }
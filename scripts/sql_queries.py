@@ -1,49 +1,165 @@
 import pandas as pd
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
 
-# Define the function to execute queries
-def execute_telecom_queries(db_url):
-    engine = create_engine(db_url)
+from scripts.db_engine import get_engine
 
+TELECOM_QUERIES = {
     # 1. Count of Unique IMSIs
-    unique_imsi_count = pd.read_sql_query("""
+    "unique_imsi_count": """
         SELECT COUNT(DISTINCT "IMSI") AS unique_imsi_count
         FROM xdr_data;
-    """, engine)
+    """,
 
     # 2. Average Duration of Calls
-    average_duration = pd.read_sql_query("""
+    "average_duration": """
         SELECT AVG("Dur. (ms)") AS average_duration
         FROM xdr_data
         WHERE "Dur. (ms)" IS NOT NULL;
-    """, engine)
+    """,
 
     # 3. Total Data Usage per User
-    total_data_usage = pd.read_sql_query("""
-        SELECT "IMSI", 
-               SUM("Total UL (Bytes)") AS total_ul_bytes, 
+    "total_data_usage": """
+        SELECT "IMSI",
+               SUM("Total UL (Bytes)") AS total_ul_bytes,
                SUM("Total DL (Bytes)") AS total_dl_bytes
         FROM xdr_data
         GROUP BY "IMSI"
-        ORDER BY total_dl_bytes DESC
+        ORDER BY total_dl_bytes DESC, "IMSI" NULLS LAST
         LIMIT 10;
-    """, engine)
+    """,
 
     # 4. Average RTT by Last Location Name
-    avg_rtt_by_location = pd.read_sql_query("""
-        SELECT "Last Location Name", 
-               AVG("Avg RTT DL (ms)") AS avg_rtt_dl, 
+    "avg_rtt_by_location": """
+        SELECT "Last Location Name",
+               AVG("Avg RTT DL (ms)") AS avg_rtt_dl,
                AVG("Avg RTT UL (ms)") AS avg_rtt_ul
         FROM xdr_data
         GROUP BY "Last Location Name"
         HAVING COUNT(*) > 10
-        ORDER BY avg_rtt_dl DESC;
-    """, engine)
+        ORDER BY avg_rtt_dl DESC NULLS FIRST, "Last Location Name" NULLS LAST;
+    """,
+}
+
+# All four overview results from a single scan of xdr_data. GROUPING SETS
+# aggregates per IMSI, per location and overall in one pass; the window
+# functions then keep the top 10 IMSIs and the locations with more than 10
+# sessions, and count the distinct non-null IMSIs. GROUPING SETS needs
+# PostgreSQL (SQLite lacks it); the query is only run by the Postgres test in
+# tests/test_sql_queries.py, which is skipped unless TEST_POSTGRES_URL is set.
+SINGLE_SCAN_QUERY = """
+    WITH grouped AS (
+        SELECT GROUPING("IMSI") AS g_imsi,
+               GROUPING("Last Location Name") AS g_location,
+               "IMSI",
+               "Last Location Name",
+               SUM("Total UL (Bytes)") AS total_ul_bytes,
+               SUM("Total DL (Bytes)") AS total_dl_bytes,
+               AVG("Avg RTT DL (ms)") AS avg_rtt_dl,
+               AVG("Avg RTT UL (ms)") AS avg_rtt_ul,
+               AVG("Dur. (ms)") AS average_duration,
+               COUNT(*) AS sessions
+        FROM xdr_data
+        GROUP BY GROUPING SETS (("IMSI"), ("Last Location Name"), ())
+    ), ranked AS (
+        SELECT *,
+               ROW_NUMBER() OVER (PARTITION BY g_imsi, g_location
+                                  ORDER BY total_dl_bytes DESC, "IMSI" NULLS LAST) AS dl_rank,
+               COUNT("IMSI") OVER (PARTITION BY g_imsi, g_location) AS unique_imsi_count
+        FROM grouped
+    )
+    SELECT *
+    FROM ranked
+    WHERE (g_imsi = 1 AND g_location = 1)
+       OR (g_imsi = 0 AND dl_rank <= 10)
+       OR (g_location = 0 AND sessions > 10);
+"""
+
+
+def _split_single_scan(combined):
+    """
+    Rebuild the four overview result frames from the single-scan result.
+
+    Rows with `g_imsi = 0` are the per-IMSI groups (already limited to the top 10
+    by `dl_rank`), rows with `g_location = 0` the per-location groups with more
+    than 10 sessions, and the row with both flags set is the overall total.
+
+    Parameters:
+    - combined (pd.DataFrame): Result of `SINGLE_SCAN_QUERY`.
+
+    Returns:
+    - dict: DataFrames keyed like `TELECOM_QUERIES`, with the same columns and
+      row order as the separate queries.
+    """
+    is_imsi = (combined["g_imsi"] == 0)
+    is_location = (combined["g_location"] == 0)
+    overall = combined[~is_imsi & ~is_location]
+
+    imsi_rows = combined[is_imsi]
+    unique_imsi_count = int(imsi_rows["unique_imsi_count"].iloc[0]) if len(imsi_rows) else 0
+
+    total_data_usage = (
+        imsi_rows.sort_values("dl_rank")[["IMSI", "total_ul_bytes", "total_dl_bytes"]]
+        .reset_index(drop=True)
+    )
+    # Two stable sorts, since pandas has one na_position per call: the location
+    # tie-break puts NULL names last, the RTT order puts NULL averages first.
+    avg_rtt_by_location = (
+        combined[is_location]
+        .sort_values("Last Location Name", na_position="last", kind="mergesort")
+        .sort_values("avg_rtt_dl", ascending=False, na_position="first", kind="mergesort")
+        [["Last Location Name", "avg_rtt_dl", "avg_rtt_ul"]]
+        .reset_index(drop=True)
+    )
 
-    # Return results as a dictionary
     return {
-        "unique_imsi_count": unique_imsi_count,
-        "average_duration": average_duration,
+        "unique_imsi_count": pd.DataFrame({"unique_imsi_count": [unique_imsi_count]}),
+        "average_duration": overall[["average_duration"]].reset_index(drop=True),
         "total_data_usage": total_data_usage,
         "avg_rtt_by_location": avg_rtt_by_location,
     }
+
+
+def _read_query(query, engine, cache=None):
+    """Run a query, going through the query cache when one is given."""
+    if cache is None:
+        return pd.read_sql_query(query, engine)
+    return cache.get_or_load(query, lambda: pd.read_sql_query(query, engine), engine=engine)
+
+
+# Define the function to execute queries
+def execute_telecom_queries(db_url, concurrent=False, single_scan=False, max_workers=None, cache=None):
+    """
+    Run the telecom overview queries against xdr_data.
+
+    Parameters:
+    - db_url (str): SQLAlchemy database URL.
+    - concurrent (bool): Run the four queries in parallel on pooled connections.
+    - single_scan (bool): Compute all four results with one combined scan of
+      xdr_data (GROUPING SETS) instead of four separate scans. Cannot be
+      combined with `concurrent`.
+    - max_workers (int): Threads used when `concurrent` is True. Defaults to one per query.
+    - cache (QueryCache): Optional result cache from `scripts.query_cache`.
+
+    Returns:
+    - dict: DataFrames keyed by "unique_imsi_count", "average_duration",
+      "total_data_usage" and "avg_rtt_by_location".
+    """
+    if concurrent and single_scan:
+        raise ValueError("concurrent and single_scan are mutually exclusive")
+
+    # Shared pooled engine: repeated calls reuse warm connections
+    engine = get_engine(db_url)
+
+    if single_scan:
+        return _split_single_scan(_read_query(SINGLE_SCAN_QUERY, engine, cache))
+
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=max_workers or len(TELECOM_QUERIES)) as executor:
+            futures = {
+                name: executor.submit(_read_query, query, engine, cache)
+                for name, query in TELECOM_QUERIES.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    # Return results as a dictionary
+    return {name: _read_query(query, engine, cache) for name, query in TELECOM_QUERIES.items()}
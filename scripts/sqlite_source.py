@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# Read-side tuning applied to every connection.
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024   # bytes of the file mapped into memory
+DEFAULT_CACHE_SIZE_KB = 64 * 1024       # page cache per connection, in KiB
+DEFAULT_CHUNKSIZE = 50_000
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def _read_only_uri(db_path):
+    """Return a SQLite URI that opens `db_path` read-only."""
+    return f"{Path(db_path).resolve().as_uri()}?mode=ro"
+
+
+def _file_identity(db_path):
+    """Return the inode and modification time of `db_path`, or None if it is missing."""
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def enable_wal(db_path):
+    """
+    Switch a SQLite database to write-ahead logging.
+
+    WAL is a persistent property of the database file, so this only needs to run
+    once per shard (it requires write access). Readers of a WAL database are not
+    blocked by a concurrent writer.
+
+    Parameters:
+    - db_path (str): Path to the SQLite database.
+
+    Returns:
+    - str: The resulting journal mode.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class SQLiteSource:
+    """
+    Reusable, read-only SQLite connection tuned for analytical reads.
+
+    The connection is opened once with memory-mapped I/O and a large page cache,
+    results can be read whole or in chunks, and additional xDR shard databases
+    can be attached so they are queried together through one connection.
+
+    The connection is read-only (`query_only`), so SQL that creates temporary
+    tables or otherwise writes is rejected.
+    """
+
+    def __init__(self, db_path, mmap_size=DEFAULT_MMAP_SIZE, cache_size_kb=DEFAULT_CACHE_SIZE_KB):
+        self.db_path = str(db_path)
+        self.shards = {}
+        self.identity = _file_identity(db_path)
+        self.connection = sqlite3.connect(_read_only_uri(db_path), uri=True, check_same_thread=False)
+        self.connection.execute("PRAGMA query_only=ON")
+        self.connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self.connection.execute(f"PRAGMA cache_size={-int(cache_size_kb)}")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+
+    def attach(self, alias, db_path):
+        """
+        Attach another database read-only under `alias`.
+
+        Parameters:
+        - alias (str): Schema name used to reference the shard in SQL.
+        - db_path (str): Path to the shard database.
+        """
+        if not alias.isidentifier():
+            raise ValueError(f"Invalid shard alias: {alias}")
+        self.connection.execute(f"ATTACH DATABASE ? AS {alias}", (_read_only_uri(db_path),))
+        self.shards[alias] = str(db_path)
+
+    def union_query(self, table, columns='*', where=None):
+        """
+        Build a query reading `table` from the main database and every attached shard.
+
+        Parameters:
+        - table (str): Table present in every database.
+        - columns (str): Column list to select.
+        - where (str): Optional filter applied to every shard.
+
+        Returns:
+        - str: UNION ALL query over all databases.
+        """
+        condition = f" WHERE {where}" if where else ""
+        schemas = ['main', *self.shards]
+        return " UNION ALL ".join(f"SELECT {columns} FROM {schema}.{table}{condition}" for schema in schemas)
+
+    def read(self, query, params=None):
+        """
+        Run a query and return the whole result.
+
+        Parameters:
+        - query (str): SQL query to execute.
+        - params (tuple or dict): Query parameters.
+
+        Returns:
+        - pd.DataFrame: Query result.
+        """
+        return pd.read_sql_query(query, self.connection, params=params)
+
+    def iter_chunks(self, query, params=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Run a query and yield the result in chunks.
+
+        Parameters:
+        - query (str): SQL query to execute.
+        - params (tuple or dict): Query parameters.
+        - chunksize (int): Rows per chunk.
+
+        Yields:
+        - pd.DataFrame: Chunk of at most `chunksize` rows.
+        """
+        yield from pd.read_sql_query(query, self.connection, params=params, chunksize=chunksize)
+
+    def close(self):
+        """Close the connection and drop it from the source cache."""
+        with _sources_lock:
+            if _sources.get(self.db_path) is self:
+                del _sources[self.db_path]
+        self.connection.close()
+
+
+def get_sqlite_source(db_path):
+    """
+    Return the cached `SQLiteSource` for a database, opening it on first use.
+
+    The file's inode and modification time are checked on every lookup; if the
+    database was replaced or rewritten, the cached connection is closed and a new
+    one is opened.
+
+    Parameters:
+    - db_path (str): Path to the SQLite database.
+
+    Returns:
+    - SQLiteSource: Shared read-only source.
+    """
+    key = str(db_path)
+    identity = _file_identity(db_path)
+    with _sources_lock:
+        source = _sources.get(key)
+        if source is not None and source.identity != identity:
+            del _sources[key]
+            source.connection.close()
+            source = None
+        if source is None:
+            source = _sources[key] = SQLiteSource(db_path)
+    return source
+
+
+def close_sources():
+    """Close every cached `SQLiteSource`, e.g. at shutdown or between tests."""
+    with _sources_lock:
+        sources = list(_sources.values())
+        _sources.clear()
+    for source in sources:
+        source.connection.close()
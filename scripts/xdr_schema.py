@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from scripts.constants import DATETIME_FORMAT
+from scripts.date_parsing import parse_datetimes
+
+# Column layout of the xDR session export (table `xdr_data`).
+BEARER_ID_COLUMN = 'Bearer Id'
+
+ID_COLUMNS = ['IMSI', 'MSISDN/Number', 'IMEI']
+
+CATEGORICAL_COLUMNS = ['Last Location Name', 'Handset Manufacturer', 'Handset Type']
+
+DATETIME_COLUMNS = ['Start', 'End']
+
+NUMERIC_COLUMNS = [
+    'Start ms', 'End ms', 'Dur. (ms)',
+    'Avg RTT DL (ms)', 'Avg RTT UL (ms)',
+    'Avg Bearer TP DL (kbps)', 'Avg Bearer TP UL (kbps)',
+    'TCP DL Retrans. Vol (Bytes)', 'TCP UL Retrans. Vol (Bytes)',
+    'DL TP < 50 Kbps (%)', '50 Kbps < DL TP < 250 Kbps (%)',
+    '250 Kbps < DL TP < 1 Mbps (%)', 'DL TP > 1 Mbps (%)',
+    'UL TP < 10 Kbps (%)', '10 Kbps < UL TP < 50 Kbps (%)',
+    '50 Kbps < UL TP < 300 Kbps (%)', 'UL TP > 300 Kbps (%)',
+    'HTTP DL (Bytes)', 'HTTP UL (Bytes)',
+    'Activity Duration DL (ms)', 'Activity Duration UL (ms)', 'Dur. (ms).1',
+    'Nb of sec with 125000B < Vol DL', 'Nb of sec with 1250B < Vol UL < 6250B',
+    'Nb of sec with 31250B < Vol DL < 125000B', 'Nb of sec with 37500B < Vol UL',
+    'Nb of sec with 6250B < Vol DL < 31250B', 'Nb of sec with 6250B < Vol UL < 37500B',
+    'Nb of sec with Vol DL < 6250B', 'Nb of sec with Vol UL < 1250B',
+    'Social Media DL (Bytes)', 'Social Media UL (Bytes)',
+    'Google DL (Bytes)', 'Google UL (Bytes)',
+    'Email DL (Bytes)', 'Email UL (Bytes)',
+    'Youtube DL (Bytes)', 'Youtube UL (Bytes)',
+    'Netflix DL (Bytes)', 'Netflix UL (Bytes)',
+    'Gaming DL (Bytes)', 'Gaming UL (Bytes)',
+    'Other DL (Bytes)', 'Other UL (Bytes)',
+    'Total UL (Bytes)', 'Total DL (Bytes)',
+]
+
+# Dtypes handed to the CSV parser. Identifiers are exported in scientific
+# notation ("2.08201E+14"), so they are parsed as float64 first and narrowed
+# to nullable integers by `apply_xdr_schema`. Bearer Ids need up to 20 digits,
+# more than float64 holds, so they are read as text and integer strings are
+# converted exactly.
+XDR_READ_DTYPES = {
+    BEARER_ID_COLUMN: 'string',
+    **{col: 'float64' for col in ID_COLUMNS},
+    **{col: 'category' for col in CATEGORICAL_COLUMNS},
+    **{col: 'float64' for col in NUMERIC_COLUMNS},
+}
+
+# Final in-memory dtypes of an xDR frame. 'category' columns get the categories
+# of each chunk, so use `concat_xdr_chunks` rather than `pd.concat` to combine
+# chunks without falling back to object dtype.
+XDR_DTYPES = {
+    BEARER_ID_COLUMN: 'UInt64',
+    **{col: 'Int64' for col in ID_COLUMNS},
+    **{col: 'category' for col in CATEGORICAL_COLUMNS},
+    **{col: 'datetime64[ns]' for col in DATETIME_COLUMNS},
+    **{col: 'float64' for col in NUMERIC_COLUMNS},
+}
+
+
+def to_nullable_int(series, dtype):
+    """
+    Convert an identifier column to a nullable integer dtype.
+
+    Integer strings are converted exactly, even beyond float64 precision. Other
+    values (floats, scientific notation such as "1.31E+19") go through float64;
+    unparseable values become missing.
+
+    Parameters:
+    - series (pd.Series): Column holding integral floats, numeric strings and missing values.
+    - dtype (str): Target nullable dtype ('Int64' or 'UInt64').
+
+    Returns:
+    - pd.Series: Column with the nullable integer dtype.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(series, errors='coerce').round().astype(dtype)
+    text = series.astype('string').str.strip()
+    exact = text.str.fullmatch(r'-?\d+').fillna(False).to_numpy(dtype=bool)
+    values = pd.to_numeric(text.where(~exact), errors='coerce').round().astype(dtype)
+    if exact.any():
+        numpy_dtype = np.uint64 if dtype == 'UInt64' else np.int64
+        values[exact] = text[exact].to_numpy(dtype=object).astype(numpy_dtype)
+    return values
+
+
+def apply_xdr_schema(df):
+    """
+    Coerce the columns of an xDR frame to the dtypes in `XDR_DTYPES`.
+
+    Columns that are not part of the xDR schema are left untouched, so the
+    function can be used on projections and on already-typed chunks.
+
+    Parameters:
+    - df (pd.DataFrame): Raw or partially typed xDR data.
+
+    Returns:
+    - pd.DataFrame: DataFrame with xDR columns converted in place.
+    """
+    for col, dtype in XDR_DTYPES.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        if dtype in ('Int64', 'UInt64'):
+            df[col] = to_nullable_int(df[col], dtype)
+        elif dtype.startswith('datetime64'):
+            df[col] = parse_datetimes(df[col], format=DATETIME_FORMAT)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def xdr_read_options(usecols=None):
+    """
+    Build the `pd.read_csv` keyword arguments for an xDR export.
+
+    Parameters:
+    - usecols (list): Optional subset of columns to read.
+
+    Returns:
+    - dict: Keyword arguments (dtype, usecols) for `pd.read_csv`.
+    """
+    dtype = XDR_READ_DTYPES
+    if usecols is not None:
+        dtype = {col: t for col, t in XDR_READ_DTYPES.items() if col in usecols}
+    return {'dtype': dtype, 'usecols': usecols}
@@ -0,0 +1,50 @@
+import json
+import asyncio
+import pandas as pd
+from aiohttp import web
+from scripts.async_extraction import extract_from_api_async
+
+PAGES = 5
+PER_PAGE = 3
+
+async def _serve(routes, coro_factory):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        return await coro_factory(f'http://127.0.0.1:{port}')
+    finally:
+        await runner.cleanup()
+
+def test_page_number_pagination_with_retry(tmp_path):
+    failures = {'remaining': 1}
+
+    async def handler(request):
+        page = int(request.query['page'])
+        if page == 3 and failures['remaining']:
+            failures['remaining'] -= 1
+            return web.Response(status=503)  # Transient error, retried
+        records = [{'id': page * 10 + i} for i in range(PER_PAGE)] if page <= PAGES else []
+        return web.json_response({'results': records})
+
+    path = tmp_path / 'out.ndjson'
+    count = asyncio.run(_serve([web.get('/items', handler)], lambda base: extract_from_api_async(
+        f'{base}/items', path, concurrency=2, backoff=0.01)))
+    ids = [json.loads(line)['id'] for line in path.read_text().splitlines()]
+    assert count == PAGES * PER_PAGE
+    assert ids == sorted(ids)  # Pages written in order
+
+def test_next_link_pagination_to_parquet(tmp_path):
+    async def handler(request):
+        page = int(request.query.get('page', 1))
+        next_url = str(request.url.with_query(page=page + 1)) if page < PAGES else None
+        return web.json_response({'results': [{'page': page}], 'next': next_url})
+
+    path = tmp_path / 'out.parquet'
+    asyncio.run(_serve([web.get('/feed', handler)], lambda base: extract_from_api_async(
+        f'{base}/feed', path, file_type='parquet')))
+    assert pd.read_parquet(path)['page'].tolist() == list(range(1, PAGES + 1))
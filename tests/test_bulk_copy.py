@@ -0,0 +1,51 @@
+import pandas as pd
+from scripts.bulk_copy import copy_from_dataframe, copy_to_chunks, copy_to_dataframe
+
+class FakeCursor:
+    def __init__(self, output=b''):
+        self.output = output
+        self.statements = []
+        self.payloads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def copy_expert(self, statement, buffer):
+        self.statements.append(statement)
+        if 'FROM STDIN' in statement:
+            self.payloads.append(buffer.read())
+        else:
+            buffer.write(self.output)
+
+class FakeConnection:
+    def __init__(self, output=b''):
+        self.cursor_obj = FakeCursor(output)
+
+    def cursor(self):
+        return self.cursor_obj
+
+def test_copy_from_dataframe_batches():
+    df = pd.DataFrame({'Bearer Id': [1, 2, 3, 4, 5], 'Total DL (Bytes)': [1.5, 2.5, 3.5, 4.5, 5.5], 'Extra': list('abcde')})
+    connection = FakeConnection()
+    rows = copy_from_dataframe(df, 'xdr_data', connection=connection, columns=['Bearer Id', 'Total DL (Bytes)'],
+                               batch_rows=2)
+    cursor = connection.cursor_obj
+    assert rows == 5
+    assert cursor.statements == ['COPY xdr_data ("Bearer Id", "Total DL (Bytes)") FROM STDIN WITH (FORMAT csv)'] * 3
+    assert cursor.payloads == ['1,1.5\n2,2.5\n', '3,3.5\n4,4.5\n', '5,5.5\n']  # Batch boundaries
+
+def test_copy_out_statement_and_contents():
+    output = b'msisdn,total_dl\n1,10.0\n2,20.0\n3,30.0\n'
+    connection = FakeConnection(output)
+    df = copy_to_dataframe('SELECT msisdn, total_dl FROM xdr_data;', connection=connection)
+    assert connection.cursor_obj.statements == [
+        'COPY (SELECT msisdn, total_dl FROM xdr_data) TO STDOUT WITH (FORMAT csv, HEADER true)'
+    ]
+    pd.testing.assert_frame_equal(df, pd.DataFrame({'msisdn': [1, 2, 3], 'total_dl': [10.0, 20.0, 30.0]}))
+    connection = FakeConnection(output)
+    chunks = list(copy_to_chunks('xdr_data', chunksize=2, connection=connection))
+    assert connection.cursor_obj.statements == ['COPY xdr_data TO STDOUT WITH (FORMAT csv, HEADER true)']
+    assert [len(chunk) for chunk in chunks] == [2, 1]
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+from scripts.categorical_encoder import CategoricalEncoder
+from scripts.data_cleaning import encode_categorical
+
+@pytest.fixture
+def batches():
+    first = pd.DataFrame({'Handset Manufacturer': ['Samsung', 'Apple', None, 'Apple'], 'Dur. (ms)': [1, 2, 3, 4]})
+    second = pd.DataFrame({'Handset Manufacturer': ['Huawei', 'Apple', 'Nokia'], 'Dur. (ms)': [5, 6, 7]})
+    return first, second
+
+def test_codes_stable_across_batches(batches, tmp_path):
+    first, second = batches
+    encoder = CategoricalEncoder(['Handset Manufacturer']).fit(first)
+    first_codes = encoder.transform(first)['Handset Manufacturer'].tolist()
+    assert first_codes == [1, 0, -1, 0]  # Sorted codes, missing -> -1
+    assert encoder.transform(second)['Handset Manufacturer'].tolist() == [-1, 0, -1]  # Unseen -> -1
+    encoder.partial_fit(second)
+    encoder.save(tmp_path / 'vocab.json')
+    reloaded = CategoricalEncoder.load(tmp_path / 'vocab.json')
+    assert reloaded.transform(first)['Handset Manufacturer'].tolist() == first_codes
+    assert reloaded.transform(second)['Handset Manufacturer'].tolist() == [2, 0, 3]
+
+def test_sparse_onehot_matches_get_dummies(batches):
+    first, _ = batches
+    dense = encode_categorical(first.copy(), ['Handset Manufacturer'])
+    expected = pd.concat([first.drop(columns='Handset Manufacturer'),
+                          pd.get_dummies(first['Handset Manufacturer'], prefix='Handset Manufacturer')], axis=1)
+    pd.testing.assert_frame_equal(dense, expected)
+    sparse_df = encode_categorical(first.copy(), ['Handset Manufacturer'], sparse=True)
+    assert list(sparse_df.columns) == list(expected.columns)
+    assert (sparse_df.iloc[:, 1:].sparse.to_dense().to_numpy() == expected.iloc[:, 1:].to_numpy()).all()
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from scripts.data_extraction import concat_xdr_chunks, iter_xdr_chunks
+from scripts.data_cleaning import load_data, clean_chunks, drop_duplicates
+
+@pytest.fixture
+def xdr_csv(tmp_path):
+    df = pd.DataFrame({
+        'Bearer Id': ['1.31144834608449E+19', '7.27782644637878E+18', None, '1.31144834608449E+19', '1.31144834608449E+19'],
+        'Start': ['4/4/2019 12:01', '4/9/2019 13:04', '4/9/2019 17:42', '4/10/2019 0:31', '4/10/2019 0:31'],
+        'IMSI': ['2.08201448079117E+14', None, '2.08200314458056E+14', '2.08201402342131E+14', '2.08201402342131E+14'],
+        'Handset Type': ['Samsung Galaxy A5', 'Apple iPhone 7', None, 'Apple iPhone 7', 'Apple iPhone 7'],
+        'Total DL (Bytes)': [308879636.0, 653384965.0, None, 846028530.0, 846028530.0],
+    })
+    path = tmp_path / 'xdr.csv'
+    df.to_csv(path, index=False)
+    return path
+
+def test_iter_xdr_chunks_applies_schema(xdr_csv):
+    chunks = list(iter_xdr_chunks(xdr_csv, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]  # Bounded chunk sizes
+    first = chunks[0]
+    assert str(first['IMSI'].dtype) == 'Int64'
+    assert str(first['Bearer Id'].dtype) == 'UInt64'
+    assert str(first['Handset Type'].dtype) == 'category'
+    assert pd.api.types.is_datetime64_any_dtype(first['Start'])
+    assert first['IMSI'].iloc[0] == 208201448079117
+
+def test_chunks_feed_cleaning_functions(xdr_csv):
+    chunks = load_data(xdr_csv, chunksize=3)
+    cleaned = pd.concat(clean_chunks(chunks, [drop_duplicates]), ignore_index=True)
+    assert len(cleaned) == 4  # Duplicate inside the second chunk removed
+
+def test_parquet_roundtrip_with_projection_and_filters(xdr_csv, tmp_path):
+    from scripts.data_cleaning import save_cleaned_data
+    df = concat_xdr_chunks(iter_xdr_chunks(xdr_csv, chunksize=2))
+    assert str(df['Handset Type'].dtype) == 'category'  # Chunks with different categories
+    path = tmp_path / 'xdr.parquet'
+    save_cleaned_data(df, path, file_type='parquet', row_group_size=2)
+    loaded = load_data(path, file_type='parquet', columns=['IMSI', 'Total DL (Bytes)'],
+                       filters=[('Start', '>=', pd.Timestamp('2019-04-09'))])
+    assert list(loaded.columns) == ['IMSI', 'Total DL (Bytes)']
+    assert len(loaded) == 4  # Row before 2019-04-09 filtered out
+    assert str(loaded['IMSI'].dtype) == 'Int64'  # Nullable ids survive the roundtrip
+
+def test_bearer_ids_keep_all_digits(tmp_path):
+    path = tmp_path / 'xdr.csv'
+    path.write_text('Bearer Id,Start ms\n13114483460844900352,1\n13114483460844900353,2\n1.31144834608449E+19,3\n')
+    ids = next(iter_xdr_chunks(path))['Bearer Id']
+    assert ids.tolist()[:2] == [13114483460844900352, 13114483460844900353]  # Beyond float64 precision
+    assert ids.iloc[2] == 13114483460844900352  # Scientific notation still parsed
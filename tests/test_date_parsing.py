@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.date_parsing import detect_format, parse_datetimes, parse_xdr_timestamps
+from scripts.data_formmating import format_dates
+
+def test_parses_mixed_formats(caplog):
+    raw = pd.Series(['4/4/2019 12:01', '4/4/2019 12:01', '2019-04-25 08:15:00', '20190404', None, 'not a date'])
+    parsed = parse_datetimes(raw)
+    assert parsed.iloc[0] == parsed.iloc[1] == pd.Timestamp('2019-04-04 12:01')
+    assert parsed.iloc[2] == pd.Timestamp('2019-04-25 08:15')  # Per-value fallback
+    assert parsed.iloc[3] == pd.Timestamp('2019-04-04')  # Compact date, not epoch seconds
+    assert parsed.iloc[4:].isna().all()
+    assert '1 values' in caplog.text  # Coerced value reported
+    with pytest.raises(ValueError):
+        parse_datetimes(raw, errors='raise')
+
+def test_detect_format_and_numeric_epochs():
+    assert detect_format(['2019-04-04 12:01:00', '2019-04-05 00:00:00']) == '%Y-%m-%d %H:%M:%S'
+    epochs = pd.Series([1554379260000, np.nan])
+    assert parse_datetimes(epochs).iloc[0] == pd.Timestamp('2019-04-04 12:01')  # Unit inferred as ms
+
+def test_xdr_timestamps_derive_duration_and_hour():
+    df = pd.DataFrame({
+        'Start': ['4/4/2019 12:01', '4/9/2019 23:59'],
+        'End': ['4/25/2019 14:35', '4/10/2019 0:01'],
+        'Start ms': [770.0, 500.0],
+        'End ms': [662.0, 750.0],
+    })
+    parse_xdr_timestamps(df)
+    assert df['Session Duration (s)'].tolist() == [1823640 - 0.108, 120.25]
+    assert df['Start Hour'].tolist() == [12, 23]
+    dates = format_dates(pd.DataFrame({'day': ['2019-04-04', '04/05/2019']}), ['day'])
+    assert dates['day'].tolist() == [pd.Timestamp('2019-04-04'), pd.Timestamp('2019-04-05')]
@@ -0,0 +1,13 @@
+import pandas as pd
+from scripts.db_engine import get_engine, get_pool_metrics, dispose_engines
+
+def test_engine_is_shared_and_reuses_connections(tmp_path):
+    url = f"sqlite:///{tmp_path / 'xdr.db'}"
+    engine = get_engine(url)
+    assert get_engine(url) is engine  # One engine per URL
+    for _ in range(3):
+        pd.read_sql_query("SELECT 1 AS one", engine)
+    metrics = get_pool_metrics(url)
+    assert metrics["connects"] == 1  # Warm connection reused
+    assert metrics["checkouts"] == 3
+    dispose_engines()
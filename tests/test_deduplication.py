@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+from scripts.deduplication import StreamingDeduplicator
+from scripts.data_cleaning import clean_chunks, drop_duplicates
+from scripts.data_extraction import iter_xdr_chunks
+
+@pytest.fixture
+def chunks():
+    first = pd.DataFrame({
+        'Bearer Id': pd.array([1, 2, 2, 3], dtype='UInt64'),
+        'Start': pd.to_datetime(['2019-04-04 12:01'] * 4),
+        'Start ms': [770.0, 235.0, 235.0, 1.0],
+        'Total DL (Bytes)': [10.0, 20.0, 20.5, 30.0],
+    })
+    second = first.iloc[[0, 3]].assign(**{'Total DL (Bytes)': [11.0, 31.0]})
+    third = pd.DataFrame({
+        'Bearer Id': pd.array([4, 1], dtype='UInt64'),
+        'Start': pd.to_datetime(['2019-04-04 12:01', '2019-04-05 08:00']),
+        'Start ms': [5.0, 770.0],
+        'Total DL (Bytes)': [40.0, 12.0],
+    })
+    return [first, second, third]
+
+def test_filters_duplicates_across_chunks(chunks):
+    dedup = StreamingDeduplicator()
+    kept = pd.concat(clean_chunks(chunks, [(drop_duplicates, {'deduplicator': dedup})]))
+    assert kept['Total DL (Bytes)'].tolist() == [10.0, 20.0, 30.0, 40.0, 12.0]  # Keyed, not full-row
+    assert (dedup.rows_seen, dedup.rows_dropped) == (8, 3)
+    dedup.close()
+
+def test_spills_and_persists_across_runs(chunks, tmp_path):
+    store = tmp_path / 'keys.sqlite'
+    with StreamingDeduplicator(store_path=store, max_memory_keys=2) as dedup:
+        assert len(dedup.filter(chunks[0])) == 3
+        assert len(dedup._keys) == 0  # Spilled to the key store
+        assert len(dedup.filter(chunks[1])) == 0
+    with StreamingDeduplicator(store_path=store) as dedup:
+        assert len(dedup.filter(chunks[1])) == 0  # Re-delivered rows dropped in a later run
+        assert len(dedup.filter(chunks[2])) == 2
+
+def test_close_twice(tmp_path):
+    dedup = StreamingDeduplicator(store_path=tmp_path / 'keys.sqlite')
+    dedup.close()
+    dedup.close()  # No store left to close
+
+def test_same_keys_from_typed_and_plain_csv(tmp_path):
+    path = tmp_path / 'xdr.csv'
+    path.write_text('Bearer Id,Start,Start ms,Total DL (Bytes)\n'
+                    '1.31144834608449E+19,4/4/2019 12:01,770,10\n'
+                    '1.31144834608449E+19,4/4/2019 12:01,770,11\n'
+                    '7.34909599813296E+18,4/25/2019 7:36,235,20\n')
+    typed = next(iter_xdr_chunks(path))
+    plain = pd.read_csv(path)
+    assert str(typed['Bearer Id'].dtype) == 'UInt64' and plain['Start'].dtype == object
+    dedup = StreamingDeduplicator()
+    assert len(dedup.filter(typed)) == 2
+    assert len(dedup.filter(plain)) == 0  # Same keys despite different dtypes
+    dedup.close()
+
+def test_large_bearer_ids_do_not_collide():
+    chunk = pd.DataFrame({
+        'Bearer Id': pd.array([13114483460844900352, 13114483460844900353], dtype='UInt64'),
+        'Start': pd.to_datetime(['2019-04-04 12:01'] * 2),
+        'Start ms': [770.0, 770.0],
+    })
+    with StreamingDeduplicator() as dedup:
+        assert len(dedup.filter(chunk)) == 2  # Ids differ below float64 resolution
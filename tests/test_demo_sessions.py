@@ -0,0 +1,17 @@
+import pandas as pd
+from scripts import engagement_clustering, experience_clustering
+from scripts.demo_sessions import main, simulate_sessions
+from scripts.engagement_clustering import engagement_aggregates, load_engagement_clusters
+from scripts.experience_clustering import load_experience_scores
+
+def test_demo_sessions_build_the_dashboard_caches(tmp_path):
+    sessions = str(tmp_path / 'sessions.parquet')
+    main([sessions])
+    pd.testing.assert_frame_equal(pd.read_parquet(sessions), simulate_sessions())
+    engagement_clustering.main([sessions, '--model', str(tmp_path / 'engagement.joblib'),
+                                '--output', str(tmp_path / 'clusters.parquet')])
+    experience_clustering.main([sessions, '--model', str(tmp_path / 'experience.joblib'),
+                                '--output', str(tmp_path / 'scores.parquet')])
+    df = simulate_sessions()  # What the dashboard shows without a sessions file
+    assert len(load_engagement_clusters(str(tmp_path / 'clusters.parquet'), engagement_aggregates(df))) == 1000
+    assert len(load_experience_scores(str(tmp_path / 'scores.parquet'), data=df)) == 1000
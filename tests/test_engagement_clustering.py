@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.engagement_clustering import (EngagementClusterer, build_engagement_clusters, elbow_sweep,
+                                           load_engagement_clusters, main)
+
+@pytest.fixture
+def engagement():
+    rng = np.random.default_rng(0)
+    centers = np.array([[2, 100, 500], [10, 600, 3000], [30, 2000, 9000]])
+    values = np.vstack([center * rng.normal(1, 0.05, size=(200, 3)) for center in centers])
+    df = pd.DataFrame(values, columns=['Session ID', 'Duration', 'Total DL + UL'])
+    df.insert(0, 'MSISDN', np.arange(len(df)))
+    return df.sample(frac=1, random_state=0)  # Aggregates arrive in hash order, not by group
+
+def test_streamed_fit_and_vectorized_assign(engagement, tmp_path):
+    chunks = lambda: (engagement.iloc[start:start + 128] for start in range(0, len(engagement), 128))
+    model = EngagementClusterer(n_clusters=3).fit(chunks)
+    labels = model.assign(engagement)
+    assert labels.dtype == np.int32
+    groups = engagement['MSISDN'].to_numpy() // 200
+    assert pd.crosstab(groups, labels).gt(0).sum(axis=1).eq(1).all()  # One cluster per group
+    model.save(tmp_path / 'engagement.joblib')
+    loaded = EngagementClusterer.load(tmp_path / 'engagement.joblib')
+    assert loaded.assign([[30, 2000, 9000]])[0] == labels[groups == 2][0]  # Single new user
+
+def test_elbow_sweep_and_batch_job(engagement, tmp_path):
+    inertias = elbow_sweep(engagement, k_values=[1, 2, 3], n_jobs=2)
+    assert inertias.is_monotonic_decreasing
+    assignments = build_engagement_clusters(engagement, tmp_path / 'model.joblib', str(tmp_path / 'clusters.parquet'))
+    cached = pd.read_parquet(tmp_path / 'clusters.parquet')
+    pd.testing.assert_frame_equal(cached, assignments)
+    assert set(cached['Cluster']) == {0, 1, 2}
+
+def test_command_line_job_and_stale_cache(engagement, tmp_path):
+    sessions = engagement.loc[engagement.index.repeat(2)].assign(**{'Session ID': 1})
+    sessions.to_csv(tmp_path / 'sessions.csv', index=False)
+    output = str(tmp_path / 'clusters.parquet')
+    with pytest.raises(FileNotFoundError):
+        load_engagement_clusters(output)
+    main([str(tmp_path / 'sessions.csv'), '--model', str(tmp_path / 'model.joblib'), '--output', output])
+    current = sessions.groupby('MSISDN').agg(  # In-memory frame the CSV was written from
+        {'Session ID': 'count', 'Duration': 'sum', 'Total DL + UL': 'sum'})
+    assert len(load_engagement_clusters(output, current.reset_index())) == len(engagement)
+    with pytest.raises(ValueError):
+        load_engagement_clusters(output, current.iloc[1:].reset_index())  # Built from other data
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.experience_clustering import ExperienceClusterer, build_experience_scores, load_experience_scores, main
+
+def sessions():
+    rng = np.random.default_rng(0)
+    profiles = {'good': [0.01, 20, 90], 'fair': [0.1, 80, 40], 'poor': [0.4, 180, 5]}
+    rows = []
+    for user in range(150):
+        retrans, rtt, throughput = profiles[['good', 'fair', 'poor'][user % 3]]
+        for _ in range(2):
+            rows.append([user, retrans * rng.normal(1, 0.05), rtt * rng.normal(1, 0.05), throughput * rng.normal(1, 0.05)])
+    return pd.DataFrame(rows, columns=['MSISDN', 'TCP Retransmission', 'RTT', 'Throughput']).sample(frac=1, random_state=0)
+
+def test_batch_job_scores_users_against_worst_cluster(tmp_path):
+    data = sessions()
+    original = data.copy()
+    table = build_experience_scores(data, str(tmp_path / 'experience.parquet'))
+    pd.testing.assert_frame_equal(data, original)  # Input is not mutated
+    assert table.index.name == 'MSISDN' and len(table) == 150
+    poor, good = table.loc[2], table.loc[0]
+    assert poor['Experience Score'] < good['Experience Score']  # Poor users sit next to the worst centroid
+    assert table.groupby(table.index % 3)['Experience Cluster'].nunique().eq(1).all()
+    lookup = load_experience_scores(str(tmp_path / 'experience.parquet'), users=[0, 2, 999])
+    assert list(lookup.index) == [0, 2]
+
+def test_command_line_job_and_stale_cache(tmp_path):
+    data = sessions()
+    data.to_parquet(tmp_path / 'sessions.parquet')
+    output = str(tmp_path / 'experience.parquet')
+    main([str(tmp_path / 'sessions.parquet'), '--model', str(tmp_path / 'model.joblib'), '--output', output])
+    assert isinstance(ExperienceClusterer.load(tmp_path / 'model.joblib'), ExperienceClusterer)
+    assert len(load_experience_scores(output, data=data)) == 150
+    with pytest.raises(ValueError):
+        load_experience_scores(output, data=data[data['MSISDN'] != 0])  # Built from other data
+
+def test_csv_sessions_are_not_stale(tmp_path):
+    data = sessions()
+    data.to_csv(tmp_path / 'sessions.csv', index=False)
+    output = str(tmp_path / 'experience.parquet')
+    main([str(tmp_path / 'sessions.csv'), '--model', str(tmp_path / 'model.joblib'), '--output', output])
+    assert len(load_experience_scores(output, data=data)) == 150  # Floats round-trip
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_selection import chi2, f_classif
+from scripts.feature_selection import FeatureStatistics, compute_feature_statistics, select_k_best_streaming
+from scripts.data_transform import select_k_best_features
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.poisson(5, size=(900, 6)).astype(float), columns=[f'f{i}' for i in range(6)])
+    df['cluster'] = rng.choice(['low', 'mid', 'high'], 900)
+    df.loc[df['cluster'] == 'high', 'f2'] += 4
+    df.loc[df['cluster'] == 'low', 'f4'] -= 3
+    df['f4'] = df['f4'].clip(lower=0)
+    return df
+
+def test_scores_match_sklearn(data):
+    features = [f'f{i}' for i in range(6)]
+    stats = compute_feature_statistics(data, 'cluster', n_jobs=2, chunksize=200)
+    for name, func in [('f_classif', f_classif), ('chi2', chi2)]:
+        scores, pvalues = getattr(stats, name)()
+        expected_scores, expected_pvalues = func(data[features], data['cluster'])
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-9)
+        np.testing.assert_allclose(pvalues, expected_pvalues, rtol=1e-6, atol=1e-300)
+
+def test_chi2_rejects_negative_values_with_positive_sums():
+    X, y = pd.DataFrame({'a': [-1.0, 3.0, -2.0, 5.0]}), [0, 0, 1, 1]
+    with pytest.raises(ValueError, match='non-negative'):
+        chi2(X, y)
+    stats = FeatureStatistics().partial_fit(X.iloc[:2], y[:2]).merge(FeatureStatistics().partial_fit(X.iloc[2:], y[2:]))
+    with pytest.raises(ValueError, match='non-negative'):
+        stats.chi2()  # Class sums are 2 and 3
+    stats.f_classif()  # Other scores still work
+
+def test_streaming_selection_matches_select_k_best(data, tmp_path):
+    features = [f'f{i}' for i in range(6)]
+    expected = list(select_k_best_features(data[features], data['cluster'], k=2).columns)
+    path = str(tmp_path / 'features.parquet')
+    data.to_parquet(path, row_group_size=300)
+    assert select_k_best_streaming(path, 'cluster', k=2, n_jobs=2) == expected  # Parquet row groups in workers
+    chunked = FeatureStatistics()
+    for start in range(0, len(data), 250):
+        chunk = data.iloc[start:start + 250]
+        chunked.partial_fit(chunk[features], chunk['cluster'])
+    assert chunked.select_k_best(k=2) == expected
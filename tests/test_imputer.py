@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.imputer import Imputer
+from scripts.data_cleaning import handle_missing_values
+from scripts.data_formmating import fill_missing_values
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'Dur. (ms)': [1.0, np.nan, 3.0, 4.0, np.nan, 6.0],
+        'Avg RTT DL (ms)': [10.0, 20.0, np.nan, 20.0, 50.0, 60.0],
+        'Handset Type': ['A', 'B', 'B', None, 'C', 'B'],
+    })
+
+def test_partial_fit_matches_full_fit(data):
+    full = Imputer('mean').fit(data)
+    chunked = Imputer('mean')
+    for start in range(0, len(data), 2):
+        chunked.partial_fit(data.iloc[start:start + 2])
+    pd.testing.assert_series_equal(full.statistics_, chunked.statistics_)
+
+def test_mode_partial_fit_and_persistence(data, tmp_path):
+    imputer = Imputer('mode', columns=['Handset Type'])
+    for start in range(0, len(data), 3):
+        imputer.partial_fit(data.iloc[start:start + 3])
+    imputer.save(tmp_path / 'imputer.json')
+    filled = Imputer.load(tmp_path / 'imputer.json').transform(data)
+    assert filled['Handset Type'].iloc[3] == 'B'
+    assert data['Handset Type'].isnull().sum() == 1  # transform does not mutate by default
+
+def test_cleaning_functions_use_imputer(data):
+    cleaned = handle_missing_values(data.copy(), strategy='median', columns=['Dur. (ms)'])
+    assert cleaned['Dur. (ms)'].tolist() == [1.0, 3.5, 3.0, 4.0, 3.5, 6.0]
+    fitted = Imputer('mean', columns=['Avg RTT DL (ms)']).fit(data)
+    batch = fill_missing_values(data.iloc[2:3].copy(), imputer=fitted)
+    assert batch['Avg RTT DL (ms)'].iloc[0] == 32.0  # Fill value from the fit, not the batch
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.lazy_pipeline import LazyPipeline
+from scripts.data_cleaning import standardize_columns, drop_duplicates, handle_missing_values, remove_outliers
+from scripts.data_formmating import normalize_data
+
+@pytest.fixture
+def raw():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Avg RTT DL (ms)': rng.normal(50, 5, 300),
+        'Total DL (Bytes)': rng.normal(5e8, 1e7, 300),
+        'Dur. (ms)': np.where(np.arange(300) % 9 == 0, np.nan, rng.normal(1e5, 1e4, 300)),
+        'Handset Type': rng.choice(['A', 'B'], 300),
+    })
+    df.iloc[5, 0] = 900.0
+    return pd.concat([df, df.iloc[:20]], ignore_index=True)  # Re-delivered rows
+
+def test_lazy_chain_matches_eager_chain(raw):
+    eager = standardize_columns(raw.copy())
+    eager = remove_outliers(eager, ['avg_rtt_dl_(ms)'])
+    eager = drop_duplicates(eager)
+    eager = handle_missing_values(eager.copy(), strategy='median', columns=['dur._(ms)'])
+    eager = normalize_data(eager, ['total_dl_(bytes)', 'dur._(ms)'])[['total_dl_(bytes)', 'dur._(ms)']]
+
+    lazy = (LazyPipeline(raw).standardize_columns()
+            .remove_outliers(['avg_rtt_dl_(ms)'])
+            .drop_duplicates()
+            .handle_missing_values('median', columns=['dur._(ms)'])
+            .normalize(['total_dl_(bytes)', 'dur._(ms)'])
+            .select(['total_dl_(bytes)', 'dur._(ms)']))
+    pd.testing.assert_frame_equal(lazy.collect(), eager)
+    plan = lazy.explain()
+    assert 'fused filter' in plan
+    assert 'all 4 columns' in plan  # Full-row dedup needs every column
+
+def test_projection_pushdown_from_parquet(raw, tmp_path):
+    path = tmp_path / 'xdr.parquet'
+    raw.to_parquet(path, index=False)
+    result = LazyPipeline(path).remove_outliers(['Avg RTT DL (ms)'], method='iqr').select(['Dur. (ms)']).collect()
+    assert list(result.columns) == ['Dur. (ms)']
+    assert '2 of 4 columns' in LazyPipeline(path).remove_outliers(['Avg RTT DL (ms)']).select(['Dur. (ms)']).explain()
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+import scripts.load_data as load_data
+from scripts.load_data import stream_data_from_postgres, stream_query_to_file
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.description = [('msisdn',), ('total_dl',)]
+        self.itersize = None
+        self.fetch_sizes = []
+        self.query = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query):
+        self.query = query
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.cursor_obj = FakeCursor(rows)
+        self.cursor_names = []
+        self.closed = False
+
+    def cursor(self, name=None):
+        self.cursor_names.append(name)
+        return self.cursor_obj
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def connect(monkeypatch):
+    connections = []
+    def fake_connect(rows):
+        def connect(**kwargs):
+            connections.append(FakeConnection(rows))
+            return connections[-1]
+        monkeypatch.setattr(load_data.psycopg2, 'connect', connect)
+        return connections
+    return fake_connect
+
+def test_named_cursor_streams_in_fetch_size_batches(connect):
+    connections = connect([(i, i * 10.0) for i in range(5)])
+    batches = list(stream_data_from_postgres("SELECT msisdn, total_dl FROM xdr_data", fetch_size=2))
+    connection = connections[0]
+    assert connection.cursor_names[0].startswith('xdr_stream_')  # Server-side cursor
+    assert connection.cursor_obj.itersize == 2
+    assert connection.cursor_obj.fetch_sizes == [2, 2, 2, 2]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert connection.closed
+
+def test_stream_query_to_csv_and_parquet(connect, tmp_path):
+    rows = [(i, i * 10.0) for i in range(5)]
+    connect(rows)
+    assert stream_query_to_file("SELECT 1", str(tmp_path / 'out.csv'), file_type='csv', fetch_size=2) == 5
+    expected = pd.DataFrame(rows, columns=['msisdn', 'total_dl'])
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'out.csv'), expected)
+    connect(rows)
+    assert stream_query_to_file("SELECT 1", str(tmp_path / 'out.parquet'), fetch_size=2) == 5
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / 'out.parquet'), expected)
+
+def test_empty_result_writes_header_only_files(connect, tmp_path):
+    connect([])
+    assert stream_query_to_file("SELECT 1", str(tmp_path / 'empty.csv'), file_type='csv') == 0
+    assert (tmp_path / 'empty.csv').read_text().strip() == 'msisdn,total_dl'
+    connect([])
+    assert stream_query_to_file("SELECT 1", str(tmp_path / 'empty.parquet')) == 0
+    assert list(pd.read_parquet(tmp_path / 'empty.parquet').columns) == ['msisdn', 'total_dl']
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+import pandas as pd
+from scripts.columnar_storage import write_parquet_batches
+from scripts.memory_optimizer import apply_dtype_plan, fit_dtype_plan, memory_optimize
+from scripts.xdr_schema import XDR_DTYPES
+
+def test_memory_optimize_shrinks_xdr_frame():
+    n = 1000
+    df = pd.DataFrame({
+        'IMSI': np.where(np.arange(n) % 50 == 0, np.nan, 208201448079117.0 + np.arange(n)),
+        'Handset Manufacturer': np.random.choice(['Apple', 'Samsung', 'Huawei'], n),
+        'Total DL (Bytes)': np.random.randint(0, 10 ** 9, n).astype(float),
+        'Avg RTT DL (ms)': np.random.rand(n),
+    })
+    optimized, report = memory_optimize(df, return_report=True)
+    assert str(optimized['IMSI'].dtype) == 'Int64'
+    assert optimized['IMSI'].isna().sum() == df['IMSI'].isna().sum()
+    assert str(optimized['Handset Manufacturer'].dtype) == 'category'
+    assert str(optimized['Total DL (Bytes)'].dtype) == 'uint32'
+    assert optimized['Avg RTT DL (ms)'].dtype == np.float64  # Non-integral floats kept by default
+    assert report['after_bytes'] < report['before_bytes']
+    pd.testing.assert_series_equal(optimized['Total DL (Bytes)'].astype(float), df['Total DL (Bytes)'])
+
+def test_dtype_plan_keeps_chunks_compatible(tmp_path):
+    small = pd.DataFrame({'IMSI': [2.08201e14, np.nan], 'Total DL (Bytes)': [10.0, 200.0]})
+    large = pd.DataFrame({'IMSI': [2.08202e14, 2.08203e14], 'Total DL (Bytes)': [5.0, 3e9]})
+    assert memory_optimize(small)['Total DL (Bytes)'].dtype != memory_optimize(large)['Total DL (Bytes)'].dtype
+
+    plan = fit_dtype_plan(pd.concat([small, large]), dtypes={'IMSI': XDR_DTYPES['IMSI']})
+    path = tmp_path / 'xdr.parquet'
+    assert write_parquet_batches((apply_dtype_plan(chunk, plan) for chunk in (small, large)), path) == 4
+    result = pd.read_parquet(path)
+    assert str(result['Total DL (Bytes)'].dtype) == 'uint32'
+    assert str(result['IMSI'].dtype) == 'Int64'
+    pd.testing.assert_series_equal(result['Total DL (Bytes)'].astype(float),
+                                   pd.concat([small, large], ignore_index=True)['Total DL (Bytes)'])
+
+def test_dtype_plan_rejects_values_outside_sample_range():
+    plan = fit_dtype_plan(pd.DataFrame({'Total DL (Bytes)': [10.0, 200.0]}))
+    with pytest.raises(ValueError):
+        apply_dtype_plan(pd.DataFrame({'Total DL (Bytes)': [3e9]}), plan)  # Would wrap around in uint8
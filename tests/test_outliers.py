@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.data_cleaning import remove_outliers
+from scripts.data_formmating import detect_outliers
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Avg RTT DL (ms)': rng.normal(50, 5, 200),
+        'Total DL (Bytes)': rng.normal(5e8, 1e7, 200),
+    }, index=np.arange(1000, 1200))
+    df.iloc[3, 0] = 500.0
+    df.iloc[7, 1] = 9e9
+    return df
+
+def test_detect_outliers_matches_single_column(data):
+    masks = detect_outliers(data, list(data.columns), method='iqr')
+    for col in data.columns:
+        pd.testing.assert_series_equal(masks[col], detect_outliers(data, col, method='iqr'))
+    assert masks.any(axis=1).sum() >= 2
+
+def test_zscore_aligns_with_index_when_values_missing(data):
+    data.iloc[10, 0] = np.nan
+    cleaned = remove_outliers(data.copy(), list(data.columns), method='zscore')
+    assert 1003 not in cleaned.index and 1007 not in cleaned.index  # Outliers removed by label
+    assert 1010 not in cleaned.index  # Missing value dropped, as with 'iqr'
+    assert len(cleaned) == len(data) - 3
+
+def test_clip_keeps_rows(data):
+    clipped = remove_outliers(data.copy(), ['Avg RTT DL (ms)'], method='iqr', action='clip')
+    assert len(clipped) == len(data)
+    assert not detect_outliers(clipped, 'Avg RTT DL (ms)').any()
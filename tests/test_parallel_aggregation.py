@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.parallel_aggregation import parallel_aggregate
+from scripts.data_formmating import aggregate_data
+
+@pytest.fixture
+def sessions():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'MSISDN/Number': rng.integers(0, 50, 2000),
+        'Bearer Id': rng.integers(0, 300, 2000),
+        'Dur. (ms)': rng.exponential(1000, 2000),
+        'Handset Type': rng.choice(['A', 'B', 'C'], 2000),
+    })
+    df.loc[::7, 'Dur. (ms)'] = np.nan
+    return df
+
+def test_matches_pandas_groupby(sessions):
+    aggregations = {'Bearer Id': ['count', 'nunique'], 'Dur. (ms)': ['sum', 'mean', 'min', 'max', 'median']}
+    result = parallel_aggregate(sessions, ['MSISDN/Number'], aggregations, n_jobs=2, chunksize=300)
+    expected = sessions.groupby(['MSISDN/Number']).agg(aggregations).reset_index()
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_parquet_source_and_aggregate_data_hook(sessions, tmp_path):
+    path = str(tmp_path / 'sessions.parquet')
+    sessions.to_parquet(path, row_group_size=500)
+    aggregations = {'Dur. (ms)': 'sum', 'Handset Type': 'nunique'}
+    result = parallel_aggregate(path, ['MSISDN/Number', 'Handset Type'], {'Dur. (ms)': 'mean'}, n_jobs=2)
+    assert len(result) == sessions.groupby(['MSISDN/Number', 'Handset Type']).ngroups  # Composite keys
+    hooked = aggregate_data(sessions, ['MSISDN/Number'], aggregations, n_jobs=2)
+    expected = aggregate_data(sessions, ['MSISDN/Number'], aggregations)
+    pd.testing.assert_frame_equal(hooked, expected, check_dtype=False)
+
+def test_categorical_keys_and_mixed_specs(sessions):
+    sessions['Handset Type'] = sessions['Handset Type'].astype(pd.CategoricalDtype(['A', 'B', 'C', 'unused']))
+    aggregations = {'Dur. (ms)': 'sum', 'Bearer Id': ['min', 'nunique']}
+    result = parallel_aggregate(sessions, ['Handset Type'], aggregations, n_jobs=2, n_partitions=3, chunksize=300)
+    expected = sessions.groupby(['Handset Type'], observed=True).agg(aggregations).reset_index()
+    assert ('Dur. (ms)', 'sum') in result.columns  # Not ('Dur. (ms)', nan)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from scripts.data_transform import fit_incremental_pca, load_pca, reduce_dimensions_with_pca, save_pca
+
+def data():
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=(600, 2))
+    values = latent @ rng.normal(size=(2, 5)) + 0.01 * rng.normal(size=(600, 5))
+    return pd.DataFrame(values, columns=[f'col{i}' for i in range(5)])
+
+def test_incremental_pca_matches_exact_and_persists(tmp_path):
+    df = data()
+    exact = reduce_dimensions_with_pca(df, n_components=2)
+    chunks = [df.iloc[start:start + 100] for start in range(0, 600, 100)]
+    pca = fit_incremental_pca(chunks, n_components=2)
+    save_pca(pca, tmp_path / 'pca.joblib')
+    projected = reduce_dimensions_with_pca(df.iloc[:50], pca=load_pca(tmp_path / 'pca.joblib'))
+    assert list(projected.columns) == ['PC1', 'PC2']
+    # Components are defined up to sign
+    np.testing.assert_allclose(np.abs(projected.to_numpy()), np.abs(exact.iloc[:50].to_numpy()), atol=0.05)
+
+def test_incremental_pca_keeps_short_remainder():
+    df = data()
+    chunks = [df.iloc[start:start + 100] for start in range(0, 500, 100)] + [df.iloc[500:599], df.iloc[599:]]
+    pca = fit_incremental_pca(chunks, n_components=2)
+    assert pca.n_samples_seen_ == len(df)  # The last row is merged into the last partial fit
+
+def test_randomized_solver():
+    df = data()
+    exact = reduce_dimensions_with_pca(df, n_components=2, svd_solver='full')
+    randomized = reduce_dimensions_with_pca(df, n_components=2, svd_solver='randomized', random_state=0)
+    np.testing.assert_allclose(np.abs(randomized.to_numpy()), np.abs(exact.to_numpy()), atol=1e-6)
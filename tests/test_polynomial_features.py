@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from scripts.data_transform import generate_polynomial_features, iter_polynomial_blocks
+
+def data():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.random((100, 3)), columns=['Avg RTT DL (ms)', 'Total DL (Bytes)', 'Total UL (Bytes)'])
+    df.loc[::2, 'Total UL (Bytes)'] = 0.0
+    return df
+
+def test_blocked_output_matches_dense():
+    df = data()
+    expected = generate_polynomial_features(df.copy(), list(df.columns))
+    blocked = generate_polynomial_features(df.copy(), list(df.columns), memory_budget=1000)
+    pd.testing.assert_frame_equal(blocked, expected)
+    blocks = list(iter_polynomial_blocks(df, list(df.columns), memory_budget=1000))
+    assert len(blocks) > 1 and all(block.nbytes <= 1000 for _, _, block in blocks)  # Budget respected
+
+def test_blocks_do_not_copy_the_frame(monkeypatch):
+    df = data()
+    getitem = pd.DataFrame.__getitem__
+    selected = []
+    def recording_getitem(self, key):
+        selected.append(len(self))
+        return getitem(self, key)
+    monkeypatch.setattr(pd.DataFrame, '__getitem__', recording_getitem)
+    blocks = list(iter_polynomial_blocks(df, list(df.columns), memory_budget=1000))
+    assert len(blocks) > 1 and len(df) not in selected  # No full-frame column selection
+
+def test_pairs_float32_and_sparse():
+    df = data()
+    pairs = [('Total DL (Bytes)', 'Total UL (Bytes)'), ('Avg RTT DL (ms)', 'Avg RTT DL (ms)')]
+    result = generate_polynomial_features(df, [], pairs=pairs, dtype='float32', sparse=True)
+    assert list(result.columns[3:]) == ['Total DL (Bytes) Total UL (Bytes)', 'Avg RTT DL (ms)^2']
+    assert result.dtypes.iloc[3] == pd.SparseDtype('float32', 0)
+    assert result.iloc[:, 3].sparse.density == 0.5  # Zero products are not stored
+    np.testing.assert_allclose(result['Avg RTT DL (ms)^2'].sparse.to_dense(), df['Avg RTT DL (ms)'] ** 2, rtol=1e-6)
+
+def test_blocked_output_shares_the_buffer(monkeypatch):
+    df = data()
+    empty = np.empty
+    buffers = []
+    def recording_empty(shape, *args, **kwargs):
+        array = empty(shape, *args, **kwargs)
+        if shape == (len(df), 9):
+            buffers.append(array)
+        return array
+    monkeypatch.setattr(np, 'empty', recording_empty)
+    result = generate_polynomial_features(df.assign(Region='a'), list(df.columns), memory_budget=1000)
+    features = result.columns[1:]
+    assert len(buffers) == 1 and result.columns[0] == 'Region' and len(features) == 6  # Inputs dropped
+    assert all(np.shares_memory(result[col].to_numpy(), buffers[0]) for col in features)  # No output copy
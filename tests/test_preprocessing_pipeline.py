@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.preprocessing_pipeline import PreprocessingPipeline
+
+@pytest.fixture
+def train():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Total DL (Bytes)': rng.lognormal(18, 1, 100),
+        'Avg RTT DL (ms)': np.where(np.arange(100) % 7 == 0, np.nan, rng.normal(50, 5, 100)),
+        'Handset Manufacturer': rng.choice(['Apple', 'Samsung', 'Huawei'], 100),
+    })
+
+STEPS = [
+    ('fill', {'strategy': 'median', 'columns': ['Avg RTT DL (ms)']}),
+    ('log', {'columns': ['Total DL (Bytes)']}),
+    ('standardize', {'columns': ['Total DL (Bytes)', 'Avg RTT DL (ms)']}),
+    ('encode', {'columns': ['Handset Manufacturer']}),
+]
+
+def test_transform_reuses_training_parameters(train, tmp_path):
+    pipeline = PreprocessingPipeline(STEPS)
+    transformed = pipeline.fit_transform(train)
+    assert np.allclose(transformed[['Total DL (Bytes)', 'Avg RTT DL (ms)']].mean(), 0)
+    pipeline.save(tmp_path / 'pipeline.joblib')
+    batch = train.iloc[:10]
+    scored = PreprocessingPipeline.load(tmp_path / 'pipeline.joblib').transform(batch, dtype='float32')
+    assert scored['Total DL (Bytes)'].dtype == np.float32
+    assert np.allclose(scored['Total DL (Bytes)'], transformed['Total DL (Bytes)'].iloc[:10], atol=1e-5)
+    assert train['Avg RTT DL (ms)'].isnull().any()  # Input left untouched
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from scripts.quantile_sketch import QuantileSketch, build_sketches
+from scripts.outliers import compute_outlier_bounds, compute_outlier_bounds_from_sketches
+from scripts.imputer import Imputer
+
+def test_sketch_is_exact_for_small_data():
+    values = np.random.default_rng(1).normal(size=150)
+    sketch = QuantileSketch().update(values)
+    assert sketch.is_exact
+    assert np.allclose(sketch.quantile([0.25, 0.5, 0.75]), pd.Series(values).quantile([0.25, 0.5, 0.75]))
+
+def test_merged_chunk_sketches_within_rank_error():
+    values = np.random.default_rng(2).lognormal(size=200_000)
+    merged = QuantileSketch(seed=0)
+    for chunk in np.array_split(values, 20):
+        merged.merge(QuantileSketch(seed=1).update(chunk))
+    assert merged.n == len(values)
+    for q in (0.25, 0.5, 0.75, 0.99):
+        rank = (values <= merged.quantile(q)).mean()
+        assert abs(rank - q) < 0.02  # Bounded rank error
+    restored = QuantileSketch.from_dict(merged.to_dict())
+    assert restored.quantile(0.5) == merged.quantile(0.5)
+
+def test_out_of_core_bounds_and_median_imputation():
+    df = pd.DataFrame({'Avg RTT DL (ms)': np.random.default_rng(3).normal(50, 5, 120)})
+    df.iloc[::10, 0] = np.nan
+    chunks = [df.iloc[i:i + 40] for i in range(0, len(df), 40)]
+    sketch_bounds = compute_outlier_bounds_from_sketches(build_sketches(chunks, list(df.columns)))
+    pd.testing.assert_frame_equal(sketch_bounds, compute_outlier_bounds(df, list(df.columns)))
+    imputer = Imputer('median')
+    for chunk in chunks:
+        imputer.partial_fit(chunk)
+    assert np.isclose(imputer.statistics_['Avg RTT DL (ms)'], df['Avg RTT DL (ms)'].median())
@@ -0,0 +1,30 @@
+import warnings
+import numpy as np
+import pandas as pd
+from scripts.data_transform import calculate_rolling_statistics, create_lagged_features, create_session_features
+
+def sessions():
+    return pd.DataFrame({
+        'MSISDN/Number': [7, 8, 7, 8, 7],
+        'Start': pd.to_datetime(['2019-04-04 00:00', '2019-04-04 00:10', '2019-04-04 01:20',
+                                 '2019-04-04 02:00', '2019-04-04 00:30']),
+        'Dur. (ms)': [1.0, 2.0, 5.0, 4.0, 3.0],
+        'Total DL (Bytes)': [10.0, 20.0, 50.0, 40.0, 30.0],
+    }, index=[10, 11, 12, 13, 14])
+
+def test_features_follow_user_and_time_order():
+    result = create_session_features(sessions(), ['Dur. (ms)', 'Total DL (Bytes)'], lags=[1], windows=[2, '1h'],
+                                     stats=['mean'])
+    assert list(result.index) == [10, 11, 12, 13, 14]  # Input order kept
+    pd.testing.assert_series_equal(result['Dur. (ms)_lag1'], pd.Series([np.nan, np.nan, 3.0, 2.0, 1.0],
+                                   index=result.index, name='Dur. (ms)_lag1'))
+    assert result['Total DL (Bytes)_rolling2_mean'].tolist()[2:] == [40.0, 30.0, 20.0]
+    assert result['Dur. (ms)_rolling1h_mean'].tolist() == [1.0, 2.0, 4.0, 4.0, 2.0]  # Time-based window
+
+def test_single_column_helpers_do_not_fragment():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        data = create_lagged_features(sessions(), 'Dur. (ms)', 150)
+        data = calculate_rolling_statistics(data, 'Dur. (ms)', 2, stats=['mean', 'max'])
+    assert data['Dur. (ms)_lag1'].iloc[1] == 1.0
+    assert data['Dur. (ms)_rolling_max'].tolist()[1:] == [2.0, 5.0, 5.0, 4.0]
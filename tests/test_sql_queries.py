@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.db_engine import dispose_engines
+from scripts.sql_queries import _split_single_scan, execute_telecom_queries
+
+@pytest.fixture
+def xdr():
+    rng = np.random.default_rng(0)
+    n = 120
+    df = pd.DataFrame({
+        'IMSI': rng.integers(1, 20, n).astype(float),
+        'Last Location Name': rng.choice(['L1', 'L2', 'L3', 'L4'], n),
+        'Dur. (ms)': rng.integers(1, 5, n) * 1000.0,
+        'Total UL (Bytes)': rng.integers(1, 4, n) * 10.0,
+        'Total DL (Bytes)': rng.integers(1, 4, n) * 100.0,  # Few distinct values, so totals tie
+        'Avg RTT DL (ms)': rng.integers(1, 4, n) * 10.0,
+        'Avg RTT UL (ms)': rng.integers(1, 4, n) * 5.0,
+    })
+    df.loc[::9, 'IMSI'] = np.nan
+    df.loc[df['Last Location Name'] == 'L4', 'Last Location Name'] = ['L4'] * 5 + ['L1'] * (
+        (df['Last Location Name'] == 'L4').sum() - 5)  # L4 has too few sessions to be reported
+    df.loc[df['Last Location Name'] == 'L2', 'Avg RTT DL (ms)'] = 20.0
+    df.loc[df['Last Location Name'] == 'L3', 'Avg RTT DL (ms)'] = 20.0  # Tied location averages
+    df.loc[df['Last Location Name'] == 'L1', 'Avg RTT DL (ms)'] = 10.0
+    unknown = df.index[df['Last Location Name'] == 'L1'][:15]
+    df.loc[unknown, 'Last Location Name'] = None
+    df.loc[unknown, 'Avg RTT DL (ms)'] = 20.0  # NULL location tied with L2 and L3
+    return df
+
+def _grouping_sets(df):
+    """
+    The rows SINGLE_SCAN_QUERY returns, built in pandas (SQLite has no GROUPING SETS).
+
+    This only tests `_split_single_scan`; the SQL itself runs in the Postgres test.
+    """
+    aggs = dict(total_ul_bytes=('Total UL (Bytes)', 'sum'), total_dl_bytes=('Total DL (Bytes)', 'sum'),
+                avg_rtt_dl=('Avg RTT DL (ms)', 'mean'), avg_rtt_ul=('Avg RTT UL (ms)', 'mean'),
+                average_duration=('Dur. (ms)', 'mean'), sessions=('IMSI', 'size'))
+    imsi = df.groupby('IMSI', dropna=False).agg(**aggs).reset_index().assign(g_imsi=0, g_location=1)
+    imsi = imsi.sort_values(['total_dl_bytes', 'IMSI'], ascending=[False, True], na_position='last')
+    imsi = imsi.assign(dl_rank=np.arange(1, len(imsi) + 1), unique_imsi_count=imsi['IMSI'].count()).head(10)
+    location = df.groupby('Last Location Name', dropna=False).agg(**aggs).reset_index().assign(g_imsi=1, g_location=0)
+    location = location[location['sessions'] > 10]
+    location['Last Location Name'] = location['Last Location Name'].replace({np.nan: None})  # As read from SQL
+    overall = pd.DataFrame([{name: df[col].agg(func) for name, (col, func) in aggs.items()}])
+    overall = overall.assign(g_imsi=1, g_location=1)
+    # Row order of the combined result is not defined
+    return pd.concat([location, overall, imsi], ignore_index=True).sample(frac=1, random_state=0)
+
+def test_modes_return_identical_frames(xdr, tmp_path):
+    url = f"sqlite:///{tmp_path / 'xdr.db'}"
+    xdr.to_sql('xdr_data', url, index=False)
+    sequential = execute_telecom_queries(url)
+    concurrent = execute_telecom_queries(url, concurrent=True)
+    single_scan = _split_single_scan(_grouping_sets(xdr))
+    for name, expected in sequential.items():
+        pd.testing.assert_frame_equal(concurrent[name], expected)
+        pd.testing.assert_frame_equal(single_scan[name], expected, check_dtype=False)
+    assert sequential['total_data_usage']['total_dl_bytes'].duplicated().any()  # Ties were broken the same way
+    assert list(sequential['avg_rtt_by_location']['Last Location Name']) == ['L2', 'L3', None, 'L1']
+    dispose_engines()
+
+@pytest.mark.skipif(not os.environ.get('TEST_POSTGRES_URL'), reason='needs a PostgreSQL database (GROUPING SETS)')
+def test_single_scan_query_on_postgres(xdr):
+    url = os.environ['TEST_POSTGRES_URL']  # Scratch database: its xdr_data table is replaced
+    xdr.to_sql('xdr_data', url, index=False, if_exists='replace')
+    sequential = execute_telecom_queries(url)
+    single_scan = execute_telecom_queries(url, single_scan=True)
+    for name, expected in sequential.items():
+        pd.testing.assert_frame_equal(single_scan[name], expected, check_dtype=False)
+    dispose_engines()
+
+def test_concurrent_and_single_scan_are_exclusive():
+    with pytest.raises(ValueError):
+        execute_telecom_queries('sqlite://', concurrent=True, single_scan=True)
@@ -0,0 +1,43 @@
+import sqlite3
+import pandas as pd
+import pytest
+from scripts.sqlite_source import SQLiteSource, close_sources, enable_wal, get_sqlite_source
+from scripts.data_extraction import extract_from_database
+
+def _make_shard(path, imsis):
+    conn = sqlite3.connect(path)
+    pd.DataFrame({'IMSI': imsis, 'Total DL (Bytes)': [1.0] * len(imsis)}).to_sql('xdr_data', conn, index=False)
+    conn.close()
+    return path
+
+@pytest.fixture(autouse=True)
+def sources():
+    yield
+    close_sources()
+
+def test_chunked_reads_and_cached_connection(tmp_path):
+    db = _make_shard(tmp_path / 'day1.db', list(range(10)))
+    chunks = list(extract_from_database(db, 'SELECT * FROM xdr_data', chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    connection = get_sqlite_source(db).connection
+    assert len(extract_from_database(db, 'SELECT * FROM xdr_data WHERE IMSI < ?', params=(3,))) == 3
+    assert get_sqlite_source(db).connection is connection  # Reused, not reopened
+
+def test_replaced_file_is_reopened(tmp_path):
+    db = _make_shard(tmp_path / 'day1.db', [1, 2])
+    source = get_sqlite_source(db)
+    replacement = _make_shard(tmp_path / 'new.db', [1, 2, 3])
+    replacement.replace(db)
+    assert get_sqlite_source(db) is not source
+    assert len(extract_from_database(db, 'SELECT * FROM xdr_data')) == 3
+
+def test_read_only_and_attached_shards(tmp_path):
+    source = SQLiteSource(_make_shard(tmp_path / 'day1.db', [1, 2]))
+    day2 = _make_shard(tmp_path / 'day2.db', [3])
+    assert enable_wal(day2) == 'wal'
+    source.attach('day2', day2)
+    combined = source.read(source.union_query('xdr_data', columns='IMSI'))
+    assert sorted(combined['IMSI']) == [1, 2, 3]
+    with pytest.raises(sqlite3.OperationalError):
+        source.connection.execute('DELETE FROM xdr_data')  # Opened read-only
+    source.close()